@@ -0,0 +1,141 @@
+# benchmarks/bench_scaling.py
+"""
+How grounding, planning and validation scale with the mission size.
+
+Missions come from planner.generate, one per size, domain and family. A
+size is the number of waypoints; the rest grows with it. Both families have
+an image and a scan goal per 6 waypoints and one astronaut per lander
+(lunar-extended).
+
+    easy  : a lander per 25 waypoints (at least 2), all of them landed, two
+            rovers per lander, a sample goal per two landers.
+    tight : a lander per 25 waypoints (at least 3), only the first one landed
+            (planner.generate's default), a rover per lander and a sample
+            goal for every lander. Landers still to land multiply the
+            branching factor by the number of waypoints, and with no spare
+            lander a wrong delivery is a dead end the relaxation only sees
+            once the lander is full.
+
+The operating limits are those of the tight family: GBFS runs out of time
+on tight lunar missions from 6 waypoints on, while tight lunar-extended
+missions still plan in under a second at 25 waypoints. Each stage reports
+its time and, in a second traced run, its peak Python memory (tracemalloc).
+"limit" means the search ran out of --time-limit, and the larger sizes of
+that domain and family are then skipped.
+
+    python benchmarks/bench_scaling.py
+    python benchmarks/bench_scaling.py --sizes 25,50,100,200,400 --domain lunar-extended
+    python benchmarks/bench_scaling.py --search astar --time-limit 30 --no-memory
+    python benchmarks/bench_scaling.py --family tight --heuristic add
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from planner.generate import DOMAINS, generate_problem
+from planner.grounding import ground
+from planner.pddl import load_domain, parse_problem
+from planner.plans import format_plan, read_plan
+from planner.search import ALGORITHMS, search
+from planner.validate import PlanValidator
+
+DOMAIN_FILES = {"lunar": "PartAB/domain.pddl", "lunar-extended": "PartC/domain-ext.pddl"}
+
+
+FAMILIES = ("easy", "tight")
+
+
+def mission(domain, family, waypoints, connectivity, seed):
+    goals = max(2, waypoints // 6)
+    if family == "easy":
+        landers = max(2, waypoints // 25)
+        return generate_problem(domain, waypoints=waypoints, connectivity=connectivity,
+                                rovers=2 * landers, landers=landers, images=goals,
+                                scans=goals, samples=landers // 2, landed=landers, seed=seed)
+    landers = max(3, waypoints // 25)
+    return generate_problem(domain, waypoints=waypoints, connectivity=connectivity,
+                            rovers=landers, landers=landers, images=goals, scans=goals,
+                            samples=landers, landed=1, seed=seed)
+
+
+def run(domain, text, algorithm, heuristic, time_limit, traced):
+    """Per-stage (seconds or peak MB) of one mission, plus the task size and search result."""
+    stages = {}
+
+    def stage(name, start):
+        if traced:
+            stages[name] = tracemalloc.get_traced_memory()[1] / 1e6
+            tracemalloc.reset_peak()
+        else:
+            stages[name] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    problem = parse_problem(text, domain)
+    task = ground(domain, problem)
+    stage("ground", start)
+    start = time.perf_counter()
+    result = search(task, algorithm, heuristic, time_limit=time_limit)
+    stage("search", start)
+    start = time.perf_counter()
+    if result.plan is not None:
+        _, steps = read_plan(format_plan(task, result.plan))
+        if not PlanValidator(domain, problem).validate(steps).valid:
+            raise AssertionError(f"invalid plan for {problem.name}")
+    stage("validate", start)
+    return stages, task, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="6,12,25,50,100,200",
+                        help="comma-separated waypoint counts")
+    parser.add_argument("--domain", choices=DOMAINS, action="append",
+                        help="domain(s) to run (default: both)")
+    parser.add_argument("--family", choices=FAMILIES, action="append",
+                        help="mission family/families to run (default: both)")
+    parser.add_argument("--search", choices=ALGORITHMS, default="gbfs")
+    parser.add_argument("--heuristic", choices=("ff", "add"), default="ff")
+    parser.add_argument("--time-limit", type=float, default=60.0, help="per mission (s)")
+    parser.add_argument("--connectivity", type=float, default=2.5,
+                        help="average outgoing connections per waypoint")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the missions")
+    parser.add_argument("--memory", action=argparse.BooleanOptionalAction, default=True,
+                        help="also measure peak memory (runs every mission twice)")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    for name, family in [(n, f) for n in args.domain or DOMAINS for f in args.family or FAMILIES]:
+        domain = load_domain(os.path.join(ROOT, DOMAIN_FILES[name]))
+        print(f"{name}, {family}, {args.search}+h_{args.heuristic}, limit {args.time_limit}s")
+        print(f"{'wp':>5}{'goals':>6}{'atoms':>8}{'actions':>9}{'status':>9}{'length':>7}"
+              f"{'expanded':>9}{'ground':>9}{'search':>9}{'validate':>9}"
+              f"{'MB grnd':>9}{'srch':>7}{'val':>7}")
+        for waypoints in sizes:
+            text = mission(name, family, waypoints, min(args.connectivity, waypoints - 1),
+                           args.seed)
+            times, task, result = run(domain, text, args.search, args.heuristic,
+                                      args.time_limit, False)
+            row = (f"{waypoints:>5}{len(task.goal):>6}{len(task.atoms):>8}{task.num_actions:>9}"
+                   f"{result.status:>9}{len(result.plan or ()):>7}{result.expanded:>9}"
+                   f"{times['ground']:>8.2f}s{times['search']:>8.2f}s"
+                   f"{times['validate'] * 1000:>7.1f}ms")
+            if args.memory:
+                tracemalloc.start()
+                peaks, _, _ = run(domain, text, args.search, args.heuristic,
+                                  args.time_limit, True)
+                tracemalloc.stop()
+                row += f"{peaks['ground']:>9.1f}{peaks['search']:>7.1f}{peaks['validate']:>7.1f}"
+            print(row, flush=True)
+            if result.status == "limit":
+                print(f"      larger sizes skipped: the search ran out of {args.time_limit}s")
+                break
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# planner/__init__.py
+"""PDDL parsing and grounding for the MoonSong lunar mission models."""
@@ -0,0 +1,8 @@
+# planner/__main__.py
+"""Entry point for `python -m planner` (see cli.py)."""
+import sys
+
+from .cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+# planner/cli.py
+"""
+Command line interface.
+
+    python -m planner plan PartAB/domain.pddl PartAB/mission1.pddl PartAB/mission2.pddl
+    python -m planner plan -o plans/ --search astar --heuristic add PartC/domain-ext.pddl PartC/mission3.pddl
+
+    python -m planner validate PartAB/domain.pddl PartAB/mission1.plan PartAB/mission2.plan
+    python -m planner validate -j 4 --problem big.pddl PartC/domain-ext.pddl runs/*.plan
+
+    python -m planner generate --domain lunar-extended --waypoints 50 --rovers 6 --landers 3 \
+        --images 10 --scans 10 --samples 3 --seed 1 -o big.pddl
+
+(run from MoonSong/). plan plans for every problem in turn and writes one
+JSON object per mission to stdout, with the plan length and the grounding,
+search and heuristic times. With -o the plan is also written to
+<dir>/<problem>.plan in the usual .plan format.
+
+validate replays .plan files and writes one JSON object per plan, in order:
+valid, the first failing step and why, and the goals not reached. A plan is
+checked against --problem, or else against the .pddl file of the same name
+next to it (mission1.plan -> mission1.pddl). -j validates in a worker pool.
+
+generate writes a random, solvable mission (see planner.generate) to -o or
+stdout; the same seed gives the same mission.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from .generate import DOMAINS
+from .search import ALGORITHMS
+
+
+def cmd_plan(args):
+    from .grounding import ground
+    from .pddl import load_domain, load_problem
+    from .plans import write_plan
+    from .search import search
+
+    domain = load_domain(args.domain)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    solved = True
+    for path in args.problems:
+        start = time.perf_counter()
+        task = ground(domain, load_problem(path, domain))
+        ground_time = time.perf_counter() - start
+        result = search(task, args.search, args.heuristic,
+                        max_expansions=args.max_expansions, time_limit=args.time_limit)
+        plan_file = None
+        if result.plan is not None and args.output_dir:
+            stem = os.path.splitext(os.path.basename(path))[0]
+            plan_file = os.path.join(args.output_dir, f"{stem}.plan")
+            write_plan(plan_file, task, result.plan)
+        print(json.dumps({"problem": path, **result.summary(), "plan_file": plan_file,
+                          "atoms": len(task.atoms), "actions": task.num_actions,
+                          "ground_time": round(ground_time, 6)}), flush=True)
+        solved = solved and result.status == "solved"
+    return 0 if solved else 1
+
+
+def _validate_jobs(domain, plans, problem):
+    for path in plans:
+        yield domain, problem or os.path.splitext(path)[0] + ".pddl", path
+
+
+def cmd_validate(args):
+    from .validate import validate_job
+
+    jobs = _validate_jobs(args.domain, args.plans, args.problem)
+    if args.workers > 1:
+        from multiprocessing import Pool
+        pool = Pool(args.workers)
+        results = pool.imap(validate_job, jobs, chunksize=args.chunksize)
+    else:
+        pool = None
+        results = map(validate_job, jobs)
+
+    valid = True
+    try:
+        for result in results:
+            print(json.dumps(result))
+            valid = valid and result["valid"]
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return 0 if valid else 1
+
+
+def cmd_generate(args):
+    from .generate import generate_problem
+
+    text = generate_problem(args.domain, waypoints=args.waypoints,
+                            connectivity=args.connectivity, rovers=args.rovers,
+                            landers=args.landers, landed=args.landed, images=args.images,
+                            scans=args.scans, samples=args.samples,
+                            astronauts=args.astronauts, seed=args.seed, name=args.name)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="planner",
+                                     description="Ground and plan the MoonSong PDDL missions.")
+    sub = parser.add_subparsers(dest="command")
+
+    plan = sub.add_parser("plan", help="plan for problems of a domain, print JSON lines")
+    plan.add_argument("domain", help="domain file (.pddl)")
+    plan.add_argument("problems", nargs="+", help="problem files (.pddl)")
+    plan.add_argument("-o", "--output-dir", default=None,
+                      help="write <problem>.plan files to this directory (default: none)")
+    plan.add_argument("--search", choices=ALGORITHMS, default="astar",
+                      help="astar (default) or gbfs, faster on large missions")
+    plan.add_argument("--heuristic", choices=["ff", "add"], default="ff")
+    plan.add_argument("--max-expansions", type=int, default=None)
+    plan.add_argument("--time-limit", type=float, default=None,
+                      help="per-problem search time limit in seconds")
+    plan.set_defaults(func=cmd_plan)
+
+    validate = sub.add_parser("validate", help="replay .plan files, print JSON lines")
+    validate.add_argument("domain", help="domain file (.pddl)")
+    validate.add_argument("plans", nargs="+", help=".plan files")
+    validate.add_argument("--problem", default=None,
+                          help="problem of every plan (default: <plan>.pddl)")
+    validate.add_argument("-j", "--workers", type=int, default=1,
+                          help="worker processes (default 1)")
+    validate.add_argument("--chunksize", type=int, default=16,
+                          help="plans per worker task")
+    validate.set_defaults(func=cmd_validate)
+
+    generate = sub.add_parser("generate", help="write a random mission (.pddl)")
+    generate.add_argument("--domain", choices=DOMAINS, default="lunar")
+    generate.add_argument("--waypoints", type=int, default=6)
+    generate.add_argument("--connectivity", type=float, default=2.0,
+                          help="average outgoing connections per waypoint")
+    generate.add_argument("--rovers", type=int, default=2)
+    generate.add_argument("--landers", type=int, default=2)
+    generate.add_argument("--landed", type=int, default=1,
+                          help="landers already landed, with their rovers deployed")
+    generate.add_argument("--images", type=int, default=2, help="image goals")
+    generate.add_argument("--scans", type=int, default=2, help="scan goals")
+    generate.add_argument("--samples", type=int, default=2, help="sample goals (<= landers)")
+    generate.add_argument("--astronauts", type=int, default=None,
+                          help="lunar-extended only (default: one per lander)")
+    generate.add_argument("--seed", type=int, default=0)
+    generate.add_argument("--name", default=None, help="problem name")
+    generate.add_argument("-o", "--output", default=None, help="output file (default: stdout)")
+    generate.set_defaults(func=cmd_generate)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not getattr(args, "func", None):
+        parser.print_help()
+        return 2
+    try:
+        return args.func(args)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    except BrokenPipeError:
+        return 1
@@ -0,0 +1,124 @@
+# planner/generate.py
+"""
+Problem generator
+-----------------
+Seeded random missions for the lunar (PartAB) and lunar-extended (PartC)
+domains, written in the layout of the hand-made mission files:
+
+    generate_problem("lunar-extended", waypoints=50, rovers=6, landers=3,
+                     images=10, scans=10, samples=3, seed=1)
+
+The map is a random spanning tree of two-way connections, so every waypoint
+can reach every other, plus one-way connections until waypoints have
+`connectivity` outgoing connections on average. Rovers and astronauts are
+associated with the landers in turn (rover1 and rover3 with lander1, ...).
+The first `landed` landers are already down at a random waypoint with their
+rovers deployed next to them; the others still have to land.
+
+Every generated mission is solvable, which is why some combinations are
+refused with ValueError:
+    - a lander holds one sample, so samples <= landers;
+    - every lander needs a rover (rovers >= landers);
+    - in lunar-extended every lander needs an astronaut to deploy rovers,
+      receive samples and transmit data (astronauts >= landers), and lunar
+      has no astronauts.
+"""
+
+import random
+
+DOMAINS = ("lunar", "lunar-extended")
+
+
+def generate_problem(domain="lunar", waypoints=6, connectivity=2.0, rovers=2, landers=2,
+                     landed=1, images=2, scans=2, samples=2, astronauts=None, seed=0,
+                     name=None):
+    """PDDL text of a random mission. astronauts defaults to one per lander (lunar-extended)."""
+    if domain not in DOMAINS:
+        raise ValueError(f"Unknown domain '{domain}', expected one of {', '.join(DOMAINS)}")
+    extended = domain == "lunar-extended"
+    if astronauts is None:
+        astronauts = landers if extended else 0
+    for what, value in [("waypoints", waypoints), ("rovers", rovers), ("landers", landers)]:
+        if value < 1:
+            raise ValueError(f"Need at least one of {what}, got {value}")
+    for what, value in [("landed", landed), ("images", images), ("scans", scans),
+                        ("samples", samples), ("astronauts", astronauts)]:
+        if value < 0:
+            raise ValueError(f"{what} must not be negative, got {value}")
+    if not 0 <= connectivity <= waypoints - 1:
+        raise ValueError(f"connectivity must be between 0 and {waypoints - 1}, got {connectivity}")
+    if landed > landers:
+        raise ValueError(f"{landed} landed landers but only {landers} landers")
+    if rovers < landers:
+        raise ValueError(f"Every lander needs a rover: {rovers} rovers for {landers} landers")
+    if samples > landers:
+        raise ValueError(f"A lander holds one sample: {samples} samples for {landers} landers")
+    if extended and astronauts < landers:
+        raise ValueError(f"Every lander needs an astronaut: {astronauts} astronauts "
+                         f"for {landers} landers")
+    if not extended and astronauts:
+        raise ValueError("The lunar domain has no astronauts")
+
+    rng = random.Random(seed)
+    wp = [f"WP{i}" for i in range(1, waypoints + 1)]
+    lander = [f"lander{i}" for i in range(1, landers + 1)]
+    rover = [f"rover{i}" for i in range(1, rovers + 1)]
+    astronaut = [f"astronaut{i}" for i in range(1, astronauts + 1)]
+    image = [f"image{i}" for i in range(1, images + 1)]
+    scan = [f"scan{i}" for i in range(1, scans + 1)]
+    sample = [f"sample{i}" for i in range(1, samples + 1)]
+    objects = [(wp, "location"), (lander, "lander"), (rover, "rover"), (image, "image"),
+               (scan, "scan"), (sample, "sample")]
+    if extended:
+        objects += [([f"docking_bay{i}" for i in range(1, landers + 1)], "docking_bay"),
+                    ([f"control_room{i}" for i in range(1, landers + 1)], "control_room"),
+                    (astronaut, "astronaut")]
+
+    # spanning tree, then random one-way edges up to the average out-degree
+    edges = []
+    order = wp[:]
+    rng.shuffle(order)
+    for i in range(1, len(order)):
+        other = order[rng.randrange(i)]
+        edges += [(order[i], other), (other, order[i])]
+    seen = set(edges)
+    target = max(len(edges), round(connectivity * waypoints))
+    while len(edges) < target:
+        edge = tuple(rng.sample(wp, 2))
+        if edge not in seen:
+            seen.add(edge)
+            edges.append(edge)
+    init = [f"(is_connected {a} {b})" for a, b in edges]
+
+    for r in rover:
+        init += [f"(hand_empty {r})", f"(empty_memory {r})"]
+    for i, lan in enumerate(lander):
+        n = i + 1
+        crew = rover[i::landers]
+        if i < landed:
+            site = rng.choice(wp)
+            init += [f"(is_landed {lan})", f"(on_position {lan} {site})"]
+            for r in crew:
+                init += [f"(is_deployed {r})"] if extended else []
+                init.append(f"(on_position {r} {site})")
+        if extended:
+            init += [f"(is_area_of docking_bay{n} {lan})", f"(is_area_of control_room{n} {lan})"]
+            for a in astronaut[i::landers]:
+                area = rng.choice(["docking_bay", "control_room"])
+                init.append(f"(astronaut_at {a} {lan} {area}{n})")
+        init += [f"(association {lan} {r})" for r in crew]
+    init += [f"(need_image {rng.choice(wp)} {d})" for d in image]
+    init += [f"(need_scan {rng.choice(wp)} {d})" for d in scan]
+    init += [f"(need_sample {rng.choice(wp)} {s})" for s in sample]
+    goal = [f"(has_received {d})" for d in image + scan] + [f"(sample_got {s})" for s in sample]
+
+    if name is None:
+        name = f"{domain}-w{waypoints}-r{rovers}-l{landers}-g{len(goal)}-s{seed}"
+    lines = [f"(define (problem {name})", f"    (:domain {domain})", "", "    (:objects"]
+    lines += [f"        {obj} - {t}" for names, t in objects for obj in names]
+    lines += ["    )", "", "    (:init"]
+    lines += [f"        {atom}" for atom in init]
+    lines += ["    )", "", "    (:goal", "        (and"]
+    lines += [f"            {atom}" for atom in goal]
+    lines += ["        )", "    )", ")"]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,385 @@
+# planner/grounding.py
+"""
+Grounding
+---------
+Turns a Domain and Problem into a GroundTask: numbered atoms and ground
+actions whose preconditions and effects are lists of atom numbers.
+
+Only actions that can ever become applicable are generated. Grounding is a
+relaxed reachability fixpoint (negative preconditions and delete effects
+ignored) driven by the reached atoms, as in Datalog semi-naive evaluation:
+
+    - every atom reached is processed once. For each precondition it
+      matches, the other positive preconditions are joined against the
+      atoms processed so far, through an index (predicate, position,
+      object) -> atoms. Each join step takes the precondition with the
+      fewest candidates under the current binding;
+    - an action's add effects are new atoms to process;
+    - parameters no positive precondition mentions range over all objects
+      of their type.
+
+An action is generated exactly once, when the last of its precondition
+atoms is processed, so no set of seen actions is needed. rover_move is
+therefore only grounded along connected waypoints, for rovers that can reach
+the first one, and transmit_data only for associated landers.
+
+Static predicates (no action changes them, e.g. is_connected) are checked
+during grounding and then dropped. A negative precondition on an atom that is
+never reached always holds, and a negative precondition on a static atom that
+is true rules the action out.
+
+Ground actions are stored as flat arrays (see Ragged). Together with the
+per-schema parameter types that keeps hundreds of thousands of actions in a
+few tens of megabytes.
+"""
+
+from array import array
+from itertools import product
+from operator import itemgetter
+
+from .pddl import load_domain, load_problem
+
+
+class Ragged:
+    """A list of int sequences stored as one flat array plus offsets."""
+    __slots__ = ("offsets", "data")
+
+    def __init__(self):
+        self.offsets = array("I", [0])
+        self.data = array("I")
+
+    def append(self, items):
+        self.data.extend(items)
+        self.offsets.append(len(self.data))
+
+    def __getitem__(self, i):
+        return self.data[self.offsets[i]:self.offsets[i + 1]]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self):
+        return (len(self.offsets) + len(self.data)) * self.data.itemsize
+
+
+class GroundTask:
+    """
+    A grounded planning task.
+
+    atoms        : atom tuples (predicate, arg, ...) of the fluents; the index
+                   of an atom is its number
+    atom_index   : atom tuple -> number
+    init         : numbers of the atoms true initially
+    goal, goal_neg: numbers of the atoms that must be true / false at the end
+    objects      : object names; action arguments are indices into it
+    schemas      : action schema names; action_schema[i] indexes into it
+    args, pre, neg, add, delete: Ragged, per action
+    """
+    __slots__ = ("name", "domain_name", "atoms", "atom_index", "init", "goal", "goal_neg",
+                 "objects", "schemas", "action_schema", "args", "pre", "neg", "add", "delete")
+
+    def __init__(self, name, domain_name, objects, schemas):
+        self.name = name
+        self.domain_name = domain_name
+        self.atoms = []
+        self.atom_index = {}
+        self.init = ()
+        self.goal = ()
+        self.goal_neg = ()
+        self.objects = objects
+        self.schemas = schemas
+        self.action_schema = array("H")
+        self.args = Ragged()
+        self.pre = Ragged()
+        self.neg = Ragged()
+        self.add = Ragged()
+        self.delete = Ragged()
+
+    @property
+    def num_actions(self):
+        return len(self.action_schema)
+
+    def action_name(self, i):
+        """'(rover_move wp1 wp2 rover1)', as written in .plan files."""
+        objects = self.objects
+        return "(" + " ".join([self.schemas[self.action_schema[i]]]
+                              + [objects[o] for o in self.args[i]]) + ")"
+
+    def atom_name(self, i):
+        return "(" + " ".join(self.atoms[i]) + ")"
+
+    def stats(self):
+        return {"atoms": len(self.atoms), "actions": self.num_actions,
+                "action_bytes": sum(r.nbytes for r in (self.args, self.pre, self.neg,
+                                                       self.add, self.delete))
+                                + self.action_schema.itemsize * self.num_actions}
+
+    def __repr__(self):
+        return f"GroundTask({self.name}, {len(self.atoms)} atoms, {self.num_actions} actions)"
+
+
+class _Schema:
+    """
+    An action schema compiled for grounding. Terms are slot numbers: the
+    parameters first, then the constants the schema mentions, so a binding is
+    one list and constants are bound from the start. A literal is
+    (predicate, slots, getter), getter(binding) giving the atom's arguments.
+    """
+    __slots__ = ("index", "name", "arity", "slot_types", "constants", "pre", "equal",
+                 "not_equal", "fluent_pre", "fluent_neg", "static_neg", "add", "delete", "free")
+
+    def __init__(self, index, schema, fluents):
+        self.index = index
+        self.name = schema.name
+        self.arity = len(schema.parameters)
+        slots = {p: i for i, (p, _) in enumerate(schema.parameters)}
+        self.slot_types = [t for _, t in schema.parameters]
+        self.constants = []
+        literals = schema.pre + schema.neg + schema.add + schema.delete
+        for term in [t for lit in literals for t in lit[1:]] + \
+                [t for pair in schema.equal + schema.not_equal for t in pair]:
+            if term not in slots:
+                slots[term] = len(slots)
+                self.constants.append(term)
+
+        def compile_literal(lit):
+            args = tuple(slots[t] for t in lit[1:])
+            if len(args) == 1:
+                s = args[0]
+                return lit[0], args, lambda binding: (binding[s],)
+            return lit[0], args, itemgetter(*args) if args else lambda binding: ()
+
+        self.pre = [compile_literal(lit) for lit in schema.pre]
+        self.fluent_pre = [lit for lit in self.pre if lit[0] in fluents]
+        neg = [compile_literal(lit) for lit in schema.neg]
+        self.fluent_neg = [lit for lit in neg if lit[0] in fluents]
+        self.static_neg = [lit for lit in neg if lit[0] not in fluents]
+        self.add = [compile_literal(lit) for lit in schema.add]
+        self.delete = [compile_literal(lit) for lit in schema.delete]
+        self.equal = [(slots[a], slots[b]) for a, b in schema.equal]
+        self.not_equal = [(slots[a], slots[b]) for a, b in schema.not_equal]
+        bound = {s for _, args, _ in self.pre for s in args}
+        self.free = [s for s in range(self.arity) if s not in bound]
+
+
+def _objects_by_type(domain, objects):
+    """type -> list of objects of that type or a subtype, in declaration order."""
+    out = {t: [] for t in domain.types}
+    for obj, t in objects.items():
+        while t is not None:
+            out[t].append(obj)
+            t = domain.types.get(t)
+    return out
+
+
+def ground(domain, problem):
+    """GroundTask of problem (see the module docstring)."""
+    objects = {**domain.constants, **problem.objects}
+    of_type = _objects_by_type(domain, objects)
+    members = {t: set(objs) for t, objs in of_type.items()}
+    fluents = domain.fluents()
+    schemas = [_Schema(i, a, fluents) for i, a in enumerate(domain.actions)]
+    obj_index = {obj: i for i, obj in enumerate(objects)}
+    task = GroundTask(problem.name, domain.name, list(objects), [s.name for s in schemas])
+
+    # precondition triggers: predicate -> [(schema, literal position)]
+    triggers = {}
+    for schema in schemas:
+        for k, lit in enumerate(schema.pre):
+            triggers.setdefault(lit[0], []).append((schema, k))
+
+    static = {atom for atom in problem.init if atom[0] not in fluents}
+    # every fluent atom an action mentions is numbered when the action is
+    # found; atoms that are never reached are removed at the end
+    atom_index = {}
+    reached = set()
+    queue = []
+    processed = {}                          # atom -> itself
+    by_pred = {}
+    by_arg = {}
+
+    def reach(atom):
+        if atom not in reached:
+            reached.add(atom)
+            queue.append(atom)
+
+    def number(atoms):
+        return sorted({atom_index.setdefault(atom, len(atom_index)) for atom in atoms})
+
+    def candidates(pred, args, get, binding):
+        """Processed atoms that may match the literal under binding."""
+        best = None
+        complete = True
+        for pos, s in enumerate(args):
+            value = binding[s]
+            if value is None:
+                complete = False
+            else:
+                cands = by_arg.get((pred, pos, value), ())
+                if best is None or len(cands) < len(best):
+                    best = cands
+        if complete:
+            atom = processed.get((pred,) + get(binding))
+            return () if atom is None else (atom,)
+        return by_pred.get(pred, ()) if best is None else best
+
+    def bind(schema, args, atom, binding):
+        """Slots newly bound by matching atom to args, or None if it does not match."""
+        new = []
+        for s, value in zip(args, atom[1:]):
+            current = binding[s]
+            if current is None:
+                if value not in members[schema.slot_types[s]]:
+                    break
+                binding[s] = value
+                new.append(s)
+            elif current != value:
+                break
+        else:
+            return new
+        for s in new:
+            binding[s] = None
+        return None
+
+    def join(schema, binding, todo, exclude):
+        """Complete binding over the preconditions in todo; exclude: {k: atom not to use}."""
+        if not todo:
+            finish(schema, binding)
+            return
+        best = None
+        for k in todo:
+            cands = candidates(*schema.pre[k], binding)
+            if best is None or len(cands) < len(best[1]):
+                best = (k, cands)
+                if not cands:
+                    return
+        k, cands = best
+        args = schema.pre[k][1]
+        rest = [j for j in todo if j != k]
+        skip = exclude.get(k)
+        for atom in cands:
+            if atom is skip:
+                continue
+            new = bind(schema, args, atom, binding)
+            if new is not None:
+                join(schema, binding, rest, exclude)
+                for s in new:
+                    binding[s] = None
+
+    def finish(schema, binding):
+        if schema.free:
+            pools = [of_type[schema.slot_types[s]] for s in schema.free]
+            for values in product(*pools):
+                for s, value in zip(schema.free, values):
+                    binding[s] = value
+                emit(schema, binding)
+            for s in schema.free:
+                binding[s] = None
+        else:
+            emit(schema, binding)
+
+    def emit(schema, binding):
+        for a, b in schema.equal:
+            if binding[a] != binding[b]:
+                return
+        for a, b in schema.not_equal:
+            if binding[a] == binding[b]:
+                return
+        for pred, _, get in schema.static_neg:
+            if (pred,) + get(binding) in static:
+                return
+        pre = number([(pred,) + get(binding) for pred, _, get in schema.fluent_pre])
+        neg = number([(pred,) + get(binding) for pred, _, get in schema.fluent_neg])
+        if neg and not set(pre).isdisjoint(neg):
+            return
+        added = [(pred,) + get(binding) for pred, _, get in schema.add]
+        for atom in added:
+            reach(atom)
+        add = number(added)
+        delete = number([(pred,) + get(binding) for pred, _, get in schema.delete])
+        if delete and not set(add).isdisjoint(delete):
+            delete = [n for n in delete if n not in add]
+        task.action_schema.append(schema.index)
+        task.args.append([obj_index[binding[s]] for s in range(schema.arity)])
+        task.pre.append(pre)
+        task.neg.append(neg)
+        task.add.append(add)
+        task.delete.append(delete)
+
+    def fresh(schema):
+        return [None] * schema.arity + schema.constants
+
+    for schema in schemas:
+        if not schema.pre:
+            finish(schema, fresh(schema))
+    for atom in problem.init:
+        reach(atom)
+
+    head = 0
+    while head < len(queue):
+        atom = queue[head]
+        head += 1
+        pred = atom[0]
+        if pred in fluents:
+            atom_index.setdefault(atom, len(atom_index))
+        processed[atom] = atom
+        by_pred.setdefault(pred, []).append(atom)
+        for pos, value in enumerate(atom[1:]):
+            by_arg.setdefault((pred, pos, value), []).append(atom)
+        for schema, k in triggers.get(pred, ()):
+            binding = fresh(schema)
+            if bind(schema, schema.pre[k][1], atom, binding) is None:
+                continue
+            # the atom may fill preconditions before k too, but not after it,
+            # so an action whose preconditions repeat an atom is found once
+            exclude = {j: atom for j in range(k + 1, len(schema.pre))}
+            join(schema, binding, [j for j in range(len(schema.pre)) if j != k], exclude)
+
+    # goal atoms are kept even if unreachable: the task then has no plan
+    goal = [a for a in problem.goal if a not in static]
+    for atom in goal:
+        atom_index.setdefault(atom, len(atom_index))
+    keep = reached.union(goal)
+    if len(keep) - len(static) < len(atom_index):
+        _drop_unreached(task, atom_index, keep)
+    task.atom_index = atom_index
+    task.atoms = list(atom_index)
+    task.init = tuple(atom_index[a] for a in problem.init if a in atom_index)
+    task.goal = tuple(sorted(atom_index[a] for a in goal))
+    task.goal_neg = tuple(sorted(atom_index[a] for a in problem.goal_neg if a in atom_index))
+    return task
+
+
+def _drop_unreached(task, atom_index, keep):
+    """
+    Renumber the atoms in keep and remove the others from atom_index and
+    the actions. Only negative preconditions and delete effects can mention
+    an atom that is never reached; such a precondition always holds.
+    """
+    renumber = array("l")
+    kept = 0
+    for atom in list(atom_index):
+        if atom in keep:
+            renumber.append(kept)
+            kept += 1
+        else:
+            renumber.append(-1)
+            del atom_index[atom]
+    for i, atom in enumerate(atom_index):
+        atom_index[atom] = i
+    for name in ("pre", "add"):
+        table = getattr(task, name)
+        table.data = array("I", [renumber[n] for n in table.data])
+    for name in ("neg", "delete"):
+        old = getattr(task, name)
+        table = Ragged()
+        for i in range(len(old)):
+            table.append([renumber[n] for n in old[i] if renumber[n] >= 0])
+        setattr(task, name, table)
+
+
+def ground_files(domain_path, problem_path):
+    """Parse and ground a domain and problem file."""
+    domain = load_domain(domain_path)
+    return ground(domain, load_problem(problem_path, domain))
@@ -0,0 +1,147 @@
+# planner/heuristics.py
+"""
+Delete-relaxation heuristics
+----------------------------
+In the delete relaxation an atom, once true, stays true. Both heuristics
+come from one cost propagation over it (a generalized Dijkstra with unit
+action costs):
+
+    cost(p) = 0 if p holds in the state, else min over the actions a adding p
+              of 1 + sum of cost(q) for the preconditions q of a
+
+    h_add = sum of cost(g) over the goal atoms. It counts shared subgoals
+            more than once, so it overestimates, but it is informative.
+    h_FF  = number of actions in a relaxed plan, extracted backwards from
+            the goals through the cheapest achiever of every atom (Hoffmann
+            & Nebel 2001). The relaxed plan's actions that are applicable in
+            the state are its helpful actions (preferred operators).
+
+Negative preconditions are compiled into complementary atoms: "not p" is
+true in a state iff p is false, and is added by the actions that delete p.
+Without that the relaxation would ignore them, and miss dead ends such as a
+rover holding a sample for a lander that is already full: (not (is_full
+?lan)) can never become true again, so the state gets h = INF.
+
+The propagation stops as soon as every goal atom has its final cost, and
+only touches the actions it reaches. Neither heuristic is admissible: A*
+with them finds good plans, not necessarily shortest ones.
+"""
+
+import heapq
+
+INF = float("inf")
+
+
+def precondition_index(task):
+    """List atom -> tuple of the actions with that atom as a precondition."""
+    index = [[] for _ in task.atoms]
+    pre = task.pre
+    for a in range(task.num_actions):
+        for n in pre[a]:
+            index[n].append(a)
+    return [tuple(actions) for actions in index]
+
+
+class RelaxedHeuristic:
+    """
+    h_add or h_FF (kind "add" / "ff") of a GroundTask. Call it with the
+    atoms true in a state, in increasing order; it returns (h, helpful
+    actions), h being INF for a dead end. Only h_FF has helpful actions.
+
+    The hot loops run over plain lists of tuples (preconditions, add
+    effects, the precondition index) rather than the task's flat arrays:
+    more memory, but several times faster in pure Python.
+    """
+    __slots__ = ("kind", "by_pre", "pre", "adds", "pre_count", "no_pre", "goal", "negated")
+
+    def __init__(self, task, kind="ff"):
+        if kind not in ("add", "ff"):
+            raise ValueError(f"Unknown heuristic '{kind}'")
+        self.kind = kind
+        # negated[i] = (p, number of the atom "not p")
+        complement = {}
+        for n in sorted(set(task.neg.data)):
+            complement[n] = len(task.atoms) + len(complement)
+        self.negated = list(complement.items())
+        self.pre = []
+        self.adds = []
+        for a in range(task.num_actions):
+            self.pre.append(tuple(task.pre[a]) + tuple(complement[n] for n in task.neg[a]))
+            self.adds.append(tuple(task.add[a]) + tuple(complement[n] for n in task.delete[a]
+                                                        if n in complement))
+        by_pre = [[] for _ in range(len(task.atoms) + len(complement))]
+        for a, pre in enumerate(self.pre):
+            for n in pre:
+                by_pre[n].append(a)
+        self.by_pre = [tuple(actions) for actions in by_pre]
+        self.pre_count = [len(p) for p in self.pre]
+        self.no_pre = [a for a, n in enumerate(self.pre_count) if not n]
+        self.goal = list(task.goal)
+
+    def __call__(self, atoms):
+        if self.negated:
+            true = set(atoms)
+            atoms = atoms + [c for n, c in self.negated if n not in true]
+        cost, supporter = self._propagate(atoms)
+        if cost is None:
+            return INF, ()
+        if self.kind == "add":
+            return sum(cost[g] for g in self.goal), ()
+        return self._relaxed_plan(atoms, supporter)
+
+    def _propagate(self, atoms):
+        """(cost, supporter) lists over the atoms, or (None, None) if a goal is unreachable."""
+        by_pre, adds = self.by_pre, self.adds
+        cost = [INF] * len(by_pre)
+        supporter = [-1] * len(by_pre)
+        for p in atoms:
+            cost[p] = 0
+        heap = [(0, p) for p in atoms]         # increasing, so already a heap
+        for a in self.no_pre:
+            for q in adds[a]:
+                if 1 < cost[q]:
+                    cost[q] = 1
+                    supporter[q] = a
+                    heap.append((1, q))
+        heapq.heapify(heap)
+        unsat = self.pre_count[:]
+        total = [0] * len(unsat)
+        goals_left = {g for g in self.goal if cost[g]}
+        push, pop = heapq.heappush, heapq.heappop
+        while heap and goals_left:
+            c, p = pop(heap)
+            if c > cost[p]:
+                continue                       # superseded by a cheaper entry
+            goals_left.discard(p)
+            for a in by_pre[p]:
+                left = unsat[a] - 1
+                unsat[a] = left
+                total[a] += c
+                if not left:
+                    ca = total[a] + 1
+                    for q in adds[a]:
+                        if ca < cost[q]:
+                            cost[q] = ca
+                            supporter[q] = a
+                            push(heap, (ca, q))
+        if goals_left:
+            return None, None
+        return cost, supporter
+
+    def _relaxed_plan(self, atoms, supporter):
+        true = set(atoms)
+        pre = self.pre
+        plan = set()
+        stack = [g for g in self.goal if g not in true]
+        seen = set(stack)
+        while stack:
+            a = supporter[stack.pop()]
+            if a in plan:
+                continue
+            plan.add(a)
+            for q in pre[a]:
+                if q not in true and q not in seen:
+                    seen.add(q)
+                    stack.append(q)
+        helpful = [a for a in plan if true.issuperset(pre[a])]
+        return len(plan), helpful
@@ -0,0 +1,332 @@
+# planner/pddl.py
+"""
+PDDL reader
+-----------
+Parses the subset of PDDL the MoonSong models use: STRIPS with :typing
+(a type hierarchy, typed parameters, objects and constants) and
+:negative-preconditions, including (= ?a ?b) and (not (= ?a ?b)).
+
+Names are case-insensitive, so everything is lower-cased (WP1 -> wp1, which
+is also how the .plan files spell them). Comments run from ';' to the end of
+the line. An object may share its name with a type (rover - rover).
+
+Problems are read against their domain:
+    - negative literals in :init are dropped (closed world: every atom not
+      listed is false anyway);
+    - init atoms over predicates the domain does not declare are dropped
+      with a warning (mission1 lists (is_deployed rover) for a domain
+      without is_deployed);
+    - anything else that does not fit the domain raises ValueError.
+
+A literal is a flat tuple (predicate, arg, ...). In action schemas the
+arguments are parameter names (?x) or constants.
+"""
+
+import re
+import warnings
+
+_TOKEN = re.compile(r"[()]|[^\s()]+")
+ROOT_TYPE = "object"
+
+
+def tokenize(text):
+    """Lower-cased tokens of a PDDL text, comments removed."""
+    text = re.sub(r";[^\n]*", " ", text)
+    return _TOKEN.findall(text.lower())
+
+
+def parse_sexpr(text):
+    """The single top-level s-expression of text, as nested lists of strings."""
+    tokens = tokenize(text)
+    stack = [[]]
+    for tok in tokens:
+        if tok == "(":
+            stack.append([])
+        elif tok == ")":
+            if len(stack) == 1:
+                raise ValueError("Unbalanced ')' in PDDL text")
+            done = stack.pop()
+            stack[-1].append(done)
+        else:
+            stack[-1].append(tok)
+    if len(stack) > 1:
+        raise ValueError("Missing ')' at end of PDDL text")
+    if len(stack[0]) != 1 or not isinstance(stack[0][0], list):
+        raise ValueError("Expected exactly one (define ...) expression")
+    return stack[0][0]
+
+
+def _typed_list(items, what):
+    """[(name, type)] of a typed list such as (a b - t c - u d)."""
+    out = []
+    pending = []
+    i = 0
+    while i < len(items):
+        item = items[i]
+        if isinstance(item, list):
+            raise ValueError(f"Unexpected list in {what}: {item}")
+        if item == "-":
+            if i + 1 >= len(items) or isinstance(items[i + 1], list):
+                raise ValueError(f"Missing or unsupported type after '-' in {what}")
+            out.extend((name, items[i + 1]) for name in pending)
+            pending = []
+            i += 2
+            continue
+        pending.append(item)
+        i += 1
+    out.extend((name, ROOT_TYPE) for name in pending)
+    return out
+
+
+class ActionSchema:
+    """
+    A lifted action. parameters: [(name, type)]; pre / neg: positive and
+    negated precondition literals; equal / not_equal: (term, term) pairs;
+    add / delete: effect literals.
+    """
+    __slots__ = ("name", "parameters", "pre", "neg", "equal", "not_equal", "add", "delete")
+
+    def __init__(self, name, parameters):
+        self.name = name
+        self.parameters = parameters
+        self.pre = []
+        self.neg = []
+        self.equal = []
+        self.not_equal = []
+        self.add = []
+        self.delete = []
+
+    def __repr__(self):
+        return f"ActionSchema({self.name}, {len(self.parameters)} parameters)"
+
+
+class Domain:
+    """
+    types: type -> parent type; constants: name -> type;
+    predicates: name -> [argument types]; actions: [ActionSchema].
+    """
+    __slots__ = ("name", "requirements", "types", "constants", "predicates", "actions")
+
+    def __init__(self, name):
+        self.name = name
+        self.requirements = []
+        self.types = {ROOT_TYPE: None}
+        self.constants = {}
+        self.predicates = {}
+        self.actions = []
+
+    def is_subtype(self, sub, sup):
+        """Whether type sub is sup or one of its descendants."""
+        while sub is not None:
+            if sub == sup:
+                return True
+            sub = self.types.get(sub)
+        return False
+
+    def fluents(self):
+        """Predicates some action changes; all others are static."""
+        return {lit[0] for a in self.actions for lit in a.add + a.delete}
+
+    def __repr__(self):
+        return f"Domain({self.name}, {len(self.predicates)} predicates, {len(self.actions)} actions)"
+
+
+class Problem:
+    """
+    objects: name -> type (declaration order); init: positive atoms, in file
+    order without duplicates; goal / goal_neg: atoms that must be true / false.
+    """
+    __slots__ = ("name", "domain_name", "objects", "init", "goal", "goal_neg")
+
+    def __init__(self, name, domain_name):
+        self.name = name
+        self.domain_name = domain_name
+        self.objects = {}
+        self.init = []
+        self.goal = []
+        self.goal_neg = []
+
+    def __repr__(self):
+        return (f"Problem({self.name}, {len(self.objects)} objects, {len(self.init)} init atoms, "
+                f"{len(self.goal) + len(self.goal_neg)} goals)")
+
+
+def _sections(expr, kind):
+    """(name, {':keyword': [contents]}) of a (define (kind name) ...) expression."""
+    if len(expr) < 2 or expr[0] != "define" or not isinstance(expr[1], list) \
+            or len(expr[1]) != 2 or expr[1][0] != kind:
+        raise ValueError(f"Expected (define ({kind} <name>) ...)")
+    sections = {}
+    for item in expr[2:]:
+        if not isinstance(item, list) or not item or not str(item[0]).startswith(":"):
+            raise ValueError(f"Unexpected item in {kind} definition: {item}")
+        if item[0] == ":action":
+            sections.setdefault(":action", []).append(item[1:])
+        elif item[0] in sections:
+            raise ValueError(f"Duplicate section {item[0]}")
+        else:
+            sections[item[0]] = item[1:]
+    return expr[1][1], sections
+
+
+def _literal(expr, where):
+    if not expr or any(isinstance(x, list) for x in expr):
+        raise ValueError(f"Malformed literal in {where}: {expr}")
+    return tuple(expr)
+
+
+def _conjunction(expr, where):
+    """[(positive, literal)] of a conjunction of (possibly negated) literals."""
+    if not expr:
+        return []
+    if expr[0] == "and":
+        out = []
+        for part in expr[1:]:
+            if not isinstance(part, list):
+                raise ValueError(f"Malformed condition in {where}: {part}")
+            out.extend(_conjunction(part, where))
+        return out
+    if expr[0] == "not":
+        if len(expr) != 2 or not isinstance(expr[1], list) or expr[1][:1] in (["and"], ["not"]):
+            raise ValueError(f"Only negated literals are supported in {where}: {expr}")
+        return [(False, _literal(expr[1], where))]
+    if expr[0] in ("or", "imply", "exists", "forall", "when"):
+        raise ValueError(f"Unsupported '{expr[0]}' in {where}")
+    return [(True, _literal(expr, where))]
+
+
+def parse_domain(text):
+    """Domain of a PDDL domain text."""
+    name, sections = _sections(parse_sexpr(text), "domain")
+    domain = Domain(name)
+    domain.requirements = list(sections.get(":requirements", []))
+    for t, parent in _typed_list(sections.get(":types", []), ":types"):
+        # as in any PDDL reader, every name before "- t" gets parent t, so
+        # "location data scan - data" makes location a data. "equipment
+        # rover - equipment" would make equipment its own parent
+        if t != ROOT_TYPE:
+            domain.types[t] = ROOT_TYPE if t == parent else parent
+    for t, parent in list(domain.types.items()):
+        if parent is not None and parent not in domain.types:
+            domain.types[parent] = ROOT_TYPE
+        seen = set()
+        while t is not None:
+            if t in seen:
+                raise ValueError(f"Cyclic type hierarchy at '{t}'")
+            seen.add(t)
+            t = domain.types.get(t)
+    for obj, t in _typed_list(sections.get(":constants", []), ":constants"):
+        domain.constants[obj] = _known_type(domain, t, obj)
+    for pred in sections.get(":predicates", []):
+        if not isinstance(pred, list) or not pred or isinstance(pred[0], list):
+            raise ValueError(f"Malformed predicate declaration: {pred}")
+        args = _typed_list(pred[1:], pred[0])
+        domain.predicates[pred[0]] = [_known_type(domain, t, pred[0]) for _, t in args]
+    for body in sections.get(":action", []):
+        domain.actions.append(_action(domain, body))
+    return domain
+
+
+def _known_type(domain, t, where):
+    if t not in domain.types:
+        raise ValueError(f"Unknown type '{t}' in {where}")
+    return t
+
+
+def _action(domain, body):
+    if not body or isinstance(body[0], list):
+        raise ValueError("Action without a name")
+    name = body[0]
+    fields = {}
+    for i in range(1, len(body) - 1, 2):
+        fields[body[i]] = body[i + 1]
+    if len(body) % 2 == 0 or set(fields) - {":parameters", ":precondition", ":effect"}:
+        raise ValueError(f"Malformed action '{name}'")
+    params = _typed_list(fields.get(":parameters", []), name)
+    schema = ActionSchema(name, [(p, _known_type(domain, t, name)) for p, t in params])
+    terms = {p for p, _ in params} | set(domain.constants)
+    if len(terms) - len(domain.constants) != len(params):
+        raise ValueError(f"Duplicate parameter in action '{name}'")
+
+    def check(lit):
+        for term in lit[1:]:
+            if term not in terms:
+                raise ValueError(f"Unknown term '{term}' in action '{name}'")
+        if lit[0] == "=":
+            if len(lit) != 3:
+                raise ValueError(f"'=' takes two arguments in action '{name}'")
+            return
+        if lit[0] not in domain.predicates:
+            raise ValueError(f"Unknown predicate '{lit[0]}' in action '{name}'")
+        if len(lit) - 1 != len(domain.predicates[lit[0]]):
+            raise ValueError(f"Wrong number of arguments for '{lit[0]}' in action '{name}'")
+
+    for positive, lit in _conjunction(fields.get(":precondition", []), name):
+        check(lit)
+        if lit[0] == "=":
+            (schema.equal if positive else schema.not_equal).append(lit[1:])
+        else:
+            (schema.pre if positive else schema.neg).append(lit)
+    for positive, lit in _conjunction(fields.get(":effect", []), name):
+        check(lit)
+        if lit[0] == "=":
+            raise ValueError(f"'=' in the effect of action '{name}'")
+        (schema.add if positive else schema.delete).append(lit)
+    return schema
+
+
+def parse_problem(text, domain):
+    """Problem of a PDDL problem text, checked against domain."""
+    name, sections = _sections(parse_sexpr(text), "problem")
+    declared = sections.get(":domain", [])
+    if len(declared) != 1 or declared[0] != domain.name:
+        raise ValueError(f"Problem '{name}' is for domain {declared}, not '{domain.name}'")
+    problem = Problem(name, domain.name)
+    for obj, t in _typed_list(sections.get(":objects", []), ":objects"):
+        if obj in problem.objects or obj in domain.constants:
+            raise ValueError(f"Object '{obj}' declared twice")
+        problem.objects[obj] = _known_type(domain, t, obj)
+    known = {**domain.constants, **problem.objects}
+
+    def check(lit, where):
+        pred = domain.predicates.get(lit[0])
+        if pred is None:
+            return False
+        if len(lit) - 1 != len(pred):
+            raise ValueError(f"Wrong number of arguments in {where} atom {lit}")
+        for obj, t in zip(lit[1:], pred):
+            if obj not in known:
+                raise ValueError(f"Unknown object '{obj}' in {where} atom {lit}")
+            if not domain.is_subtype(known[obj], t):
+                raise ValueError(f"'{obj}' is not a {t} in {where} atom {lit}")
+        return True
+
+    seen = set()
+    for item in sections.get(":init", []):
+        if not isinstance(item, list):
+            raise ValueError(f"Malformed init atom: {item}")
+        for positive, lit in _conjunction(item, ":init"):
+            if not check(lit, ":init"):
+                warnings.warn(f"{name}: ignoring init atom {lit}, "
+                              f"'{lit[0]}' is not a predicate of {domain.name}")
+            elif positive and lit not in seen:
+                seen.add(lit)
+                problem.init.append(lit)
+    goal = sections.get(":goal", [])
+    if len(goal) > 1:
+        raise ValueError("Malformed :goal")
+    for positive, lit in _conjunction(goal[0] if goal else [], ":goal"):
+        if not check(lit, ":goal"):
+            raise ValueError(f"Unknown predicate '{lit[0]}' in :goal")
+        (problem.goal if positive else problem.goal_neg).append(lit)
+    return problem
+
+
+def load_domain(path):
+    with open(path, encoding="utf-8") as f:
+        return parse_domain(f.read())
+
+
+def load_problem(path, domain):
+    with open(path, encoding="utf-8") as f:
+        return parse_problem(f.read(), domain)
@@ -0,0 +1,71 @@
+# planner/plans.py
+"""
+.plan files
+-----------
+The format the MoonSong plans were produced in (LAMA-first output): a
+domain/problem header, one timestamped action per line, 0.001 apart, and the
+makespan (the last timestamp) as the metric:
+
+    ;;!domain: lunar
+    ;;!problem: lunar-mission-1
+
+    0.00000: (lander_land lander rover wp1)
+    0.00100: (take_sample rover wp1 sample)
+
+    ; Makespan: 0.001
+    ; Metric: 0.001
+
+read_plan reads them back, and also accepts bare "(action args)" lines and
+a trailing "[duration]", as other planners write them.
+"""
+
+import re
+
+STEP = 0.001
+_STEP_LINE = re.compile(r"^(?:\d+(?:\.\d*)?\s*:\s*)?\(([^()]*)\)\s*(?:\[[^\]]*\])?$")
+
+
+def format_plan(task, plan):
+    """Text of a .plan file for a plan (action numbers of task)."""
+    lines = [f";;!domain: {task.domain_name}", f";;!problem: {task.name}", ""]
+    t = 0.0
+    for i, a in enumerate(plan):
+        if i:
+            t += STEP                          # accumulated, as the planner did
+        lines.append(f"{t:.5f}: {task.action_name(a)}")
+    lines += ["", f"; Makespan: {t!r}", f"; Metric: {t!r}"]
+    return "\n".join(lines) + "\n"
+
+
+def write_plan(path, task, plan):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(format_plan(task, plan))
+
+
+def read_plan(text):
+    """
+    (header, steps) of a .plan text. header has the ";;!domain:" and
+    ";;!problem:" names (None when missing); steps are (line number,
+    (action, arg, ...)) in plan order, lower-cased as in planner.pddl.
+    """
+    header = {"domain": None, "problem": None}
+    steps = []
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if line.startswith(";"):
+            key, sep, value = line.lstrip(";!").partition(":")
+            if sep and key.strip().lower() in header:
+                header[key.strip().lower()] = value.strip().lower()
+            continue
+        if not line:
+            continue
+        match = _STEP_LINE.match(line)
+        if not match or not match.group(1).split():
+            raise ValueError(f"line {number}: malformed plan step '{line}'")
+        steps.append((number, tuple(match.group(1).lower().split())))
+    return header, steps
+
+
+def load_plan(path):
+    with open(path, encoding="utf-8") as f:
+        return read_plan(f.read())
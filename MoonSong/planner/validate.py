@@ -0,0 +1,197 @@
+# planner/validate.py
+"""
+Plan validation
+---------------
+Replays a .plan file against its domain and problem and reports whether it
+is executable and reaches the goal, or the first step that goes wrong:
+
+    - an action the domain does not define, with the wrong number of
+      arguments, or with an unknown or wrongly typed object;
+    - a false precondition: the first one in domain order is reported,
+      e.g. "(at rover1 wp2) is false";
+    - the goals still false after the last step.
+
+Plans are replayed on the lifted schemas rather than on a GroundTask: a step
+is instantiated from its own arguments, so nothing is grounded and a plan
+is checked in about the time it takes to read it. The state is an int
+bitset as in planner.search, with atom numbers handed out on first use;
+atoms never mentioned by init are false. Effects follow PDDL: deletes first,
+then adds.
+
+validate_job is the unit of work of "python -m planner validate": it caches
+the parsed domain and problem per process, so a worker pool validates many
+plans of the same missions without parsing them again.
+"""
+
+import time
+
+from .pddl import load_domain, load_problem
+from .plans import load_plan
+
+
+def _atom_name(atom):
+    return f"({' '.join(atom)})"
+
+
+class ValidationResult:
+    """
+    Outcome of replaying a plan. steps is the number of steps applied;
+    failed_line and error describe the first failing step, or a plan that
+    could not be read. unsatisfied lists the goals not reached.
+    """
+    __slots__ = ("valid", "goal_reached", "steps", "failed_step", "failed_line", "error",
+                 "unsatisfied")
+
+    def __init__(self):
+        self.valid = False
+        self.goal_reached = False
+        self.steps = 0
+        self.failed_step = None
+        self.failed_line = None
+        self.error = None
+        self.unsatisfied = []
+
+    def summary(self):
+        return {
+            "valid": self.valid,
+            "goal_reached": self.goal_reached,
+            "steps": self.steps,
+            "failed_step": self.failed_step,
+            "failed_line": self.failed_line,
+            "error": self.error,
+            "unsatisfied": self.unsatisfied,
+        }
+
+    def __repr__(self):
+        return f"ValidationResult(valid={self.valid}, steps={self.steps}, error={self.error!r})"
+
+
+class PlanValidator:
+    """Replays plans (lists of (action, arg, ...) tuples) for one problem of a domain."""
+    __slots__ = ("domain", "problem", "schemas", "objects", "atom_ids", "init", "goal",
+                 "goal_neg")
+
+    def __init__(self, domain, problem):
+        if problem.domain_name != domain.name:
+            raise ValueError(f"Problem '{problem.name}' is not for domain '{domain.name}'")
+        self.domain = domain
+        self.problem = problem
+        self.schemas = {schema.name: schema for schema in domain.actions}
+        self.objects = {**domain.constants, **problem.objects}
+        self.atom_ids = {}
+        self.init = 0
+        for atom in problem.init:
+            self.init |= 1 << self._id(atom)
+        self.goal = [(atom, self._id(atom)) for atom in problem.goal]
+        self.goal_neg = [(atom, self._id(atom)) for atom in problem.goal_neg]
+
+    def _id(self, atom):
+        return self.atom_ids.setdefault(atom, len(self.atom_ids))
+
+    def _step(self, state, step):
+        """(state after step, None), or (None, why step cannot be applied)."""
+        name, args = step[0], step[1:]
+        schema = self.schemas.get(name)
+        if schema is None:
+            return None, f"unknown action '{name}'"
+        if len(args) != len(schema.parameters):
+            return None, (f"'{name}' takes {len(schema.parameters)} arguments, "
+                          f"got {len(args)}")
+        binding = {c: c for c in self.domain.constants}
+        for obj, (param, t) in zip(args, schema.parameters):
+            if obj not in self.objects:
+                return None, f"unknown object '{obj}'"
+            if not self.domain.is_subtype(self.objects[obj], t):
+                return None, f"'{obj}' is not a {t}"
+            binding[param] = obj
+        for a, b in schema.equal:
+            if binding[a] != binding[b]:
+                return None, f"precondition (= {binding[a]} {binding[b]}) is false"
+        for a, b in schema.not_equal:
+            if binding[a] == binding[b]:
+                return None, f"precondition (not (= {binding[a]} {binding[b]})) is false"
+        ids = self.atom_ids
+        for lit in schema.pre:
+            atom = (lit[0],) + tuple(binding[t] for t in lit[1:])
+            n = ids.get(atom)
+            if n is None or not state >> n & 1:
+                return None, f"precondition {_atom_name(atom)} is false"
+        for lit in schema.neg:
+            atom = (lit[0],) + tuple(binding[t] for t in lit[1:])
+            n = ids.get(atom)
+            if n is not None and state >> n & 1:
+                return None, f"precondition (not {_atom_name(atom)}) is false"
+        for lit in schema.delete:
+            n = ids.get((lit[0],) + tuple(binding[t] for t in lit[1:]))
+            if n is not None and state >> n & 1:
+                state ^= 1 << n
+        for lit in schema.add:
+            state |= 1 << self._id((lit[0],) + tuple(binding[t] for t in lit[1:]))
+        return state, None
+
+    def validate(self, steps):
+        """
+        ValidationResult of a plan. steps are (action, arg, ...) tuples, or
+        (line number, tuple) pairs as read_plan returns them.
+        """
+        result = ValidationResult()
+        state = self.init
+        for i, step in enumerate(steps, 1):
+            line = None
+            if isinstance(step[0], int):
+                line, step = step
+            state, error = self._step(state, step)
+            if error is not None:
+                result.failed_step = i
+                result.failed_line = line
+                result.error = f"step {i} {_atom_name(step)}: {error}"
+                return result
+            result.steps = i
+        result.unsatisfied = [_atom_name(atom) for atom, n in self.goal if not state >> n & 1]
+        result.unsatisfied += [f"(not {_atom_name(atom)})" for atom, n in self.goal_neg
+                               if state >> n & 1]
+        result.goal_reached = not result.unsatisfied
+        result.valid = result.goal_reached
+        if not result.valid:
+            result.error = f"{len(result.unsatisfied)} goal(s) not reached"
+        return result
+
+
+_VALIDATORS = {}                               # per process: (domain, problem path) -> validator
+
+
+def _validator(domain_path, problem_path):
+    key = (domain_path, problem_path)
+    validator = _VALIDATORS.get(key)
+    if validator is None:
+        domain = _VALIDATORS.get(domain_path)
+        if domain is None:
+            domain = _VALIDATORS[domain_path] = load_domain(domain_path)
+        validator = _VALIDATORS[key] = PlanValidator(domain, load_problem(problem_path, domain))
+    return validator
+
+
+def validate_job(job):
+    """
+    Validate one plan file: job is (domain path, problem path, plan path).
+    Returns a JSON-ready dict; files that cannot be read or do not match
+    the problem are reported as invalid rather than raised.
+    """
+    domain_path, problem_path, plan_path = job
+    start = time.perf_counter()
+    out = {"plan": plan_path, "problem": problem_path}
+    try:
+        validator = _validator(domain_path, problem_path)
+        header, steps = load_plan(plan_path)
+        problem = validator.problem
+        if header["problem"] not in (None, problem.name):
+            raise ValueError(f"plan is for problem '{header['problem']}', not '{problem.name}'")
+        if header["domain"] not in (None, problem.domain_name):
+            raise ValueError(f"plan is for domain '{header['domain']}', "
+                             f"not '{problem.domain_name}'")
+        out.update(validator.validate(steps).summary())
+    except (OSError, ValueError) as e:
+        out.update(ValidationResult().summary())
+        out["error"] = str(e)
+    out["validate_time"] = round(time.perf_counter() - start, 6)
+    return out
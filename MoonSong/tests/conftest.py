@@ -0,0 +1,8 @@
+import os
+import sys
+
+# MoonSong/ (the directory holding the planner package) goes first on sys.path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
@@ -0,0 +1,60 @@
+# tests/test_generate.py
+import os
+
+import pytest
+
+from planner.generate import generate_problem
+from planner.grounding import ground
+from planner.pddl import load_domain, parse_problem
+from planner.plans import format_plan, read_plan
+from planner.search import search
+from planner.validate import PlanValidator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOMAINS = {"lunar": "PartAB/domain.pddl", "lunar-extended": "PartC/domain-ext.pddl"}
+
+
+def test_generates_solvable_missions():
+    for name, path in DOMAINS.items():
+        domain = load_domain(os.path.join(ROOT, path))
+        for seed in range(3):
+            text = generate_problem(name, waypoints=15, connectivity=2.5, rovers=3, landers=2,
+                                    images=3, scans=3, samples=1, seed=seed)
+            assert text == generate_problem(name, waypoints=15, connectivity=2.5, rovers=3,
+                                            landers=2, images=3, scans=3, samples=1, seed=seed)
+            problem = parse_problem(text, domain)
+            assert len(problem.goal) == 7
+            assert sum(o.startswith("astronaut") for o in problem.objects) == \
+                (2 if name == "lunar-extended" else 0)
+            edges = {atom[1:] for atom in problem.init if atom[0] == "is_connected"}
+            assert len(edges) == round(2.5 * 15)
+            reached, todo = {"wp1"}, ["wp1"]       # every waypoint reaches every other
+            while todo:
+                here = todo.pop()
+                for a, b in edges:
+                    if a == here and b not in reached:
+                        reached.add(b)
+                        todo.append(b)
+            assert len(reached) == 15
+
+            task = ground(domain, problem)
+            result = search(task, "gbfs")
+            assert result.status == "solved"
+            _, steps = read_plan(format_plan(task, result.plan))
+            assert PlanValidator(domain, problem).validate(steps).valid
+    assert generate_problem(seed=1) != generate_problem(seed=2)
+
+
+def test_rejects_unsolvable_parameters():
+    for kwargs, message in [
+        (dict(samples=3, landers=2), "A lander holds one sample"),
+        (dict(rovers=1, landers=2), "Every lander needs a rover"),
+        (dict(domain="lunar-extended", astronauts=1), "Every lander needs an astronaut"),
+        (dict(astronauts=1), "no astronauts"),
+        (dict(landed=3), "only 2 landers"),
+        (dict(waypoints=3, connectivity=3), "connectivity must be between 0 and 2"),
+        (dict(waypoints=0), "at least one of waypoints"),
+        (dict(domain="mars"), "Unknown domain 'mars'"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            generate_problem(**kwargs)
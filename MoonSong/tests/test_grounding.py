@@ -0,0 +1,85 @@
+# tests/test_grounding.py
+import os
+import warnings
+
+from planner.grounding import ground, ground_files
+from planner.pddl import parse_domain, parse_problem
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ROBOTS = """
+(define (domain robots) (:requirements :strips :typing :negative-preconditions)
+  (:types robot place)
+  (:constants depot - place)
+  (:predicates (at ?r - robot ?p - place) (road ?a ?b - place) (busy ?p - place)
+               (blocked ?p - place) (home ?r - robot))
+  (:action drive :parameters (?r - robot ?a ?b - place)
+    :precondition (and (at ?r ?a) (road ?a ?b) (not (at ?r ?b))
+                       (not (blocked ?b)) (not (busy ?b)))
+    :effect (and (at ?r ?b) (not (at ?r ?a))))
+  (:action park :parameters (?r - robot)
+    :precondition (and (at ?r depot) (not (= ?r ?r)))
+    :effect (home ?r)))
+"""
+
+
+def _plan_actions(path):
+    with open(path) as f:
+        return [line.split(": ", 1)[1].strip() for line in f if line[:1].isdigit()]
+
+
+def test_grounds_the_missions():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        task1 = ground_files(os.path.join(ROOT, "PartAB", "domain.pddl"),
+                             os.path.join(ROOT, "PartAB", "mission1.pddl"))
+    task2 = ground_files(os.path.join(ROOT, "PartAB", "domain.pddl"),
+                         os.path.join(ROOT, "PartAB", "mission2.pddl"))
+    task3 = ground_files(os.path.join(ROOT, "PartC", "domain-ext.pddl"),
+                         os.path.join(ROOT, "PartC", "mission3.pddl"))
+    assert [t.num_actions for t in (task1, task2, task3)] == [21, 86, 90]
+
+    for task, plan in ((task1, "PartAB/mission1.plan"), (task3, "PartC/mission3.plan")):
+        names = {task.action_name(i) for i in range(task.num_actions)}
+        assert set(_plan_actions(os.path.join(ROOT, plan))) <= names
+        # static atoms are compiled away, goals are numbered fluents
+        assert not any(atom[0] in ("is_connected", "association") for atom in task.atoms)
+        assert all(task.atoms[g][0] in ("has_received", "sample_got") for g in task.goal)
+
+    # rover_move only along is_connected edges, transmit_data only to the associated lander
+    names = [task2.action_name(i) for i in range(task2.num_actions)]
+    assert "(rover_move wp1 wp2 rover1)" in names and "(rover_move wp1 wp3 rover1)" not in names
+    assert "(transmit_data rover1 image1 lander1)" in names
+    assert "(transmit_data rover1 image1 lander2)" not in names
+    moves = [task3.action_name(i) for i in range(task3.num_actions)
+             if task3.schemas[task3.action_schema[i]] == "astronaut_move_internal"]
+    assert sorted(moves) == ["(astronaut_move_internal alice lander1 control_room1 docking_bay1)",
+                             "(astronaut_move_internal alice lander1 docking_bay1 control_room1)",
+                             "(astronaut_move_internal bob lander2 control_room2 docking_bay2)",
+                             "(astronaut_move_internal bob lander2 docking_bay2 control_room2)"]
+    i = names.index("(rover_move wp1 wp2 rover1)")
+    assert [task2.atom_name(n) for n in task2.pre[i]] == ["(on_position rover1 wp1)"]
+    assert [task2.atom_name(n) for n in task2.neg[i]] == ["(on_position rover1 wp2)"]
+    assert [task2.atom_name(n) for n in task2.delete[i]] == ["(on_position rover1 wp1)"]
+
+
+def test_grounding_prunes_unreachable_parts():
+    domain = parse_domain(ROBOTS)
+    problem = parse_problem("""
+        (define (problem p) (:domain robots)
+          (:objects r1 r2 - robot a b c island - place)
+          (:init (at r1 a) (road a b) (road b a) (road b depot) (road a a)
+                 (road island c) (blocked c) (road depot depot))
+          (:goal (and (at r1 depot) (at r2 island))))""", domain)
+    task = ground(domain, problem)
+    names = sorted(task.action_name(i) for i in range(task.num_actions))
+    # r2 is nowhere, island is never reached, (road a a) needs (at r1 a) true and false;
+    # c is blocked by a static fact, and park can never satisfy (not (= ?r ?r))
+    assert names == ["(drive r1 a b)", "(drive r1 b a)", "(drive r1 b depot)"]
+    assert task.objects[:1] == ["depot"]
+    # busy is never reached, so (not (busy ?b)) is dropped; the unreachable goal is kept
+    assert all(len(task.neg[i]) == 1 for i in range(task.num_actions))
+    assert not any(atom[0] in ("busy", "blocked", "road") for atom in task.atoms)
+    assert sorted(task.atom_name(g) for g in task.goal) == ["(at r1 depot)", "(at r2 island)"]
+    assert [task.atom_name(n) for n in task.init] == ["(at r1 a)"]
+    assert task.stats()["actions"] == 3
@@ -0,0 +1,64 @@
+# tests/test_pddl.py
+import os
+
+import pytest
+
+from planner.pddl import load_domain, load_problem, parse_domain, parse_problem
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOMAIN = os.path.join(ROOT, "PartAB", "domain.pddl")
+DOMAIN_EXT = os.path.join(ROOT, "PartC", "domain-ext.pddl")
+
+TINY = """
+(define (domain Tiny) (:requirements :strips :typing)
+  (:types robot - object)
+  (:predicates (at ?r - robot ?x - object) (free ?x))
+  (:action go :parameters (?r - robot ?a ?b)
+    :precondition (and (at ?r ?a) (free ?b) (not (= ?a ?b)))
+    :effect (and (at ?r ?b) (not (at ?r ?a)))))
+"""
+
+
+def test_parses_the_mission_models():
+    domain = load_domain(DOMAIN)
+    assert domain.name == "lunar" and len(domain.actions) == 7
+    assert domain.is_subtype("rover", "equipment") and domain.is_subtype("image", "data")
+    assert not domain.is_subtype("lander", "rover")
+    land = domain.actions[0]
+    assert land.name == "lander_land" and land.neg == [("is_landed", "?lan")] and not land.pre
+    assert "is_connected" not in domain.fluents() and "on_position" in domain.fluents()
+
+    # mission1 lists (is_deployed rover), which the domain does not declare
+    with pytest.warns(UserWarning, match="is_deployed"):
+        mission1 = load_problem(os.path.join(ROOT, "PartAB", "mission1.pddl"), domain)
+    assert mission1.objects["rover"] == "rover" and mission1.objects["wp1"] == "location"
+    assert ("is_landed", "lander") not in mission1.init            # (not ...) in :init
+    assert ("is_connected", "wp1", "wp2") in mission1.init
+    assert mission1.goal == [("has_received", "image"), ("has_received", "scan"),
+                             ("sample_got", "sample")]
+
+    ext = load_domain(DOMAIN_EXT)
+    move = next(a for a in ext.actions if a.name == "astronaut_move_internal")
+    assert move.not_equal == [("?from", "?to")]
+    assert ext.is_subtype("docking_bay", "internal_area")
+    mission3 = load_problem(os.path.join(ROOT, "PartC", "mission3.pddl"), ext)
+    assert mission3.objects["alice"] == "astronaut" and len(mission3.objects) == 22
+    assert ("astronaut_at", "bob", "lander2", "control_room2") in mission3.init
+
+
+def test_rejects_malformed_pddl():
+    tiny = parse_domain(TINY)
+    assert tiny.name == "tiny" and tiny.predicates["free"] == ["object"]
+    with pytest.raises(ValueError, match="Missing"):
+        parse_domain(TINY[:-3])
+    with pytest.raises(ValueError, match="Unbalanced"):
+        parse_domain(TINY + ")")
+    with pytest.raises(ValueError, match="Unknown predicate"):
+        parse_domain(TINY.replace("(free ?b)", "(clear ?b)"))
+    with pytest.raises(ValueError, match="Unsupported 'or'"):
+        parse_domain(TINY.replace("(free ?b)", "(or (free ?b) (free ?a))"))
+    with pytest.raises(ValueError, match="not 'tiny'"):
+        parse_problem("(define (problem p) (:domain lunar))", tiny)
+    with pytest.raises(ValueError, match="is not a robot"):
+        parse_problem("(define (problem p) (:domain tiny) (:objects a - object)"
+                      " (:init (at a a)))", tiny)
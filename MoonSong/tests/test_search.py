@@ -0,0 +1,104 @@
+# tests/test_search.py
+import json
+import os
+
+from planner.cli import main
+from planner.grounding import ground, ground_files
+from planner.heuristics import INF, RelaxedHeuristic
+from planner.pddl import parse_domain, parse_problem
+from planner.plans import format_plan
+from planner.search import (apply_action, eliminate_redundant, goal_test, initial_state,
+                            is_applicable, search, state_atoms)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MISSIONS = [("PartAB/domain.pddl", "PartAB/mission1.pddl", 10),
+            ("PartAB/domain.pddl", "PartAB/mission2.pddl", 18),
+            ("PartC/domain-ext.pddl", "PartC/mission3.pddl", 31)]
+
+BOXES = """
+(define (domain boxes) (:requirements :strips :typing :negative-preconditions)
+  (:types box room)
+  (:predicates (in ?b - box ?r - room) (door ?a ?b - room) (full ?r - room) (done ?b - box)
+               (lit ?r - room))
+  (:action carry :parameters (?b - box ?from ?to - room)
+    :precondition (and (in ?b ?from) (door ?from ?to))
+    :effect (and (in ?b ?to) (not (in ?b ?from))))
+  (:action store :parameters (?b - box ?r - room)
+    :precondition (and (in ?b ?r) (not (full ?r)))
+    :effect (and (done ?b) (full ?r)))
+  (:action light :parameters (?r - room) :effect (lit ?r)))
+"""
+
+
+def _boxes(init):
+    domain = parse_domain(BOXES)
+    return ground(domain, parse_problem(
+        f"(define (problem p) (:domain boxes) (:objects b1 b2 - box r1 r2 r3 - room)"
+        f" (:init {init}) (:goal (and (done b1) (done b2))))", domain))
+
+
+def _replay(task, plan):
+    state = initial_state(task)
+    for a in plan:
+        assert is_applicable(task, state, a)
+        state = apply_action(task, state, a)
+    return goal_test(task)(state)
+
+
+def test_plans_the_missions(tmp_path, capsys):
+    for domain, problem, reference in MISSIONS:
+        task = ground_files(os.path.join(ROOT, domain), os.path.join(ROOT, problem))
+        result = search(task)
+        assert result.status == "solved" and len(result.plan) <= reference
+        assert _replay(task, result.plan)
+        greedy = search(task, "gbfs", "add")
+        assert greedy.status == "solved" and _replay(task, greedy.plan)
+        assert 0 < result.heuristic_time <= result.search_time
+        assert result.evaluated <= result.generated + 1
+
+    text = format_plan(task, result.plan).splitlines()
+    assert text[:3] == [";;!domain: lunar-extended", ";;!problem: lunar-mission-3", ""]
+    assert text[3].startswith("0.00000: (") and text[4].startswith("0.00100: (")
+    assert text[-1] == f"; Metric: {sum([0.001] * (len(result.plan) - 1), 0.0)!r}"
+
+    assert main(["plan", "-o", str(tmp_path), os.path.join(ROOT, "PartAB", "domain.pddl"),
+                 os.path.join(ROOT, "PartAB", "mission2.pddl")]) == 0
+    line = json.loads(capsys.readouterr().out)
+    assert line["status"] == "solved" and line["length"] == 18
+    assert {"search_time", "heuristic_time", "ground_time", "expanded"} <= set(line)
+    with open(tmp_path / "mission2.plan") as f:
+        assert f.read().endswith("; Metric: 0.017000000000000008\n")
+
+
+def test_heuristics_dead_ends_and_plan_cleanup():
+    # both boxes start in r1, but each needs a room of its own
+    task = _boxes("(in b1 r1) (in b2 r1) (door r1 r2)")
+    atoms = state_atoms(initial_state(task))
+    h_add, _ = RelaxedHeuristic(task, "add")(atoms)
+    h_ff, helpful = RelaxedHeuristic(task, "ff")(atoms)
+    assert (h_add, h_ff) == (2, 2)                 # relaxed, r1 stays not full
+    assert sorted(task.action_name(a) for a in helpful) == ["(store b1 r1)",
+                                                           "(store b2 r1)"]
+    for algorithm in ("astar", "gbfs"):
+        result = search(task, algorithm)
+        assert len(result.plan) == 3 and _replay(task, result.plan)
+
+    # a single room: once it is full the second box can never be stored.
+    # The relaxation alone would not see it, the negated (not (full r1)) does
+    task = _boxes("(in b1 r1) (in b2 r1)")
+    h = RelaxedHeuristic(task, "ff")
+    state = apply_action(task, initial_state(task),
+                         [a for a in range(task.num_actions)
+                          if task.action_name(a) == "(store b1 r1)"][0])
+    assert h(state_atoms(state))[0] == INF
+    result = search(task, "gbfs")
+    assert result.status == "unsolvable" and result.plan is None
+
+    # lighting rooms is never needed
+    task = _boxes("(in b1 r1) (in b2 r2) (door r1 r3)")
+    names = {task.action_name(a): a for a in range(task.num_actions)}
+    plan = [names[n] for n in ("(light r2)", "(store b2 r2)", "(light r1)",
+                               "(carry b1 r1 r3)", "(store b1 r3)")]
+    assert _replay(task, plan)
+    assert [task.action_name(a) for a in eliminate_redundant(task, plan)] == \
+        ["(store b2 r2)", "(carry b1 r1 r3)", "(store b1 r3)"]
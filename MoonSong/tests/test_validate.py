@@ -0,0 +1,86 @@
+# tests/test_validate.py
+import json
+import os
+
+import pytest
+
+from planner.cli import main
+from planner.grounding import ground_files
+from planner.pddl import load_domain, load_problem, parse_domain, parse_problem
+from planner.plans import format_plan, read_plan
+from planner.search import search
+from planner.validate import PlanValidator, validate_job
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DOOR = """
+(define (domain door) (:requirements :strips :typing :negative-preconditions)
+  (:types room box)
+  (:predicates (at ?r - room) (link ?a ?b - room) (locked ?r - room) (has ?b - box)
+               (in ?b - box ?r - room))
+  (:action go :parameters (?a ?b - room)
+    :precondition (and (at ?a) (link ?a ?b) (not (locked ?b)) (not (= ?a ?b)))
+    :effect (and (at ?b) (not (at ?a))))
+  (:action unlock :parameters (?r - room) :precondition (locked ?r) :effect (not (locked ?r)))
+  (:action grab :parameters (?b - box ?r - room)
+    :precondition (and (at ?r) (in ?b ?r)) :effect (has ?b)))
+"""
+
+
+def test_validates_the_mission_plans(tmp_path, capsys):
+    jobs = [(os.path.join(ROOT, d), os.path.join(ROOT, f"{m}.pddl"), os.path.join(ROOT, f"{m}.plan"))
+            for d, m in [("PartAB/domain.pddl", "PartAB/mission1"),
+                         ("PartAB/domain.pddl", "PartAB/mission2"),
+                         ("PartC/domain-ext.pddl", "PartC/mission3")]]
+    one, two, three = (validate_job(job) for job in jobs)
+    assert one["valid"] and one["steps"] == 10 and three["valid"] and three["steps"] == 31
+    # mission2.plan predates the lander argument of transmit_data
+    assert not two["valid"] and (two["failed_step"], two["failed_line"]) == (13, 16)
+    assert two["error"].endswith("'transmit_data' takes 3 arguments, got 2")
+
+    # the planner's own plans replay to the goal, through the .plan text
+    domain_path, problem_path, _ = jobs[1]
+    task = ground_files(domain_path, problem_path)
+    text = format_plan(task, search(task).plan)
+    domain = load_domain(domain_path)
+    validator = PlanValidator(domain, load_problem(problem_path, domain))
+    header, steps = read_plan(text)
+    assert header == {"domain": "lunar", "problem": "lunar-mission-2"}
+    assert validator.validate(steps).valid
+    (tmp_path / "mission2.plan").write_text(text)
+
+    plans = [jobs[1][2], str(tmp_path / "mission2.plan")] * 3
+    assert main(["validate", "-j", "2", "--chunksize", "1", "--problem", problem_path,
+                 domain_path] + plans) == 1
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["plan"] for line in lines] == plans
+    assert [line["valid"] for line in lines] == [False, True] * 3
+
+
+def test_reports_the_first_failure():
+    domain = parse_domain(DOOR)
+    problem = parse_problem("(define (problem p) (:domain door) (:objects a b c - room x - box)"
+                            " (:init (at a) (link a b) (link b c) (locked c) (in x c))"
+                            " (:goal (and (has x) (not (at a)))))", domain)
+    validator = PlanValidator(domain, problem)
+
+    def check(*steps):
+        result = validator.validate([tuple(s.split()) for s in steps])
+        return result.error, result.steps
+
+    assert check("go a b", "unlock c", "go b c", "grab x c") == (None, 4)
+    assert check("go a b", "go b c") == \
+        ("step 2 (go b c): precondition (not (locked c)) is false", 1)
+    assert check("go a c")[0].endswith("precondition (link a c) is false")
+    assert check("go a a")[0].endswith("precondition (not (= a a)) is false")
+    assert check("grab a a")[0].endswith("'a' is not a box")
+    assert check("fly a b")[0].endswith("unknown action 'fly'")
+    assert check("go a d")[0].endswith("unknown object 'd'")
+    result = validator.validate([("unlock", "c")])
+    assert not result.valid and result.unsatisfied == ["(has x)", "(not (at a))"]
+
+    header, steps = read_plan("(go a b)\n\n; cost = 1\n0.5: (UNLOCK c) [1]\n")
+    assert header == {"domain": None, "problem": None}
+    assert steps == [(1, ("go", "a", "b")), (4, ("unlock", "c"))]
+    with pytest.raises(ValueError, match="line 2: malformed plan step"):
+        read_plan("0.000: (go a b)\n0.001: go b c\n")
@@ -0,0 +1,15 @@
+# __main__.py
+"""Entry point for `python -m sudoku_solver` (headless CLI, see cli.py)."""
+import os
+import sys
+
+# The project modules import each other as top-level packages (sudoku_core,
+# utils, ...), the same way main.py and the tests run them.
+_root = os.path.dirname(os.path.abspath(__file__))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# benchmarks/bench_alldiff.py
+"""
+Node reduction vs per-node cost of the all-different propagator.
+
+Solves the extreme tier (see bench_backjump.py) and every data file, with
+forward checking alone, FC + AC-3 at the start, and FC + all-different
+propagation (CSPSolver(use_gac=True)). For each mode it reports total
+assignments, the values pruned by all-different propagation, the units it
+revised, total time and time per assignment.
+
+    python benchmarks/bench_alldiff.py
+    python benchmarks/bench_alldiff.py --no-mrv
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from bench_backjump import extreme_tier
+from sudoku_core.board import SudokuBoard
+from sudoku_core.csp_solver import CSPSolver
+from utils.file_io import iter_puzzles
+
+MODES = [
+    ("fc", {}),
+    ("fc+ac3", {"use_ac3": True}),
+    ("fc+gac", {"use_gac": True}),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--no-mrv", action="store_true", help="static variable order")
+    parser.add_argument("--time-limit", type=float, default=30.0, help="per puzzle (s)")
+    args = parser.parse_args()
+
+    data = os.path.join(ROOT, "data")
+    paths = [os.path.join(data, name) for name in sorted(os.listdir(data))]
+    grids = [board.grid for path in paths for board in iter_puzzles(path)]
+    grids += extreme_tier([])
+    print(f"{len(grids)} puzzles, mrv={not args.no_mrv}, limit {args.time_limit}s")
+    print(f"{'mode':<10}{'solved':>7}{'assignments':>13}{'gac prunes':>12}{'revisions':>11}"
+          f"{'time':>9}{'us/node':>9}")
+    for name, options in MODES:
+        solved = assignments = prunes = revisions = 0
+        elapsed = 0.0
+        for grid in grids:
+            solver = CSPSolver(SudokuBoard(grid.copy()), log_steps=False, use_mrv=not args.no_mrv,
+                               time_limit=args.time_limit, **options)
+            start = time.perf_counter()
+            solver.solve()
+            elapsed += time.perf_counter() - start
+            solved += solver.status == "solved"
+            assignments += solver.metrics.assignments
+            prunes += solver.metrics.gac_prunes
+            revisions += solver.metrics.gac_revisions
+        per_node = 1e6 * elapsed / max(assignments, 1)
+        print(f"{name:<10}{solved:>7}{assignments:>13}{prunes:>12}{revisions:>11}"
+              f"{elapsed:>8.2f}s{per_node:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
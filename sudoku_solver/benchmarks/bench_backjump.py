@@ -0,0 +1,93 @@
+# benchmarks/bench_backjump.py
+"""
+Chronological backtracking vs conflict-directed backjumping on the extreme tier.
+
+The extreme tier is every puzzle that the grader (sudoku_core/grader.py)
+says "requires search". It is taken from the given files (default:
+everything in data/), plus a few well-known hard puzzles. Each puzzle is
+solved in three modes: chronological, CBJ without learning, and CBJ with
+the nogood table. The benchmark reports puzzles solved within the time
+limit, total assignments, and median/max time.
+
+    python benchmarks/bench_backjump.py
+    python benchmarks/bench_backjump.py --no-mrv --time-limit 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from sudoku_core.board import SudokuBoard
+from sudoku_core.csp_solver import CSPSolver
+from sudoku_core.grader import REQUIRES_SEARCH, grade
+from utils.file_io import iter_puzzles
+
+# well-known hard puzzles (all require search)
+KNOWN_HARD = [
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    "52...6.........7.13...........4..8..6......5...........418.........3..2...87.....",
+    "6.....8.3.4.7.................5.4.7.3..2.....1.6.......2.....5.....8.6......1....",
+    "48.3............71.2.......7.5....6....2..8.............1.76...3.....4......5....",
+    "....14....3....2...7..........9...3.6.1.............8.2.....1.4....5.6.....7.8...",
+    "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..",
+]
+
+MODES = [
+    ("chronological", {}),
+    ("cbj", {"use_cbj": True, "nogood_capacity": 0}),
+    ("cbj+nogoods", {"use_cbj": True}),
+]
+
+
+def extreme_tier(paths):
+    grids = [np.array([0 if ch == "." else int(ch) for ch in line]).reshape(9, 9)
+             for line in KNOWN_HARD]
+    for path in paths:
+        grids.extend(board.grid for board in iter_puzzles(path))
+    return [g for g in grids if grade(g)["grade"] == REQUIRES_SEARCH]
+
+
+def run_mode(grids, options, time_limit):
+    times, assignments, solved = [], 0, 0
+    for grid in grids:
+        solver = CSPSolver(SudokuBoard(grid.copy()), log_steps=False,
+                           time_limit=time_limit, **options)
+        start = time.perf_counter()
+        solver.solve()
+        times.append(time.perf_counter() - start)
+        assignments += solver.metrics.assignments
+        solved += solver.status == "solved"
+    return solved, assignments, statistics.median(times), max(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("files", nargs="*", help="puzzle files (default: everything in data/)")
+    parser.add_argument("--no-mrv", action="store_true", help="static variable order")
+    parser.add_argument("--no-fc", action="store_true")
+    parser.add_argument("--time-limit", type=float, default=10.0, help="per puzzle (s)")
+    args = parser.parse_args()
+
+    paths = args.files
+    if not paths:
+        data = os.path.join(ROOT, "data")
+        paths = [os.path.join(data, name) for name in sorted(os.listdir(data))]
+    grids = extreme_tier(paths)
+    heuristics = {"use_mrv": not args.no_mrv, "use_fc": not args.no_fc}
+    print(f"extreme tier: {len(grids)} puzzles, {heuristics}, limit {args.time_limit}s")
+    print(f"{'mode':<15}{'solved':>8}{'assignments':>14}{'median':>10}{'max':>10}")
+    for name, options in MODES:
+        solved, assignments, median, worst = run_mode(grids, dict(heuristics, **options),
+                                                      args.time_limit)
+        print(f"{name:<15}{solved:>8}{assignments:>14}{median:>9.3f}s{worst:>9.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/bench_restarts.py
+"""
+Tail latency of the deterministic search vs randomized restarts.
+
+How long the deterministic engine takes depends partly on how a puzzle is
+written down: its tie-breaks follow cell order, so relabelling the digits or
+permuting rows and columns changes the search. The corpus is therefore
+`--variants` random equivalent copies of every extreme-tier puzzle
+(see bench_backjump.py). Each copy is solved once per mode, and the
+benchmark reports median, p99 and max of the time and assignments.
+
+    python benchmarks/bench_restarts.py
+    python benchmarks/bench_restarts.py --variants 40 --restart-base 500
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from bench_backjump import extreme_tier
+from sudoku_core.board import SudokuBoard
+from sudoku_core.csp_solver import CSPSolver
+
+MODES = [
+    ("deterministic", {}),
+    ("deterministic+cbj", {"use_cbj": True}),
+    ("random", {"restarts": "luby", "restart_base": 1 << 40}),   # tie-breaks only
+    ("luby", {"restarts": "luby"}),
+    ("geometric", {"restarts": "geometric"}),
+    ("geometric+cbj", {"restarts": "geometric", "use_cbj": True, "keep_learned": False}),
+    ("geometric+cbj+keep", {"restarts": "geometric", "use_cbj": True}),
+]
+
+
+def equivalent_copy(grid, rng):
+    """Same puzzle with digits relabelled, rows/columns permuted within bands/stacks and an optional transpose."""
+    digits = np.array([0] + rng.sample(range(1, 10), 9))
+    rows = [3 * band + r for band in rng.sample(range(3), 3) for r in rng.sample(range(3), 3)]
+    cols = [3 * stack + c for stack in rng.sample(range(3), 3) for c in rng.sample(range(3), 3)]
+    copy = digits[grid][rows][:, cols]
+    return np.ascontiguousarray(copy.T if rng.random() < 0.5 else copy)
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run_mode(grids, options, time_limit):
+    times, assignments, solved = [], [], 0
+    for seed, grid in enumerate(grids):
+        solver = CSPSolver(SudokuBoard(grid.copy()), log_steps=False, time_limit=time_limit,
+                           seed=seed, **options)
+        start = time.perf_counter()
+        solver.solve()
+        times.append(time.perf_counter() - start)
+        assignments.append(solver.metrics.assignments)
+        solved += solver.status == "solved"
+    return solved, sorted(times), sorted(assignments)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("files", nargs="*", help="puzzle files (default: everything in data/)")
+    parser.add_argument("--variants", type=int, default=10, help="copies of each puzzle")
+    parser.add_argument("--restart-base", type=int, default=1000)
+    parser.add_argument("--time-limit", type=float, default=30.0, help="per puzzle (s)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the corpus")
+    args = parser.parse_args()
+
+    paths = args.files
+    if not paths:
+        data = os.path.join(ROOT, "data")
+        paths = [os.path.join(data, name) for name in sorted(os.listdir(data))]
+    rng = random.Random(args.seed)
+    grids = [equivalent_copy(grid, rng) for grid in extreme_tier(paths)
+             for _ in range(args.variants)]
+    print(f"{len(grids)} puzzles, restart base {args.restart_base}, limit {args.time_limit}s")
+    print(f"{'mode':<20}{'solved':>7}{'median':>9}{'p99':>9}{'max':>9}"
+          f"{'median #':>10}{'p99 #':>9}{'max #':>9}")
+    for name, options in MODES:
+        if "restarts" in options and name != "random":
+            options = dict(options, restart_base=args.restart_base)
+        solved, times, assignments = run_mode(grids, options, args.time_limit)
+        print(f"{name:<20}{solved:>7}"
+              f"{percentile(times, 0.5):>8.3f}s{percentile(times, 0.99):>8.3f}s{times[-1]:>8.3f}s"
+              f"{percentile(assignments, 0.5):>10}{percentile(assignments, 0.99):>9}"
+              f"{assignments[-1]:>9}")
+
+
+if __name__ == "__main__":
+    main()
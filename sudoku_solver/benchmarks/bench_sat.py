@@ -0,0 +1,81 @@
+# benchmarks/bench_sat.py
+"""
+CSP search vs the CDCL SAT backend.
+
+The 9x9 part solves the extreme tier (see bench_backjump.py) with both
+backends. The large-board part uses the SAT backend only: 16x16 and 25x25
+boards are built from a pattern solution that is shuffled and then has a
+share of its cells blanked out.
+
+    python benchmarks/bench_sat.py
+    python benchmarks/bench_sat.py --boards 5 --blank 0.7
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from bench_backjump import extreme_tier
+from sudoku_core.board import SudokuBoard
+from sudoku_core.csp_solver import CSPSolver
+from sudoku_core.sat_solver import SATSolver
+
+
+def large_board(n, blank, rng):
+    """N x N puzzle (N = n*n) from a shuffled pattern solution with a share of the cells blanked."""
+    size = n * n
+    rows = [n * band + r for band in rng.sample(range(n), n) for r in rng.sample(range(n), n)]
+    cols = [n * stack + c for stack in rng.sample(range(n), n) for c in rng.sample(range(n), n)]
+    digits = [0] + rng.sample(range(1, size + 1), size)
+    grid = np.array([[digits[(n * (r % n) + r // n + c) % size + 1] for c in cols] for r in rows])
+    for k in rng.sample(range(size * size), int(blank * size * size)):
+        grid.flat[k] = 0
+    return grid
+
+
+def run(make_solver, grids, time_limit):
+    times, solved = [], 0
+    for grid in grids:
+        solver = make_solver(SudokuBoard(grid.copy()), time_limit)
+        start = time.perf_counter()
+        solver.solve()
+        times.append(time.perf_counter() - start)
+        solved += solver.status == "solved"
+    return solved, statistics.median(times), max(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--boards", type=int, default=3, help="large boards per size")
+    parser.add_argument("--blank", type=float, default=0.6, help="share of blank cells")
+    parser.add_argument("--time-limit", type=float, default=60.0, help="per puzzle (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    data = os.path.join(ROOT, "data")
+    grids = extreme_tier([os.path.join(data, name) for name in sorted(os.listdir(data))])
+    csp = lambda board, limit: CSPSolver(board, log_steps=False, time_limit=limit)
+    sat = lambda board, limit: SATSolver(board, log_steps=False, time_limit=limit)
+    print(f"{'boards':<22}{'backend':<8}{'solved':>7}{'median':>9}{'max':>9}")
+    for name, make_solver in [("csp", csp), ("sat", sat)]:
+        solved, median, worst = run(make_solver, grids, args.time_limit)
+        print(f"{f'9x9 extreme ({len(grids)})':<22}{name:<8}{solved:>7}{median:>8.3f}s{worst:>8.3f}s")
+
+    rng = random.Random(args.seed)
+    for n in (4, 5):
+        boards = [large_board(n, args.blank, rng) for _ in range(args.boards)]
+        solved, median, worst = run(sat, boards, args.time_limit)
+        label = f"{n * n}x{n * n} ({args.boards})"
+        print(f"{label:<22}{'sat':<8}{solved:>7}{median:>8.3f}s{worst:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/bench_startup.py
+"""
+Cold-start benchmark for the headless CLI.
+
+Runs `python -m sudoku_solver ...` in fresh interpreters and reports the
+median wall time, plus the slowest imports from `-X importtime`, and fails
+if the GUI toolkit was imported.
+
+    python benchmarks/bench_startup.py [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(ROOT)
+EASY = os.path.join(ROOT, "data", "easy.txt")
+
+
+def time_command(cmd, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=REPO, stdout=subprocess.DEVNULL, check=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), min(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    base = [sys.executable, "-m", "sudoku_solver"]
+    for label, cmd in [("interpreter", [sys.executable, "-c", "pass"]),
+                       ("--version", base + ["--version"]),
+                       ("solve easy.txt", base + ["solve", EASY])]:
+        median, best = time_command(cmd, args.runs)
+        print(f"{label:<16} median={median * 1000:7.1f}ms  min={best * 1000:7.1f}ms")
+
+    proc = subprocess.run([sys.executable, "-X", "importtime"] + base[1:] + ["solve", EASY],
+                          cwd=REPO, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                          text=True, check=True)
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # nested imports are indented below the module that triggered them
+        imports.append((int(cumulative), name[1:].startswith(" "), name.strip()))
+    print("\nslowest top-level imports (cumulative):")
+    top = sorted((c, name) for c, nested, name in imports if not nested)
+    for cumulative, name in top[-8:][::-1]:
+        print(f"  {cumulative / 1000:7.1f}ms  {name}")
+
+    gui = [name for _, _, name in imports if name.split(".")[0] in ("PyQt5", "gui")]
+    if gui:
+        print(f"\nFAIL: GUI modules imported: {gui[:5]}")
+        return 1
+    print("\nOK: no GUI modules imported")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+# benchmarks/bench_wdeg.py
+"""
+MRV vs the adaptive dom/wdeg variable heuristic.
+
+The corpus is `--variants` equivalent copies of every extreme-tier puzzle
+(see bench_restarts.py). Each mode reports total, median and max
+assignments and total/max time, with and without all-different propagation.
+
+    python benchmarks/bench_wdeg.py
+    python benchmarks/bench_wdeg.py --variants 10
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from bench_backjump import extreme_tier
+from bench_restarts import equivalent_copy
+from sudoku_core.board import SudokuBoard
+from sudoku_core.csp_solver import CSPSolver
+
+MODES = [
+    ("mrv", {}),
+    ("dom/wdeg", {"use_wdeg": True}),
+    ("mrv+gac", {"use_gac": True}),
+    ("dom/wdeg+gac", {"use_wdeg": True, "use_gac": True}),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--variants", type=int, default=4, help="copies of each puzzle")
+    parser.add_argument("--time-limit", type=float, default=30.0, help="per puzzle (s)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the corpus")
+    args = parser.parse_args()
+
+    data = os.path.join(ROOT, "data")
+    rng = random.Random(args.seed)
+    grids = [equivalent_copy(grid, rng)
+             for grid in extreme_tier([os.path.join(data, name) for name in sorted(os.listdir(data))])
+             for _ in range(args.variants)]
+    print(f"{len(grids)} puzzles, limit {args.time_limit}s")
+    print(f"{'mode':<14}{'solved':>7}{'assignments':>13}{'median':>8}{'max':>8}{'time':>9}{'max':>9}")
+    for name, options in MODES:
+        solved, counts, times = 0, [], []
+        for grid in grids:
+            solver = CSPSolver(SudokuBoard(grid.copy()), log_steps=False,
+                               time_limit=args.time_limit, **options)
+            start = time.perf_counter()
+            solver.solve()
+            times.append(time.perf_counter() - start)
+            counts.append(solver.metrics.assignments)
+            solved += solver.status == "solved"
+        print(f"{name:<14}{solved:>7}{sum(counts):>13}{statistics.median(counts):>8.0f}"
+              f"{max(counts):>8}{sum(times):>8.2f}s{max(times):>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# benchmarks/loadgen.py
+"""
+Load generator for the solving service (service.py).
+
+Keeps --concurrency requests in flight (closed loop), or sends at a fixed
+--rate (open loop). It then reports sustained requests/sec, latency
+percentiles and status counts. It either connects to a running server, or
+starts one in-process on a temporary Unix socket when neither --port nor
+--unix is given.
+
+    python benchmarks/loadgen.py --requests 2000 --concurrency 64 --workers 4
+    python benchmarks/loadgen.py --port 8765 --rate 500 --duration 10
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from service import SolverClient, SolverService
+from utils.file_io import iter_puzzles
+
+
+def load_corpus(paths):
+    if not paths:
+        data = os.path.join(ROOT, "data")
+        paths = [os.path.join(data, name) for name in sorted(os.listdir(data))]
+    puzzles = []
+    for path in paths:
+        for board in iter_puzzles(path):
+            puzzles.append("".join(map(str, board.grid.reshape(81).tolist())))
+    return puzzles
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, int(round(q / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def closed_loop(client, puzzles, total, concurrency, deadline):
+    latencies, statuses = [], {}
+    source = itertools.islice(itertools.cycle(puzzles), total)
+
+    async def user():
+        for puzzle in source:
+            start = time.perf_counter()
+            result = await client.solve(puzzle, deadline)
+            latencies.append(time.perf_counter() - start)
+            statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return latencies, statuses
+
+
+async def open_loop(client, puzzles, rate, duration, deadline):
+    latencies, statuses = [], {}
+
+    async def one(puzzle):
+        start = time.perf_counter()
+        result = await client.solve(puzzle, deadline)
+        latencies.append(time.perf_counter() - start)
+        statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+
+    tasks = []
+    start = time.perf_counter()
+    for i, puzzle in enumerate(itertools.cycle(puzzles)):
+        send_at = start + i / rate
+        if send_at - start >= duration:
+            break
+        delay = send_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(puzzle)))
+    await asyncio.gather(*tasks)
+    return latencies, statuses
+
+
+async def run(args):
+    puzzles = load_corpus(args.files)
+    service = None
+    if args.port is None and args.unix is None:
+        service = SolverService(workers=args.workers,
+                                solver_options={"engine": args.engine})
+        path = await service.start_unix(os.path.join(tempfile.mkdtemp(), "solver.sock"))
+        client = await SolverClient.connect(path=path)
+    elif args.unix is not None:
+        client = await SolverClient.connect(path=args.unix)
+    else:
+        client = await SolverClient.connect(args.host, args.port)
+
+    try:
+        # warm up the workers (imports, solver setup, JIT cache)
+        await asyncio.gather(*(client.solve(p) for p in puzzles[:max(1, args.workers)]))
+        start = time.perf_counter()
+        if args.rate:
+            latencies, statuses = await open_loop(client, puzzles, args.rate,
+                                                  args.duration, args.deadline)
+        else:
+            latencies, statuses = await closed_loop(client, puzzles, args.requests,
+                                                    args.concurrency, args.deadline)
+        elapsed = time.perf_counter() - start
+    finally:
+        await client.close()
+        if service is not None:
+            stats = dict(service.stats)
+            await service.close()
+
+    latencies.sort()
+    ms = lambda q: percentile(latencies, q) * 1000
+    print(f"requests   {len(latencies)} in {elapsed:.2f}s  ->  {len(latencies) / elapsed:.1f} req/s")
+    print(f"latency    p50={ms(50):.2f}ms  p90={ms(90):.2f}ms  p99={ms(99):.2f}ms  "
+          f"max={latencies[-1] * 1000 if latencies else float('nan'):.2f}ms")
+    print(f"statuses   {statuses}")
+    if service is not None:
+        print(f"server     {stats['batches']} batches, "
+              f"{stats['requests'] / max(1, stats['batches']):.1f} requests/batch")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the solving service.")
+    parser.add_argument("files", nargs="*", help="puzzle files (default: everything in data/)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--unix", metavar="PATH")
+    parser.add_argument("-j", "--workers", type=int, default=2,
+                        help="workers for the in-process server")
+    parser.add_argument("--engine", choices=["python", "numba"], default="python")
+    parser.add_argument("-n", "--requests", type=int, default=1000)
+    parser.add_argument("-c", "--concurrency", type=int, default=32)
+    parser.add_argument("--rate", type=float, help="open loop: requests per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="open loop duration (s)")
+    parser.add_argument("--deadline", type=float, help="per-request deadline (s)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+# cli.py
+"""
+Headless command line interface for batch solving.
+
+    python -m sudoku_solver solve data/hard.txt puzzles.sdkb
+    python -m sudoku_solver grade --workers 4 puzzles.sdkb     (see sudoku_core/grader.py)
+    python -m sudoku_solver cnf -o cnf/ data/hard.txt          (DIMACS, see sudoku_core/sat_solver.py)
+    python -m sudoku_solver solve --checkpoint run.ckpt --checkpoint-interval 60 hard.txt
+    python -m sudoku_solver resume run.ckpt                    (see sudoku_core/checkpoint.py)
+    python -m sudoku_solver solve --estimate 16 --route-above 20000 puzzles.sdkb  (see worker.py)
+    cat puzzles.txt | python -m sudoku_solver solve --workers 4 --time-limit 2
+    python -m sudoku_solver serve --port 8765 --workers 4     (see service.py)
+
+Puzzles are read from the given files (.txt/.csv/.sdkb, see
+utils.file_io.iter_puzzles) or from stdin, and one JSON object per puzzle is
+written to stdout as soon as it is solved.
+
+This module must never import the GUI (PyQt5). Heavy imports are done
+inside the command functions so `--help` and argument errors stay instant.
+"""
+import argparse
+import itertools
+import json
+import sys
+
+from worker import grade_job, init_worker, solve_job
+
+__version__ = "1.0"
+
+
+def _iter_jobs(paths):
+    """Yield (index, source, cells) for every puzzle in paths ('-' = stdin)."""
+    import time
+    import numpy as np
+    from utils.file_io import iter_puzzles, parse_puzzles
+    from utils.timer import REGISTRY
+
+    index = 0
+    for path in paths:
+        boards = parse_puzzles(sys.stdin, "<stdin>") if path == "-" else iter_puzzles(path)
+        while True:
+            start = time.perf_counter_ns()
+            board = next(boards, None)
+            if board is None:
+                break
+            REGISTRY.record("load", time.perf_counter_ns() - start)
+            yield index, path, board.grid.astype(np.uint8).tobytes()
+            index += 1
+
+
+def cmd_solve(args):
+    options = {
+        "use_mrv": not args.no_mrv,
+        "use_lcv": not args.no_lcv,
+        "use_fc": not args.no_fc,
+        "use_ac3": args.ac3,
+        "engine": args.engine,
+        "time_limit": args.time_limit,
+        "use_gac": args.gac,
+        "use_wdeg": args.wdeg,
+        "use_cbj": args.cbj,
+        "restarts": args.restarts,
+        "restart_base": args.restart_base,
+        "seed": args.seed,
+        "estimate_probes": args.estimate,
+        "route_above": args.route_above,
+        "progress_interval": args.progress,
+    }
+    if args.checkpoint is not None or args.checkpoint_interval is not None:
+        if args.workers > 1:
+            raise ValueError("--checkpoint needs a single worker")
+        options["checkpoint"] = args.checkpoint
+        options["checkpoint_interval"] = 60.0 if args.checkpoint_interval is None \
+            else args.checkpoint_interval
+    jobs = _iter_jobs(args.files or ["-"])
+    if args.checkpoint is not None:
+        # every puzzle would overwrite the same checkpoint file
+        first = list(itertools.islice(jobs, 2))
+        if len(first) > 1:
+            raise ValueError("--checkpoint needs a single puzzle")
+        jobs = iter(first)
+    out = sys.stdout
+    counts = {}
+    timings = None
+
+    if args.workers > 1:
+        from multiprocessing import Pool
+        from utils.logger import log_queue
+        if args.timings:
+            from utils.timer import timing_queue
+            timings = timing_queue()
+        # worker logging (e.g. --progress) is merged into this process's listener
+        pool = Pool(args.workers, initializer=init_worker,
+                    initargs=(options, log_queue(), timings))
+        results = pool.imap(solve_job, jobs, chunksize=args.chunksize)
+    else:
+        pool = None
+        init_worker(options)
+        results = map(solve_job, jobs)
+
+    try:
+        for result in results:
+            out.write(json.dumps(result) + "\n")
+            if args.unbuffered:
+                out.flush()
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+            # write everything the workers logged before we return
+            from utils.logger import shutdown
+            shutdown()
+
+    if args.summary:
+        print(json.dumps({"summary": counts}), file=sys.stderr)
+    if args.timings:
+        from utils.timer import REGISTRY, collect_process_timings
+        if timings is not None:
+            collect_process_timings(timings, args.workers)
+        REGISTRY.write_json(args.timings)
+    return 0 if counts.get("solved", 0) == sum(counts.values()) else 1
+
+
+def cmd_grade(args):
+    jobs = _iter_jobs(args.files or ["-"])
+    out = sys.stdout
+    counts = {}
+
+    if args.workers > 1:
+        from multiprocessing import Pool
+        pool = Pool(args.workers)
+        results = pool.imap(grade_job, jobs, chunksize=args.chunksize)
+    else:
+        pool = None
+        results = map(grade_job, jobs)
+
+    try:
+        for result in results:
+            out.write(json.dumps(result) + "\n")
+            counts[result["tier"]] = counts.get(result["tier"], 0) + 1
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    if args.summary:
+        print(json.dumps({"summary": counts}), file=sys.stderr)
+    return 1 if counts.get("invalid") else 0
+
+
+def cmd_resume(args):
+    from sudoku_core.csp_solver import CSPSolver
+
+    interval = args.checkpoint_interval
+    solver = CSPSolver.resume(args.checkpoint, log_steps=False, time_limit=args.time_limit,
+                              checkpoint=args.checkpoint if interval is not None else None,
+                              checkpoint_interval=interval)
+    solver.solve()
+    summary = solver.metrics.summary()
+    index, source = solver.origin or (None, None)
+    print(json.dumps({
+        "index": index,
+        "source": source,
+        "checkpoint": args.checkpoint,
+        "status": solver.status,
+        "solution": "".join(map(str, solver.board.grid.reshape(81).tolist()))
+                    if solver.status == "solved" else None,
+        "assignments": summary["assignments"],
+        "backtracks": summary["backtracks"],
+        "time": summary["time"],
+    }))
+    return 0 if solver.status == "solved" else 1
+
+
+def cmd_cnf(args):
+    import os
+    import numpy as np
+    from sudoku_core.sat_solver import write_dimacs
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for index, source, cells in _iter_jobs(args.files or ["-"]):
+        stem = "stdin" if source == "-" else os.path.splitext(os.path.basename(source))[0]
+        path = os.path.join(args.output_dir, f"{stem}-{index}.cnf")
+        write_dimacs(np.frombuffer(cells, dtype=np.uint8).reshape(9, 9), path)
+        print(path)
+    return 0
+
+
+def cmd_serve(args):
+    import asyncio
+    from service import SolverService
+
+    options = {"engine": args.engine, "route_above": args.route_above}
+    service = SolverService(workers=args.workers, solver_options=options,
+                            batch_window=args.batch_window_ms / 1000.0,
+                            max_batch=args.max_batch, max_pending=args.max_pending,
+                            default_deadline=args.deadline)
+
+    async def run():
+        if args.unix:
+            where = await service.start_unix(args.unix)
+        else:
+            where = "%s:%d" % await service.start_tcp(args.host, args.port)
+        print(f"listening on {where}", file=sys.stderr)
+        try:
+            await service.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="sudoku_solver",
+                                     description="Headless Sudoku solver.")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    sub = parser.add_subparsers(dest="command")
+
+    solve = sub.add_parser("solve", help="solve puzzles and print JSON lines")
+    solve.add_argument("files", nargs="*",
+                       help="puzzle files (.txt/.csv/.sdkb); '-' or nothing reads stdin")
+    solve.add_argument("-j", "--workers", type=int, default=1,
+                       help="number of worker processes (default: 1, in-process)")
+    solve.add_argument("--chunksize", type=int, default=16,
+                       help="puzzles handed to a worker at a time")
+    solve.add_argument("--time-limit", type=float, default=None,
+                       help="per-puzzle time limit in seconds")
+    solve.add_argument("--engine", choices=["python", "numba", "sat"], default="python")
+    solve.add_argument("--no-mrv", action="store_true")
+    solve.add_argument("--no-lcv", action="store_true")
+    solve.add_argument("--no-fc", action="store_true")
+    solve.add_argument("--ac3", action="store_true")
+    solve.add_argument("--wdeg", action="store_true",
+                       help="adaptive dom/wdeg variable ordering instead of MRV")
+    solve.add_argument("--gac", action="store_true",
+                       help="all-different propagation on whole units")
+    solve.add_argument("--cbj", action="store_true", help="conflict-directed backjumping")
+    solve.add_argument("--restarts", choices=["luby", "geometric"], default=None,
+                       help="randomized tie-breaking with restarts on this schedule")
+    solve.add_argument("--restart-base", type=int, default=1000,
+                       help="assignments allowed in the first run (default: 1000)")
+    solve.add_argument("--seed", type=int, default=None, help="tie-breaking seed")
+    solve.add_argument("--checkpoint", metavar="PATH", default=None,
+                       help="save the search state here (one puzzle, one worker; see the resume command)")
+    solve.add_argument("--checkpoint-interval", type=float, default=None, metavar="SEC",
+                       help="save a checkpoint every SEC seconds (default 60 with --checkpoint)")
+    solve.add_argument("--estimate", type=int, default=None, metavar="PROBES",
+                       help="add a Knuth tree-size estimate from PROBES random probes "
+                            "(estimated_nodes)")
+    solve.add_argument("--route-above", type=float, default=None, metavar="NODES",
+                       help="solve puzzles estimated above NODES assignments with the SAT backend")
+    solve.add_argument("--progress", type=float, default=None, metavar="SEC",
+                       help="log progress and ETA of long solves every SEC seconds")
+    solve.add_argument("--timings", metavar="PATH", default=None,
+                       help="write load/validate/solve timing percentiles as JSON ('-' = stderr)")
+    solve.add_argument("-u", "--unbuffered", action="store_true",
+                       help="flush stdout after every result")
+    solve.add_argument("--summary", action="store_true",
+                       help="print status counts to stderr at the end")
+    solve.set_defaults(func=cmd_solve)
+
+    grade = sub.add_parser("grade", help="grade puzzles by the techniques they need")
+    grade.add_argument("files", nargs="*",
+                       help="puzzle files (.txt/.csv/.sdkb); '-' or nothing reads stdin")
+    grade.add_argument("-j", "--workers", type=int, default=1,
+                       help="number of worker processes (default: 1, in-process)")
+    grade.add_argument("--chunksize", type=int, default=64,
+                       help="puzzles handed to a worker at a time")
+    grade.add_argument("--summary", action="store_true",
+                       help="print tier counts to stderr at the end")
+    grade.set_defaults(func=cmd_grade)
+
+    resume = sub.add_parser("resume", help="continue a checkpointed search, print one JSON line")
+    resume.add_argument("checkpoint", help="file written by solve --checkpoint")
+    resume.add_argument("--time-limit", type=float, default=None,
+                        help="seconds, counted from the start of the original solve")
+    resume.add_argument("--checkpoint-interval", type=float, default=None, metavar="SEC",
+                        help="keep saving to the same file every SEC seconds")
+    resume.set_defaults(func=cmd_resume)
+
+    cnf = sub.add_parser("cnf", help="export puzzles as DIMACS CNF, one file per puzzle")
+    cnf.add_argument("files", nargs="*",
+                     help="puzzle files (.txt/.csv/.sdkb); '-' or nothing reads stdin")
+    cnf.add_argument("-o", "--output-dir", default=".",
+                     help="directory for the <file>-<index>.cnf files (default: .)")
+    cnf.set_defaults(func=cmd_cnf)
+
+    serve = sub.add_parser("serve", help="run the asyncio solving service (JSON lines)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    serve.add_argument("-j", "--workers", type=int, default=1)
+    serve.add_argument("--engine", choices=["python", "numba", "sat"], default="python")
+    serve.add_argument("--route-above", type=float, default=None, metavar="NODES",
+                       help="solve puzzles estimated above NODES assignments with the SAT backend")
+    serve.add_argument("--batch-window-ms", type=float, default=2.0,
+                       help="how long to wait for more requests before dispatching a batch")
+    serve.add_argument("--max-batch", type=int, default=64)
+    serve.add_argument("--max-pending", type=int, default=1024,
+                       help="queued requests before clients are throttled")
+    serve.add_argument("--deadline", type=float, default=None,
+                       help="default per-request deadline in seconds")
+    serve.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not getattr(args, "func", None):
+        parser.print_help()
+        return 2
+    try:
+        return args.func(args)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    except BrokenPipeError:
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
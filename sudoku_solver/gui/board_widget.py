@@ -6,8 +6,10 @@ This module provides the visual representation and input handling for Sudoku boa
 from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem, QAbstractItemView
 from PyQt5.QtWidgets import QItemDelegate, QLineEdit
 from PyQt5.QtGui import QFont, QColor, QBrush, QPainter, QPen, QRegExpValidator
-from PyQt5.QtCore import Qt, QRegExp
+from PyQt5.QtCore import Qt, QRegExp, QRect
 import numpy as np
+from sudoku_core.candidates import CandidateEngine
+from utils.timer import timeit
 
 class DigitDelegate(QItemDelegate):
     """
@@ -34,6 +36,8 @@ class BoardWidget(QTableWidget):
     - Visual display of the Sudoku grid with 3x3 box separators
     - User input handling with digit validation
     - Highlighting and color coding for visual feedback during solving
+    - A live overlay of candidates (pencil marks) and conflicting cells,
+      kept up to date incrementally by a CandidateEngine on every edit
     """
     def __init__(self, parent=None):
         """Initialize a 9x9 Sudoku board table widget."""
@@ -41,6 +45,13 @@ class BoardWidget(QTableWidget):
         self._init_ui()
         # Store previous grid state for change detection (used during solving visualization)
         self._prev_grid = np.zeros((9,9), dtype=int)
+        # Cell currently highlighted by highlight_cell(), restored on the next highlight
+        self._highlighted = None
+        # Candidates/conflicts of the displayed grid, updated per changed cell
+        self.engine = CandidateEngine()
+        self.show_candidates = True
+        self._loading = False
+        self.itemChanged.connect(self._on_item_changed)
 
     def _init_ui(self):
         """
@@ -104,24 +115,35 @@ class BoardWidget(QTableWidget):
         grid = np.zeros((9,9), dtype=int)
         for r in range(9):
             for c in range(9):
-                # Get cell text and strip whitespace
-                txt = self.item(r, c).text().strip() if self.item(r, c) else ""
-                if txt == "" or txt == ".":
-                    # Empty cell
-                    grid[r, c] = 0
-                else:
-                    # accept only first digit in 1-9
-                    val = 0
-                    for ch in txt:
-                        if ch in "123456789":
-                            val = int(ch)
-                            break
-                    # only accept 1-9; anything else -> 0
-                    if not (1 <= val <= 9):
-                        val = 0
-                    grid[r, c] = val
+                grid[r, c] = self._cell_value(r, c)
         return grid
 
+    def _cell_value(self, r: int, c: int) -> int:
+        """Parse one cell's text (see get_grid)."""
+        # Get cell text and strip whitespace
+        txt = self.item(r, c).text().strip() if self.item(r, c) else ""
+        if txt == "" or txt == ".":
+            # Empty cell
+            return 0
+        # accept only first digit in 1-9; anything else -> 0
+        for ch in txt:
+            if ch in "123456789":
+                return int(ch)
+        return 0
+
+    def _on_item_changed(self, item):
+        """A single cell was edited: update only that cell (and its peers) in the engine."""
+        if self._loading:
+            return
+        r, c = item.row(), item.column()
+        self.engine.set(9 * r + c, self._cell_value(r, c))
+        self.viewport().update()
+
+    def set_show_candidates(self, show: bool):
+        """Toggle the candidate (pencil mark) overlay; conflicts are always shown."""
+        self.show_candidates = show
+        self.viewport().update()
+
     def set_grid(self, grid: np.ndarray):
         """
         Display a grid state on the board UI.
@@ -132,18 +154,20 @@ class BoardWidget(QTableWidget):
         Displays non-zero values as digits, and 0 as empty cells.
         """
         grid = np.array(grid, dtype=int)
-        for r in range(9):
-            for c in range(9):
-                v = grid[r, c]
+        # only the changed cells are touched, in the engine and in the table
+        self._loading = True
+        try:
+            for i in self.engine.load(grid):
+                v = grid.flat[i]
                 # Convert 0 to empty string, others to digit string
-                text = "" if v == 0 else str(int(v))
-                self.item(r, c).setText(text)
+                self.item(i // 9, i % 9).setText("" if v == 0 else str(int(v)))
+        finally:
+            self._loading = False
+        self.viewport().update()
 
     def clear(self):
         """Clear all cells on the board (set all to empty)."""
-        for r in range(9):
-            for c in range(9):
-                self.item(r, c).setText("")
+        self.set_grid(np.zeros((9, 9), dtype=int))
 
     def highlight_cell(self, r: int, c: int, temporary=True):
         """
@@ -155,16 +179,29 @@ class BoardWidget(QTableWidget):
             temporary (bool): If True, caller is responsible for clearing highlight via QTimer
         
         Sets cell background to blue (#3c78c8) and text to white.
+        Only one cell is highlighted at a time; the previous one is restored.
         """
         if not (0 <= r < 9 and 0 <= c < 9):
             return
         item = self.item(r, c)
         if item is None:
             return
+        self.clear_highlight()
+        self._highlighted = (r, c)
         # apply bright background for a short time (caller handles timer)
         item.setBackground(QBrush(QColor(60, 120, 200)))
         item.setForeground(QBrush(QColor(255, 255, 255)))
 
+    def clear_highlight(self):
+        """Restore the default style of the highlighted cell, if any."""
+        if self._highlighted is None:
+            return
+        item = self.item(*self._highlighted)
+        self._highlighted = None
+        if item:
+            item.setBackground(QBrush())
+            item.setForeground(QBrush())
+
     def mark_final(self, r: int, c: int):
         """
         Mark a cell with final solution styling (distinct color).
@@ -194,7 +231,10 @@ class BoardWidget(QTableWidget):
         if highlight:
             r, c = highlight
             self.highlight_cell(r, c)
+        else:
+            self.clear_highlight()
 
+    @timeit(label="render")
     def paintEvent(self, event):
         """
         Override paint event to draw thick 3x3 box separators.
@@ -227,4 +267,36 @@ class BoardWidget(QTableWidget):
             if r in (2, 5):
                 painter.drawLine(0, y, self.viewport().width(), y)
 
+        self._paint_overlay(painter)
         painter.end()
+
+    def _paint_overlay(self, painter):
+        """
+        Draw conflicting cells (red frame), empty cells without candidates
+        (red frame) and, if enabled, the candidates of empty cells as a small
+        3x3 grid of digits.
+        """
+        engine = self.engine
+        conflict_pen = QPen(QColor(220, 60, 60))
+        conflict_pen.setWidth(3)
+        small = QFont(self.font())
+        small.setPointSize(8)
+        for i in range(81):
+            rect = self.visualRect(self.model().index(i // 9, i % 9))
+            if engine.values[i]:
+                if engine.is_conflict(i):
+                    painter.setPen(conflict_pen)
+                    painter.drawRect(rect.adjusted(3, 3, -3, -3))
+                continue
+            candidates = engine.candidates(i)
+            if not candidates:
+                painter.setPen(conflict_pen)
+                painter.drawRect(rect.adjusted(3, 3, -3, -3))
+            elif self.show_candidates:
+                painter.setPen(QColor(120, 120, 120))
+                painter.setFont(small)
+                w, h = rect.width() // 3, rect.height() // 3
+                for v in candidates:
+                    k = v - 1
+                    cell = QRect(rect.left() + (k % 3) * w, rect.top() + (k // 3) * h, w, h)
+                    painter.drawText(cell, Qt.AlignCenter, str(v))
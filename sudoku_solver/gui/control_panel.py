@@ -4,8 +4,10 @@ Control panel widget for the Sudoku Solver GUI.
 Provides buttons for file operations, solving, and displaying solver metrics and step logs.
 """
 from PyQt5.QtWidgets import (QWidget, QPushButton, QVBoxLayout, QHBoxLayout,
-                             QFileDialog, QLabel, QCheckBox, QSlider, QGroupBox, QTextEdit)
+                             QFileDialog, QLabel, QCheckBox, QSlider, QGroupBox, QListView,
+                             QComboBox, QLineEdit, QAbstractItemView, QProgressBar)
 from PyQt5.QtCore import Qt, QSize
+from .step_log import FILTERS, StepLogModel
 from utils.file_io import load_sudoku, save_sudoku
 from utils.logger import get_logger
 import numpy as np
@@ -35,6 +37,7 @@ class ControlPanel(QWidget):
         Sets up:
         - Action buttons (Load, Save, Solve, Reset, Quit)
         - Status and metrics labels
+        - Replay controls (play/pause, seek, speed) for recorded traces
         - Step-by-step solver log display area
         """
         layout = QVBoxLayout()
@@ -56,13 +59,61 @@ class ControlPanel(QWidget):
         # Status display labels
         self.status_label = QLabel("Ready")
         self.metrics_label = QLabel("Metrics: -")
+        # Estimated progress of a running solve (see sudoku_core/estimator.py)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.setFormat("-")
+        # Candidate (pencil mark) overlay on the board, updated live while editing
+        self.candidates_check = QCheckBox("Show candidates")
+        self.candidates_check.setChecked(True)
         
-        # Step-by-step solver log area (scrollable text edit)
-        # Shows detailed information about each solving step
-        self.steps_log = QTextEdit()
-        self.steps_log.setReadOnly(True)
+        # Step-by-step solver log: a virtualized list over the search trace
+        # (only visible rows are rendered), with a kind filter and text search
+        self.steps_model = StepLogModel(self)
+        self.steps_log = QListView()
+        self.steps_log.setModel(self.steps_model)
+        self.steps_log.setUniformItemSizes(True)
+        self.steps_log.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.steps_log.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.steps_log.setMinimumHeight(400)
         self.steps_log.setStyleSheet("background: #1a1a1a; color: #aaa; font-size: 20px;")
+        self.steps_filter = QComboBox()
+        self.steps_filter.addItems(list(FILTERS))
+        self.steps_filter.currentTextChanged.connect(self.on_steps_filter_changed)
+        self.steps_search = QLineEdit()
+        self.steps_search.setPlaceholderText("Search steps (Enter = next)")
+        self.steps_search.returnPressed.connect(self.find_next_step)
+        steps_tools = QHBoxLayout()
+        steps_tools.addWidget(self.steps_filter)
+        steps_tools.addWidget(self.steps_search, 1)
+
+        # Replay controls for the recorded search trace
+        # Play/pause, seek to any step, and playback speed (log scale, 1-10000 steps/s,
+        # the top position follows the newest step of a running solve)
+        self.replay_group = QGroupBox("Replay")
+        replay_layout = QVBoxLayout()
+        replay_buttons = QHBoxLayout()
+        self.play_btn = QPushButton("Play")
+        self.load_trace_btn = QPushButton("Load trace")
+        self.save_trace_btn = QPushButton("Save trace")
+        replay_buttons.addWidget(self.play_btn)
+        replay_buttons.addWidget(self.load_trace_btn)
+        replay_buttons.addWidget(self.save_trace_btn)
+        self.seek_slider = QSlider(Qt.Horizontal)
+        self.seek_slider.setRange(0, 0)
+        self.speed_slider = QSlider(Qt.Horizontal)
+        self.speed_slider.setRange(0, 100)
+        self.speed_slider.setValue(50)
+        self.replay_label = QLabel("Step 0 / 0")
+        self.speed_label = QLabel()
+        replay_layout.addLayout(replay_buttons)
+        replay_layout.addWidget(self.seek_slider)
+        replay_layout.addWidget(self.replay_label)
+        replay_layout.addWidget(self.speed_label)
+        replay_layout.addWidget(self.speed_slider)
+        self.replay_group.setLayout(replay_layout)
+        self.set_replay_enabled(False)
 
         # Arrange widgets in vertical layout
         layout.addWidget(self.load_btn)
@@ -72,8 +123,12 @@ class ControlPanel(QWidget):
         layout.addWidget(self.quit_btn)
         layout.addWidget(QLabel("Status:"))
         layout.addWidget(self.status_label)
+        layout.addWidget(self.progress_bar)
         layout.addWidget(self.metrics_label)
+        layout.addWidget(self.candidates_check)
+        layout.addWidget(self.replay_group)
         layout.addWidget(QLabel("Solve Steps:"))
+        layout.addLayout(steps_tools)
         # Stretch factor 1 allows steps_log to expand and fill available space
         layout.addWidget(self.steps_log, 1)
 
@@ -116,6 +171,22 @@ class ControlPanel(QWidget):
         self.status_label.setText(text)
         logger.info(text)
 
+    def set_progress(self, fraction, eta=None):
+        """
+        Show the estimated progress of the running solve.
+
+        Args:
+            fraction (float or None): Estimated fraction done (0..1), None to clear
+            eta (float or None): Estimated seconds left, None if unknown
+        """
+        if fraction is None:
+            self.progress_bar.setValue(0)
+            self.progress_bar.setFormat("-")
+            return
+        self.progress_bar.setValue(int(fraction * 1000))
+        left = "ETA unknown" if eta is None else f"ETA {eta:.1f}s"
+        self.progress_bar.setFormat(f"{100 * fraction:.0f}% ({left})")
+
     def set_metrics_text(self, text: str):
         """
         Update the metrics display label.
@@ -125,19 +196,82 @@ class ControlPanel(QWidget):
         """
         self.metrics_label.setText(f"Metrics: {text}")
     
-    def add_step_log(self, text: str):
+    def set_steps_source(self, reader):
         """
-        Add a step log message to the scrollable steps log area.
-        Automatically scrolls to the bottom to show the latest entry.
+        Show the steps of a trace (a TraceReader, possibly still growing), or None to clear.
         
         Args:
-            text (str): Step information text to append to the log
+            reader (TraceReader or None): Trace whose events become the log rows
         """
-        self.steps_log.append(text)
-        # Auto-scroll to bottom to show the latest step
-        scrollbar = self.steps_log.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
-    
-    def clear_steps_log(self):
-        """Clear all content from the steps log display."""
-        self.steps_log.clear()
+        self.steps_model.set_reader(reader)
+
+    def show_step(self, step: int):
+        """
+        Append any newly recorded steps (one batch) and select the row of the
+        step currently shown on the board, scrolling it into view.
+        
+        Args:
+            step (int): Number of events applied to the displayed board
+        """
+        self.steps_model.sync()
+        row = self.steps_model.row_for_step(step)
+        if row < 0:
+            self.steps_log.clearSelection()
+            return
+        index = self.steps_model.index(row)
+        if self.steps_log.currentIndex() != index:
+            self.steps_log.setCurrentIndex(index)
+            self.steps_log.scrollTo(index)
+
+    def on_steps_filter_changed(self, name: str):
+        """Apply the selected event-kind filter to the steps log."""
+        current = self.steps_log.currentIndex()
+        step = self.steps_model.event_index(current.row()) + 1 if current.isValid() else 0
+        self.steps_model.set_filter(FILTERS[name])
+        self.show_step(step)
+
+    def find_next_step(self):
+        """Select the next steps log row containing the search text (wraps around)."""
+        current = self.steps_log.currentIndex()
+        row = self.steps_model.find(self.steps_search.text(),
+                                    current.row() if current.isValid() else -1)
+        if row >= 0:
+            index = self.steps_model.index(row)
+            self.steps_log.setCurrentIndex(index)
+            self.steps_log.scrollTo(index)
+
+    def set_replay_enabled(self, enabled: bool):
+        """Enable or disable the replay controls (disabled until a trace is available)."""
+        for widget in (self.play_btn, self.seek_slider, self.save_trace_btn):
+            widget.setEnabled(enabled)
+
+    def set_replay_position(self, step: int, total: int):
+        """
+        Show the replay position without re-triggering a seek.
+
+        Args:
+            step (int): Current step (number of events applied)
+            total (int): Number of events in the trace
+        """
+        self.seek_slider.blockSignals(True)
+        self.seek_slider.setRange(0, total)
+        self.seek_slider.setValue(step)
+        self.seek_slider.blockSignals(False)
+        self.replay_label.setText(f"Step {step} / {total}")
+
+    def set_speed_text(self, steps_per_second: float):
+        """Update the playback speed label (infinite speed = follow the latest step)."""
+        if steps_per_second == float("inf"):
+            self.speed_label.setText("Speed: live")
+        else:
+            self.speed_label.setText(f"Speed: {steps_per_second:.0f} steps/s")
+
+    def open_trace_dialog(self):
+        """Open a file dialog for a recorded search trace. Returns the path or None."""
+        path, _ = QFileDialog.getOpenFileName(self, "Open trace", "", "Search traces (*.trace)")
+        return path if path else None
+
+    def save_trace_dialog(self, suggested_name="solve.trace"):
+        """Open a save dialog for the current search trace. Returns the path or None."""
+        path, _ = QFileDialog.getSaveFileName(self, "Save trace", suggested_name, "Search traces (*.trace)")
+        return path if path else None
@@ -9,9 +9,11 @@ from PyQt5.QtCore import QThread, QTimer
 from .board_widget import BoardWidget
 from .control_panel import ControlPanel
 from .visualizer import SolverWorker
+from .replay import ReplayController, slider_to_speed
 from sudoku_core.csp_solver import CSPSolver
 from sudoku_core.board import SudokuBoard
 from utils.file_io import load_sudoku, save_sudoku
+from sudoku_core.trace import TraceReader
 from utils.logger import get_logger
 import numpy as np
 
@@ -36,6 +38,13 @@ class MainWindow(QMainWindow):
         # State tracking for solving visualization
         self._last_snapshot = np.zeros((9,9), dtype=int)
         self._highlight_timer = None
+        # Renders the live solve and replays recorded search traces
+        self.replay = ReplayController(self)
+        self._trace_bytes = None
+        # Polls the running solve's estimated progress a few times per second
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setInterval(250)
+        self._progress_timer.timeout.connect(self.on_progress_tick)
 
         self._init_ui()
 
@@ -73,6 +82,21 @@ class MainWindow(QMainWindow):
         self.control.solve_btn.clicked.connect(self.on_solve)
         self.control.reset_btn.clicked.connect(self.on_reset)
         self.control.quit_btn.clicked.connect(self.close)
+        self.control.candidates_check.toggled.connect(self.board_widget.set_show_candidates)
+
+        # Replay controls drive the ReplayController, whose frames go to on_step.
+        # The same controller animates a running solve (see on_solve).
+        self.control.play_btn.clicked.connect(self.replay.toggle)
+        self.control.seek_slider.valueChanged.connect(self.replay.seek)
+        self.control.speed_slider.valueChanged.connect(self.on_speed_changed)
+        self.control.load_trace_btn.clicked.connect(self.on_load_trace)
+        self.control.save_trace_btn.clicked.connect(self.on_save_trace)
+        self.replay.frame.connect(self.on_step)
+        self.replay.position_changed.connect(self.control.set_replay_position)
+        self.replay.position_changed.connect(lambda step, total: self.control.show_step(step))
+        self.replay.playing_changed.connect(
+            lambda playing: self.control.play_btn.setText("Pause" if playing else "Play"))
+        self.on_speed_changed(self.control.speed_slider.value())
 
         # Arrange left column: board on top, log area below
         left_col.addWidget(self.board_widget)
@@ -154,8 +178,8 @@ class MainWindow(QMainWindow):
         - Validates the input grid
         - Clears the previous step log
         - Disables UI controls during solving
-        - Starts a worker thread to run the CSP solver
-        - Updates the board with progress as the solver runs
+        - Starts a worker thread to run the CSP solver at full speed
+        - Animates its live trace at the selected playback speed
         """
         # Extract grid from board UI
         grid = self.board_widget.get_grid()
@@ -166,9 +190,9 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Invalid board", str(e))
             return
 
-        # Clear previous steps log
-        self.control.clear_steps_log()
-        self.control.add_step_log("Solving started...")
+        # Stop any replay of the previous trace
+        self.replay.set_trace(None)
+        self._trace_bytes = None
 
         # Disable UI controls while solver is running
         self.control.solve_btn.setEnabled(False)
@@ -179,47 +203,95 @@ class MainWindow(QMainWindow):
 
         # Create solver worker and thread
         # The worker runs the solver in a separate thread to keep UI responsive
-        self.worker = SolverWorker(board, CSPSolver)
+        # Warm start: the board widget's engine already holds the propagated
+        # candidates of this grid, so the solver does not rebuild its domains
+        self.worker = SolverWorker(board, CSPSolver, self.board_widget.engine.domains())
         self.worker_thread = QThread()
         self.worker.moveToThread(self.worker_thread)
         
         # Connect worker signals to handler methods
         self.worker_thread.started.connect(self.worker.run)
-        self.worker.step_info.connect(self.on_step_info)
         self.worker.finished.connect(self.on_finished)
-        
+
+        # The renderer samples the trace at its own frame rate while the solver
+        # writes it, so the solver never waits for the UI
+        self._start_replay(self.worker.live_reader())
+        self.replay.follow(self.replay.reader)
+
         # Start the solver thread
+        self.control.set_progress(None)
+        self._progress_timer.start()
         self.worker_thread.start()
         self.log("Solver started (background).")
 
+    def on_progress_tick(self):
+        """Show the estimated progress and ETA of the running solve."""
+        if self.worker is None:
+            return
+        progress = self.worker.progress()
+        if progress is not None:
+            self.control.set_progress(*progress)
+
     def on_step(self, grid_snapshot, highlight):
         """
-        Handle intermediate solving step (currently not connected).
-        This method can be used to animate the solving process by showing
-        the board state as it changes during solving.
+        Show one frame of a replayed (or live) search.
+        The board widget keeps a single highlighted cell, so the previous
+        highlight is cleared when the next frame arrives.
         
         Args:
             grid_snapshot (numpy.ndarray): 9x9 grid state at this step
             highlight (tuple or None): (row, col) to highlight, or None
         """
-        # Update board widget with current solver state
         self.board_widget.show_grid_snapshot(grid_snapshot, highlight)
-        # Schedule clearing highlight after a short interval
-        if highlight:
-            # Use QTimer to restore style after a delay
-            delay = self.control.speed_slider.value() if hasattr(self.control, 'speed_slider') else 100
-            QTimer.singleShot(delay, lambda: self.board_widget.set_grid(grid_snapshot))
-    
-    def on_step_info(self, info_text: str):
+
+    def on_speed_changed(self, value: int):
+        """Apply the speed slider position (log scale, top = live) to playback."""
+        speed = slider_to_speed(value, self.control.speed_slider.maximum())
+        self.replay.set_speed(speed)
+        self.control.set_speed_text(speed)
+
+    def _start_replay(self, reader, trace_bytes=None):
+        """Load a trace into the replay controls."""
+        self._trace_bytes = trace_bytes
+        self.control.set_steps_source(reader)
+        self.replay.set_trace(reader)
+        self.control.set_replay_enabled(True)
+        self.control.save_trace_btn.setEnabled(trace_bytes is not None)
+
+    def on_load_trace(self):
         """
-        Handle step information from the solver worker.
-        Adds detailed step logs to the control panel.
-        
-        Args:
-            info_text (str): Descriptive text about the current solving step
+        Handle the Load trace button click.
+        Opens a recorded search trace and shows its first step for replay.
         """
-        self.control.add_step_log(info_text)
+        path = self.control.open_trace_dialog()
+        if not path:
+            return
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            reader = TraceReader(data)
+        except Exception as e:
+            QMessageBox.warning(self, "Load error", str(e))
+            self.log(f"Trace load failed: {e}")
+            return
+        self._start_replay(reader, data)
+        self.log(f"Loaded trace: {path} ({len(reader)} steps)")
 
+    def on_save_trace(self):
+        """Handle the Save trace button click: write the current trace to a .trace file."""
+        if self._trace_bytes is None:
+            return
+        path = self.control.save_trace_dialog()
+        if not path:
+            return
+        try:
+            with open(path, "wb") as f:
+                f.write(self._trace_bytes)
+            self.log(f"Trace saved to: {path}")
+        except Exception as e:
+            QMessageBox.warning(self, "Save error", str(e))
+            self.log(f"Trace save failed: {e}")
+    
     def on_finished(self, success: bool, metrics: dict):
         """
         Handle solver completion.
@@ -229,10 +301,19 @@ class MainWindow(QMainWindow):
             success (bool): True if puzzle was completely solved
             metrics (dict): Solver metrics (assignments, backtracks, time, etc.)
         """
-        # Display final solved grid on board
-        final_grid = self.worker.board.grid if self.worker else None
-        if final_grid is not None:
-            self.board_widget.set_grid(final_grid)
+        # The trace is complete and can now be saved. The replay jumps to its
+        # last step so the final board is shown (and saved) right away; the
+        # search can still be played back from the replay controls
+        if self.worker is not None:
+            self._trace_bytes = self.worker.trace.getvalue()
+            self.control.save_trace_btn.setEnabled(True)
+        self.replay.finish_follow()
+        self.replay.pause()
+        self.replay.seek(self.replay.total)
+        if self.worker is not None:
+            self.board_widget.set_grid(self.worker.board.grid)
+        self._progress_timer.stop()
+        self.control.set_progress(1.0 if success else None, 0.0 if success else None)
         
         # Update status and metrics display
         self.control.set_status("Finished" if success else "Finished (incomplete)")
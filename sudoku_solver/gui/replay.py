@@ -0,0 +1,131 @@
+# gui/replay.py
+"""
+Frame-rate-limited playback of search traces (see sudoku_core/trace.py).
+Drives the board from a TraceReader with play, pause, seek and speed control,
+both for recorded traces and for a solve that is still running.
+"""
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+import numpy as np
+
+LIVE = float("inf")
+
+
+def slider_to_speed(value: int, maximum: int = 100) -> float:
+    """
+    Map a 0..maximum slider position to a playback speed of 1..10000 steps
+    per second (log scale). The top position is LIVE: always show the latest step.
+    """
+    if value >= maximum:
+        return LIVE
+    return 10 ** (4.0 * value / maximum)
+
+
+class ReplayController(QObject):
+    """
+    Plays a trace back at a given speed (steps per second).
+    A QTimer ticks at FPS frames per second and each tick advances the
+    position by speed / FPS steps, so fast speeds skip intermediate steps
+    instead of flooding the UI. Each frame rebuilds the board from the
+    nearest checkpoint (O(checkpoint interval)), and at most one frame is
+    emitted per tick.
+
+    follow() plays a live trace whose length is still growing: playback
+    waits at the newest step instead of stopping, until finish_follow() is
+    called. At LIVE speed every frame jumps straight to the newest step.
+
+    Emitted signals:
+        frame: (grid: np.ndarray, highlight: (r,c) or None) - board to display
+        position_changed: (step: int, total: int)
+        playing_changed: (playing: bool)
+    """
+    frame = pyqtSignal(object, object)
+    position_changed = pyqtSignal(int, int)
+    playing_changed = pyqtSignal(bool)
+
+    FPS = 30
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.reader = None
+        self.position = 0
+        self.speed = 100.0
+        self.following = False
+        self._carry = 0.0
+        self._timer = QTimer(self)
+        self._timer.setInterval(int(1000 / self.FPS))
+        self._timer.timeout.connect(self._tick)
+
+    @property
+    def playing(self) -> bool:
+        return self._timer.isActive()
+
+    @property
+    def total(self) -> int:
+        return len(self.reader) if self.reader is not None else 0
+
+    def set_trace(self, reader):
+        """Load a TraceReader (or None) and show its first step."""
+        self.pause()
+        self.following = False
+        self.reader = reader
+        self.seek(0)
+
+    def follow(self, reader):
+        """Start playing a trace that is still being recorded."""
+        self.set_trace(reader)
+        self.following = True
+        self.play()
+
+    def finish_follow(self):
+        """The followed trace is complete; playback stops at its end as usual."""
+        self.following = False
+        if self.playing and self.position >= self.total:
+            self.pause()
+
+    def set_speed(self, steps_per_second: float):
+        self.speed = max(0.1, float(steps_per_second))
+
+    def play(self):
+        if self.reader is None or self.playing:
+            return
+        if self.position >= self.total and not self.following:
+            self.seek(0)
+        self._carry = 0.0
+        self._timer.start()
+        self.playing_changed.emit(True)
+
+    def pause(self):
+        if self.playing:
+            self._timer.stop()
+            self.playing_changed.emit(False)
+
+    def toggle(self):
+        self.pause() if self.playing else self.play()
+
+    def seek(self, step: int):
+        """Jump to the board after `step` events and emit it."""
+        if self.reader is None:
+            return
+        total = self.total
+        self.position = max(0, min(int(step), total))
+        grid = np.array(self.reader.grid_at(self.position), dtype=int).reshape(9, 9)
+        highlight = None
+        if self.position > 0:
+            cell = self.reader.event(self.position - 1)[1]
+            highlight = divmod(cell, 9)
+        self.frame.emit(grid, highlight)
+        self.position_changed.emit(self.position, total)
+
+    def _tick(self):
+        total = self.total
+        if self.speed == LIVE:
+            target = total
+        else:
+            self._carry += self.speed / self.FPS
+            advance = int(self._carry)
+            self._carry -= advance
+            target = min(self.position + advance, total)
+        if target > self.position:
+            self.seek(target)
+        if self.position >= total and not self.following:
+            self.pause()
@@ -0,0 +1,113 @@
+# gui/step_log.py
+"""
+Virtualized model for the solver steps log.
+The rows are the events of a search trace (sudoku_core/trace.py). The text
+of a row is only built when the view asks for it, i.e. for the rows that are
+on screen, so the log costs nothing per step beyond the trace itself.
+"""
+from array import array
+from bisect import bisect_left
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt
+
+from sudoku_core import trace as tr
+
+# filter name -> event kinds shown (None = all)
+FILTERS = {
+    "All steps": None,
+    "Assignments & backtracks": {tr.ASSIGN, tr.BACKTRACK},
+    "Failures": {tr.INVALID, tr.FC_FAIL, tr.BACKTRACK},
+    "Cell selections": {tr.SELECT},
+}
+
+
+class StepLogModel(QAbstractListModel):
+    """
+    List model over a TraceReader (live or complete).
+
+    Rows are appended in batches by sync(), which the GUI calls once per
+    frame. With a filter, the model keeps only a compact array of matching
+    event indices (4 bytes per row), never the text.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.reader = None
+        self.kinds = None
+        self._rows = 0          # rows currently exposed to the view
+        self._scanned = 0       # events already checked against the filter
+        self._index = None      # event index of each row when filtered
+
+    def set_reader(self, reader):
+        """Show a new trace (or None to clear)."""
+        self.beginResetModel()
+        self.reader = reader
+        self._reset_rows()
+        self.endResetModel()
+        self.sync()
+
+    def set_filter(self, kinds):
+        """Only show events whose kind is in kinds (None = everything)."""
+        self.beginResetModel()
+        self.kinds = set(kinds) if kinds is not None else None
+        self._reset_rows()
+        self.endResetModel()
+        self.sync()
+
+    def _reset_rows(self):
+        self._rows = 0
+        self._scanned = 0
+        self._index = array("I") if self.kinds is not None else None
+
+    def sync(self):
+        """Append the events recorded since the last call as one batch of rows."""
+        if self.reader is None:
+            return
+        count = len(self.reader)
+        if self._index is None:
+            new_rows = count
+        else:
+            kinds = self.kinds
+            for i, event in enumerate(self.reader.events(self._scanned, count), self._scanned):
+                if event[0] in kinds:
+                    self._index.append(i)
+            new_rows = len(self._index)
+        self._scanned = count
+        if new_rows > self._rows:
+            self.beginInsertRows(QModelIndex(), self._rows, new_rows - 1)
+            self._rows = new_rows
+            self.endInsertRows()
+
+    def event_index(self, row):
+        return row if self._index is None else self._index[row]
+
+    def row_for_step(self, step):
+        """Row of the last shown event at or before `step` events (-1 if none)."""
+        if step <= 0 or self._rows == 0:
+            return -1
+        if self._index is None:
+            return min(step, self._rows) - 1
+        return bisect_left(self._index, step, 0, self._rows) - 1
+
+    def text(self, row):
+        i = self.event_index(row)
+        return f"Step {i + 1}: {self.reader.describe(i)}"
+
+    def find(self, needle, start_row=0, backward=False):
+        """Row of the next entry containing needle (case-insensitive, wraps), or -1."""
+        needle = needle.lower()
+        if not needle or self._rows == 0:
+            return -1
+        step = -1 if backward else 1
+        for k in range(1, self._rows + 1):
+            row = (start_row + step * k) % self._rows
+            if needle in self.text(row).lower():
+                return row
+        return -1
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        return self.text(index.row())
@@ -1,117 +1,81 @@
 # gui/visualizer.py
 """
 Solver worker for background execution of the CSP solver.
-Monitors solver progress and emits signals for UI updates.
+The solver runs at full speed and records every search event into an
+in-memory trace; the GUI samples that trace at its own frame rate
+(see gui/replay.py), so no per-step signals cross threads.
 """
-from PyQt5.QtCore import QObject, pyqtSignal, QThread
-import threading
+from PyQt5.QtCore import QObject, pyqtSignal
 import time
 import numpy as np
+from sudoku_core.estimator import progress
+from sudoku_core.trace import TraceRecorder, TraceReader
 
 class SolverWorker(QObject):
     """
     Worker that runs the Sudoku solver in a background thread.
-    Polls the board state and step logs to detect progress,
-    and emits signals for UI updates.
-    
+
+    Progress is published through `trace` (a TraceRecorder). The main thread
+    reads it live with `live_reader()` while the solve is running, so the
+    solver is never throttled by the UI and the event loop is never flooded.
+    Before the search starts, `estimate` is set to a Knuth tree-size estimate
+    (sudoku_core.estimator); together with `solver.metrics` the main thread
+    turns it into a progress fraction and ETA (see progress()).
+
     Emitted signals:
-        step: (grid: np.ndarray, highlight: (r,c) or None) - intermediate solving steps
         finished: (success: bool, metrics: dict) - solver completion
-        step_info: (text: str) - detailed step information for logging
     """
-    # Signal definitions for communicating with main thread
-    step = pyqtSignal(object, object)      # (grid: np.ndarray, highlight: (r,c) or None)
     finished = pyqtSignal(bool, dict)      # (success: bool, metrics: dict)
-    step_info = pyqtSignal(str)            # step information string
 
-    def __init__(self, board, solver_cls):
+    def __init__(self, board, solver_cls, domains=None):
         """
         Initialize the solver worker.
         
         Args:
             board (SudokuBoard): The puzzle board to solve
             solver_cls: The solver class (e.g., CSPSolver) to use for solving
+            domains (dict or None): Already propagated domains of board (warm start)
         """
         super().__init__()
         self.board = board
         self.solver_cls = solver_cls
-        # Event flag for gracefully stopping the worker
-        self._stop = threading.Event()
-        
+        self.domains = domains
+        # In-memory binary trace of the search, read live by the renderer
+        self.trace = TraceRecorder(board.grid)
+        # Set by run(); read by the main thread for the progress display
+        self.solver = None
+        self.estimate = None
 
-    def run(self):
+    def live_reader(self):
+        """TraceReader that follows the trace while the solver is writing it."""
+        return TraceReader(self.trace)
+
+    def progress(self):
         """
-        Main worker thread entry point.
-        Strategy:
-          1. Create an instance of the solver
-          2. Start solver.solve() in a dedicated thread (blocking operation)
-          3. While solver thread is running, poll the board state and step logs
-          4. Detect grid changes and emit them as signals
-          5. When solver completes, emit final result and metrics
-        
-        The polling approach allows the worker thread to remain responsive
-        while the solver does its work in a separate thread.
+        (fraction done, ETA in seconds or None) of the running solve, or None
+        before the search has started. Safe to call from the main thread.
         """
-        # Create solver instance
-        solver = self.solver_cls(self.board)
-        # Keep a copy of the last seen grid state for change detection
-        last_snapshot = np.array(self.board.grid, copy=True)
-        last_step_count = 0
-        
-        # Start the blocking solver in a dedicated daemon thread
-        # This prevents it from blocking the Qt worker thread
-        solver_thread = threading.Thread(target=solver.solve, daemon=True)
-        solver_thread.start()
-
-        # Poll while solver is still running
-        while solver_thread.is_alive() and not self._stop.is_set():
-            # Get current grid state
-            current = np.array(self.board.grid, copy=True)
-            
-            # Check for new step log entries (if solver tracks steps)
-            if hasattr(solver, 'step_log'):
-                current_step_count = len(solver.step_log)
-                if current_step_count > last_step_count:
-                    # Emit any new step information
-                    for i in range(last_step_count, current_step_count):
-                        step_msg = solver.step_log[i]
-                        self.step_info.emit(step_msg)
-                    last_step_count = current_step_count
-            
-            # Check for grid changes
-            if not np.array_equal(current, last_snapshot):
-                # Find the cell(s) that changed
-                diff = (current != last_snapshot)
-                coords = list(zip(*diff.nonzero()))
-                # Highlight the most recently changed cell
-                highlight = coords[-1] if coords else None
-                # Emit grid snapshot and highlight signal
-                self.step.emit(current.copy(), highlight)
-                last_snapshot = current
-            
-            # Small delay to avoid busy waiting (10ms polling interval)
-            time.sleep(0.01)
+        solver = self.solver
+        if solver is None or self.estimate is None or solver.metrics.start_time is None:
+            return None
+        elapsed = time.time() - solver.metrics.start_time
+        return progress(self.estimate, solver.metrics.assignments, elapsed)
 
-        # After solver finishes, emit the final snapshot
+    def run(self):
+        """
+        Main worker thread entry point: solve, then report the result.
+        The text step log is not kept (log_steps=False); the trace holds the
+        same information in binary form and is described on demand.
+        """
+        solver = self.solver_cls(self.board, trace=self.trace, log_steps=False,
+                                 domains=self.domains)
+        if hasattr(solver, "estimate"):
+            self.estimate = solver.estimate()
+        self.solver = solver
+        solver.solve()
         final = np.array(self.board.grid, copy=True)
-        self.step.emit(final.copy(), None)
-        
-        # Emit any remaining step log entries
-        if hasattr(solver, 'step_log') and last_step_count < len(solver.step_log):
-            for i in range(last_step_count, len(solver.step_log)):
-                step_msg = solver.step_log[i]
-                self.step_info.emit(step_msg)
-        
         # Get solver metrics (if available)
         metrics = solver.metrics.summary() if hasattr(solver, "metrics") else {}
         # Check if puzzle is fully solved (no zeros remaining)
-        success = final.min() > 0
-        # Emit finished signal with success status and metrics
+        success = bool(final.min() > 0)
         self.finished.emit(success, metrics)
-
-    def stop(self):
-        """
-        Request the worker to stop gracefully.
-        Sets the stop event that the polling loop checks.
-        """
-        self._stop.set()
\ No newline at end of file
@@ -1,8 +1,10 @@
 # main.py
+import os
 import sys
 from PyQt5.QtWidgets import QApplication
 from gui.main_window import MainWindow
 from PyQt5.QtCore import QFile, QTextStream
+from utils.timer import REGISTRY
 
 def load_stylesheet(app, path="gui/styles.qss"):
     try:
@@ -19,7 +21,11 @@ def main():
     load_stylesheet(app)
     win = MainWindow()
     win.show()
-    sys.exit(app.exec_())
+    rc = app.exec_()
+    # SUDOKU_TIMINGS=path.json: dump the load/validate/solve/render timings on exit
+    if os.environ.get("SUDOKU_TIMINGS"):
+        REGISTRY.write_json(os.environ["SUDOKU_TIMINGS"])
+    sys.exit(rc)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,352 @@
+# service.py
+"""
+Local asyncio solving service.
+
+Clients connect over TCP or a Unix socket and send one JSON object per line:
+
+    {"id": 7, "puzzle": "53..7....6..195....", "deadline": 2.0}
+
+and get one JSON line back per request, in completion order:
+
+    {"id": 7, "status": "solved", "solution": "534678912...", "assignments": 51,
+     "backtracks": 0, "time": 0.004, "latency": 0.006}
+
+Solving never happens on the event loop. Requests that arrive within
+batch_window of each other (up to max_batch) are sent to a shared process
+pool as one batch (split evenly across the workers), and each worker reuses
+a single solver (see worker.py).
+Backpressure comes from a bounded request queue. When it is full, the
+connection handlers stop reading, so clients are throttled through their
+sockets. At most 2 * workers batches are in flight at once.
+
+Deadlines are relative to arrival. A request still queued (or waiting behind
+the rest of its batch in the worker) when its deadline passes is answered
+with "deadline_exceeded" without being solved. Otherwise the time it has
+left when its solve starts becomes the solver's time limit, so a slow solve
+ends with "timeout".
+
+Worker logging goes through the parent's log listener, and the workers'
+timings are merged into utils.timer.REGISTRY by close().
+
+    python -m sudoku_solver serve --port 8765 --workers 4
+"""
+import asyncio
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.logger import log_queue
+from utils.timer import collect_process_timings, timing_queue
+from worker import init_worker, solve_batch
+
+
+def parse_puzzle(text):
+    """81-character puzzle string ('.' or '0' for empty) -> 81 raw bytes."""
+    if not isinstance(text, str) or len(text) != 81:
+        raise ValueError("puzzle must be a string of 81 characters")
+    cells = bytearray(81)
+    for i, ch in enumerate(text):
+        if ch in "123456789":
+            cells[i] = ord(ch) - 48
+        elif ch not in ".0":
+            raise ValueError(f"invalid character in puzzle: {ch!r}")
+    return bytes(cells)
+
+
+def check_deadline(deadline):
+    """None, or a finite number of seconds >= 0 (raises ValueError otherwise)."""
+    if deadline is None:
+        return None
+    if isinstance(deadline, bool) or not isinstance(deadline, (int, float)) \
+            or not math.isfinite(deadline) or deadline < 0:
+        raise ValueError("deadline must be a non-negative number of seconds")
+    return deadline
+
+
+class _Request:
+    __slots__ = ("id", "cells", "arrival", "deadline", "future")
+
+    def __init__(self, request_id, cells, arrival, deadline, future):
+        self.id = request_id
+        self.cells = cells
+        self.arrival = arrival
+        self.deadline = deadline
+        self.future = future
+
+
+class SolverService:
+    """
+    Batching front end over a process pool.
+    Use submit() directly, or start_tcp()/start_unix() to accept JSON-lines clients.
+    """
+    def __init__(self, workers=1, solver_options=None, batch_window=0.002, max_batch=64,
+                 max_pending=1024, default_deadline=None):
+        self.workers = workers
+        self.solver_options = dict(solver_options or {})
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.default_deadline = default_deadline
+        self.stats = {"requests": 0, "batches": 0, "deadline_exceeded": 0}
+
+        self._pool = None
+        self._timings = None
+        self._queue = None
+        self._inflight = None
+        self._dispatcher = None
+        self._batch_tasks = set()
+        self._connections = set()
+        self._servers = []
+
+    async def start(self):
+        """Start the worker pool and the batching dispatcher (idempotent)."""
+        if self._pool is not None:
+            return
+        self._timings = timing_queue()
+        self._pool = ProcessPoolExecutor(self.workers, initializer=init_worker,
+                                         initargs=(self.solver_options, log_queue(),
+                                                   self._timings))
+        self._queue = asyncio.Queue(self.max_pending)
+        self._inflight = asyncio.Semaphore(2 * self.workers)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def start_tcp(self, host="127.0.0.1", port=0):
+        """Listen on TCP; returns the bound (host, port)."""
+        await self.start()
+        server = await asyncio.start_server(self._handle, host, port)
+        self._servers.append(server)
+        return server.sockets[0].getsockname()[:2]
+
+    async def start_unix(self, path):
+        """Listen on a Unix domain socket at path."""
+        await self.start()
+        if os.path.exists(path):
+            os.unlink(path)
+        server = await asyncio.start_unix_server(self._handle, path)
+        self._servers.append(server)
+        return path
+
+    async def serve_forever(self):
+        await asyncio.gather(*(server.serve_forever() for server in self._servers))
+
+    async def close(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+        for task in list(self._connections):
+            task.cancel()
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            # the pool starts workers on demand, so fewer than self.workers may report
+            collect_process_timings(self._timings, self.workers, timeout=0.1)
+            self._timings = None
+
+    async def submit(self, puzzle, deadline=None, request_id=None):
+        """
+        Queue one puzzle and wait for its result dict.
+        Waits for queue space when max_pending requests are already queued.
+        """
+        return await (await self._enqueue(puzzle, deadline, request_id))
+
+    async def _enqueue(self, puzzle, deadline, request_id):
+        """Queue a request once there is room; returns the future of its result."""
+        loop = asyncio.get_running_loop()
+        arrival = loop.time()
+        future = loop.create_future()
+        try:
+            cells = parse_puzzle(puzzle)
+            deadline = check_deadline(deadline)
+        except ValueError as e:
+            future.set_result({"id": request_id, "status": "error", "error": str(e)})
+            return future
+        if deadline is None:
+            deadline = self.default_deadline
+        request = _Request(request_id, cells, arrival,
+                           None if deadline is None else arrival + deadline, future)
+        self.stats["requests"] += 1
+        await self._queue.put(request)
+        return future
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            close_at = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = close_at - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            # spread a large batch over the workers instead of queueing it on one
+            size = -(-len(batch) // self.workers)
+            for start in range(0, len(batch), size):
+                await self._inflight.acquire()
+                task = asyncio.create_task(self._run_batch(batch[start:start + size]))
+                self._batch_tasks.add(task)
+                task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            now = loop.time()
+            live, jobs = [], []
+            for request in batch:
+                if request.deadline is not None and request.deadline <= now:
+                    self.stats["deadline_exceeded"] += 1
+                    self._finish(request, {"status": "deadline_exceeded", "solution": None})
+                    continue
+                # the worker gets an absolute deadline: it solves the batch one job
+                # after another, so each job's time limit is taken when it starts
+                deadline = None if request.deadline is None \
+                    else time.monotonic() + (request.deadline - now)
+                live.append(request)
+                jobs.append(((0, "service", request.cells), deadline))
+            if not jobs:
+                return
+            self.stats["batches"] += 1
+            try:
+                results = await loop.run_in_executor(self._pool, solve_batch, jobs)
+            except Exception as e:
+                results = [{"status": "error", "error": str(e)} for _ in live]
+            for request, result in zip(live, results):
+                result.pop("index", None)
+                result.pop("source", None)
+                if result["status"] == "deadline_exceeded":
+                    self.stats["deadline_exceeded"] += 1
+                self._finish(request, result)
+        finally:
+            self._inflight.release()
+
+    def _finish(self, request, result):
+        if request.future.done():
+            return
+        result["id"] = request.id
+        result["latency"] = asyncio.get_running_loop().time() - request.arrival
+        request.future.set_result(result)
+
+    async def _handle(self, reader, writer):
+        """One client connection: read request lines, write results as they complete."""
+        pending = set()
+        lock = asyncio.Lock()
+        this_task = asyncio.current_task()
+        self._connections.add(this_task)
+
+        async def respond(future):
+            result = await future
+            async with lock:
+                writer.write((json.dumps(result) + "\n").encode())
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    msg = json.loads(line)
+                    puzzle, deadline, request_id = msg["puzzle"], msg.get("deadline"), msg.get("id")
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    future = asyncio.get_running_loop().create_future()
+                    future.set_result({"id": None, "status": "error", "error": "bad request"})
+                else:
+                    # blocks while the queue is full, so we stop reading (backpressure)
+                    future = await self._enqueue(puzzle, deadline, request_id)
+                task = asyncio.create_task(respond(future))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except (ConnectionError, asyncio.CancelledError):
+            # client went away, or the service is closing
+            pass
+        finally:
+            self._connections.discard(this_task)
+            for task in pending:
+                task.cancel()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+class SolverClient:
+    """
+    Minimal pipelining client for SolverService.
+    Many solve() calls may be in flight at once; replies are matched by id.
+    """
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count()
+        self._waiting = {}
+        self._reader_task = asyncio.create_task(self._read_loop())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=None, path=None):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def solve(self, puzzle, deadline=None):
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        msg = {"id": request_id, "puzzle": puzzle}
+        if deadline is not None:
+            msg["deadline"] = deadline
+        self._writer.write((json.dumps(msg) + "\n").encode())
+        await self._writer.drain()
+        return await future
+
+    async def _read_loop(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                result = json.loads(line)
+                future = self._waiting.pop(result.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(result)
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("connection closed"))
+            self._waiting.clear()
+
+    async def close(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._reader_task.cancel()
+        try:
+            await self._reader_task
+        except (asyncio.CancelledError, ConnectionError):
+            pass
@@ -0,0 +1,171 @@
+# sudoku_core/alldiff.py
+"""
+All-different propagation (Régin 1994)
+--------------------------------------
+Pairwise != arcs (forward checking, AC-3) only see two cells at a time. The
+all-different propagator looks at a whole row, column or box at once: a
+value v can stay in cell x only if some assignment of distinct values to
+all 9 cells of the unit gives v to x. For example, if two cells of a row
+can only hold {1, 2}, then 1 and 2 are removed from the other 7 cells.
+
+Per unit, the cells and values form a bipartite graph. Given a maximum
+matching, an edge (x, v) outside the matching belongs to some maximum
+matching iff x and v lie in the same strongly connected component of the
+graph that orients matched edges cell -> value and the others value -> cell.
+Every other edge is pruned. (A unit has as many values as cells, so the
+matching is perfect and there are no free values to start alternating
+paths from.)
+
+The matching of every unit is kept between calls. Removing values during
+the search only breaks the edges that lost their value, and putting values
+back on backtrack never breaks a matched edge. Each call therefore just
+re-augments the few unmatched cells instead of matching from scratch.
+"""
+
+from .heuristics import CELL_UNITS, UNITS
+
+
+class AllDifferent:
+    """
+    Generalized arc consistency for the 27 all-different units.
+    Counters: prunes (values removed) and revisions (units examined);
+    failed_unit is the unit that could not be completed by the last failed call.
+    """
+    __slots__ = ("match", "prunes", "revisions", "failed_unit")
+
+    def __init__(self):
+        # match[u][i] = value matched to cell i of unit u (0 = unmatched)
+        self.match = [[0] * 9 for _ in range(27)]
+        self.prunes = 0
+        self.revisions = 0
+        self.failed_unit = None
+
+    def reset_counters(self):
+        self.prunes = 0
+        self.revisions = 0
+
+    def propagate(self, domains, cells, support=None):
+        """
+        Make every unit that contains one of cells (and, transitively, every
+        unit touched by a pruning) generalized arc consistent.
+        Returns dict {cell: set_of_values_removed} (for restore_inferences),
+        or None if a unit cannot be completed; domains and support are then
+        left unchanged.
+        """
+        queue = []
+        queued = [False] * 27
+        for cell in cells:
+            for u in CELL_UNITS[cell]:
+                if not queued[u]:
+                    queued[u] = True
+                    queue.append(u)
+        inferences = {}
+        while queue:
+            u = queue.pop()
+            queued[u] = False
+            self.revisions += 1
+            pruned = self._revise(u, domains)
+            if pruned is None:
+                self.failed_unit = u
+                for cell, removed in inferences.items():
+                    domains[cell] = domains[cell] | removed
+                    if support is not None:
+                        support.add_values(cell, removed)
+                return None
+            for cell, removed in pruned:
+                domains[cell] = domains[cell] - removed
+                if support is not None:
+                    support.remove_values(cell, removed)
+                inferences.setdefault(cell, set()).update(removed)
+                self.prunes += len(removed)
+                for w in CELL_UNITS[cell]:
+                    if w != u and not queued[w]:
+                        queued[w] = True
+                        queue.append(w)
+        return inferences
+
+    def _revise(self, u, domains):
+        """[(cell, values to remove)] for unit u, or None if it has no perfect matching."""
+        cells = UNITS[u]
+        doms = [domains[cell] for cell in cells]
+        match = self.match[u]
+        owner = [-1] * 10
+        for i in range(9):
+            v = match[i]
+            if v:
+                if v in doms[i]:
+                    owner[v] = i
+                else:
+                    match[i] = 0
+
+        def augment(i, seen):
+            for v in doms[i]:
+                if not seen[v]:
+                    seen[v] = True
+                    j = owner[v]
+                    if j < 0 or augment(j, seen):
+                        match[i] = v
+                        owner[v] = i
+                        return True
+            return False
+
+        for i in range(9):
+            if not match[i] and not augment(i, [False] * 10):
+                return None
+
+        # Tarjan's SCC on 18 nodes: cells 0..8, value v is node 8 + v
+        index = [-1] * 18
+        low = [0] * 18
+        comp = [-1] * 18
+        stack = []
+        on_stack = [False] * 18
+        counter = 0
+        components = 0
+        for root in range(18):
+            if index[root] >= 0:
+                continue
+            # iterative DFS: (node, iterator over successors)
+            work = [(root, None)]
+            while work:
+                node, successors = work.pop()
+                if successors is None:
+                    index[node] = low[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                    if node < 9:
+                        successors = iter((8 + match[node],))
+                    else:
+                        v = node - 8
+                        successors = iter([j for j in range(9) if v in doms[j] and j != owner[v]])
+                advanced = False
+                for nxt in successors:
+                    if index[nxt] < 0:
+                        work.append((node, successors))
+                        work.append((nxt, None))
+                        advanced = True
+                        break
+                    if on_stack[nxt] and index[nxt] < low[node]:
+                        low[node] = index[nxt]
+                if advanced:
+                    continue
+                if low[node] == index[node]:
+                    while True:
+                        top = stack.pop()
+                        on_stack[top] = False
+                        comp[top] = components
+                        if top == node:
+                            break
+                    components += 1
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+
+        pruned = []
+        for i in range(9):
+            ci = comp[i]
+            removed = {v for v in doms[i] if v != match[i] and comp[8 + v] != ci}
+            if removed:
+                pruned.append((cells[i], removed))
+        return pruned
@@ -1,35 +1,52 @@
 # sudoku_core/board.py
 
+import math
+
 import numpy as np
+from .validator import conflicting_cells
 
 class SudokuBoard:
+    __slots__ = ("grid",)
+
     def __init__(self, grid=None):
         """
-        grid: 9x9 list or numpy array, 0 represents empty cell
+        grid: 9x9 list or numpy array, 0 represents empty cell. Larger
+              N x N boards (N = 16, 25, ...) are accepted for the SAT backend
         """
         if grid is None:
             self.grid = np.zeros((9, 9), dtype=int)
         else:
             self.grid = np.array(grid, dtype=int)
-        assert self.grid.shape == (9, 9), "Grid must be 9x9"
+        size = self.grid.shape[0]
+        assert self.grid.shape == (size, size) and math.isqrt(size) ** 2 == size > 1, \
+            "Grid must be N x N with N a square (9x9 for the CSP solver)"
+
+    @property
+    def size(self):
+        return self.grid.shape[0]
 
     def is_valid(self, row, col, num):
-        "Check if num is valid in the row, col, and 3x3 box"
+        "Check if num is valid in the row, col, and box"
         if num in self.grid[row, :]: return False
         if num in self.grid[:, col]: return False
-        start_row, start_col = 3 * (row // 3), 3 * (col // 3)
-        if num in self.grid[start_row:start_row+3, start_col:start_col+3]:
+        n = 3 if self.grid.shape[0] == 9 else math.isqrt(self.grid.shape[0])
+        start_row, start_col = n * (row // n), n * (col // n)
+        if num in self.grid[start_row:start_row+n, start_col:start_col+n]:
             return False
         return True
 
     def find_empty(self):
         "Return the row, col of the first empty cell, or None if none found"
-        for r in range(9):
-            for c in range(9):
+        for r in range(self.size):
+            for c in range(self.size):
                 if self.grid[r, c] == 0:
                     return r, c
         return None
 
+    def conflicts(self):
+        "Return the (row, col) of every cell that clashes with a peer (vectorized check)"
+        return conflicting_cells(self.grid)
+
     def is_complete(self):
         "Check if the board is complete"
         return np.all(self.grid > 0)
@@ -43,7 +60,7 @@ class SudokuBoard:
     def __str__(self):
         "Return a string representation of the board"
         out = ""
-        for i in range(9):
+        for i in range(self.size):
             row = " ".join(str(x) if x != 0 else "." for x in self.grid[i])
             out += row + "\n"
         return out
@@ -0,0 +1,364 @@
+# sudoku_core/cdcl.py
+"""
+CDCL SAT engine
+---------------
+A small, self-contained conflict-driven clause learning solver for CNF
+formulas given as DIMACS-style integer literals (v or -v, v >= 1):
+
+- two-watched-literal propagation for long clauses; binary clauses (most of
+  the Sudoku encoding) live in per-literal implication lists instead
+- first-UIP conflict analysis with learned-clause minimization and
+  non-chronological backjumping
+- VSIDS variable activities (lazy heap) with phase saving
+- Luby restarts (sudoku_core.restarts.luby) and periodic reduction of the
+  learned clauses, keeping the ones with a small LBD (glue)
+
+Internally literal v is 2*v and -v is 2*v + 1, so negation is `lit ^ 1`
+and the variable is `lit >> 1`. value[lit] is 1 (true), -1 (false) or 0.
+"""
+
+import heapq
+import time
+
+from .restarts import luby
+
+RESTART_UNIT = 100       # conflicts per Luby unit
+VAR_DECAY = 0.95
+GLUE_KEEP = 2            # learned clauses with LBD <= GLUE_KEEP are never deleted
+
+
+class CDCLTimeout(Exception):
+    """Raised by CDCL.solve() when its deadline has passed."""
+
+
+def _lit(x):
+    return 2 * x if x > 0 else -2 * x + 1
+
+
+class CDCL:
+    """
+    CDCL solver over variables 1..num_vars. Add clauses with add_clause()
+    (all before the first solve()), then call solve().
+    """
+    def __init__(self, num_vars):
+        self.num_vars = num_vars
+        size = 2 * num_vars + 2
+        self.value = [0] * size
+        self.level = [0] * (num_vars + 1)
+        self.reason = [None] * (num_vars + 1)
+        self.phase = [True] * (num_vars + 1)   # try "cell holds v" first
+        self.activity = [0.0] * (num_vars + 1)
+        self.var_inc = 1.0
+        self.watches = [[] for _ in range(size)]   # long clauses watching lit
+        self.binary = [[] for _ in range(size)]    # (other, clause) for binary clauses with lit
+        self.clauses = []
+        self.learnts = []                          # [clause, lbd]
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.ok = True
+        self.heap = [(0.0, v) for v in range(1, num_vars + 1)]
+        self._seen = [False] * (num_vars + 1)
+        # statistics
+        self.decisions = 0
+        self.conflicts = 0
+        self.propagations = 0
+        self.restarts = 0
+        self.backjumps = 0
+        # optional callback(kind, *args) for step logging: ("decide", lit),
+        # ("conflict", level, learned size, backjump level), ("restart",)
+        self.on_event = None
+
+    # -- building ---------------------------------------------------------
+
+    def add_clause(self, literals):
+        """Add a clause of DIMACS literals. Returns False once the formula is known unsatisfiable."""
+        if not self.ok:
+            return False
+        clause = []
+        for x in literals:
+            lit = _lit(x)
+            if lit ^ 1 in clause:
+                return True                 # tautology
+            if lit not in clause and self.value[lit] != -1:
+                if self.value[lit] == 1:
+                    return True             # already satisfied at level 0
+                clause.append(lit)
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self._enqueue(clause[0], None)
+            self.ok = self._propagate() is None
+        else:
+            self._attach(clause)
+            self.clauses.append(clause)
+        return self.ok
+
+    def _attach(self, clause):
+        if len(clause) == 2:
+            a, b = clause
+            self.binary[a].append((b, clause))
+            self.binary[b].append((a, clause))
+        else:
+            self.watches[clause[0]].append(clause)
+            self.watches[clause[1]].append(clause)
+
+    # -- search -----------------------------------------------------------
+
+    def _enqueue(self, lit, reason):
+        value = self.value
+        value[lit] = 1
+        value[lit ^ 1] = -1
+        var = lit >> 1
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+
+    def _propagate(self):
+        """Unit propagation from qhead. Returns a conflicting clause or None."""
+        value = self.value
+        level = self.level
+        reason = self.reason
+        trail = self.trail
+        watches = self.watches
+        binary = self.binary
+        dl = len(self.trail_lim)
+        qhead = self.qhead
+        conflict = None
+        while qhead < len(trail):
+            false_lit = trail[qhead] ^ 1
+            qhead += 1
+            for other, clause in binary[false_lit]:
+                v = value[other]
+                if v == 1:
+                    continue
+                if v == -1:
+                    conflict = clause
+                    break
+                value[other] = 1
+                value[other ^ 1] = -1
+                level[other >> 1] = dl
+                reason[other >> 1] = clause
+                trail.append(other)
+            if conflict is not None:
+                break
+
+            watching = watches[false_lit]
+            keep = []
+            i = 0
+            n = len(watching)
+            while i < n:
+                clause = watching[i]
+                i += 1
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+                first = clause[0]
+                if value[first] == 1:
+                    keep.append(clause)
+                    continue
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    if value[lit] != -1:
+                        clause[1] = lit
+                        clause[k] = false_lit
+                        watches[lit].append(clause)
+                        break
+                else:
+                    keep.append(clause)
+                    if value[first] == -1:
+                        conflict = clause
+                        keep.extend(watching[i:])
+                        break
+                    value[first] = 1
+                    value[first ^ 1] = -1
+                    level[first >> 1] = dl
+                    reason[first >> 1] = clause
+                    trail.append(first)
+            watches[false_lit] = keep
+            if conflict is not None:
+                break
+        self.propagations += qhead - self.qhead
+        self.qhead = len(trail) if conflict is not None else qhead
+        return conflict
+
+    def _bump(self, var):
+        activity = self.activity
+        activity[var] += self.var_inc
+        if activity[var] > 1e100:
+            for v in range(1, self.num_vars + 1):
+                activity[v] *= 1e-100
+            self.var_inc *= 1e-100
+            self._rebuild_heap()
+
+    def _rebuild_heap(self):
+        value = self.value
+        activity = self.activity
+        self.heap = [(-activity[v], v) for v in range(1, self.num_vars + 1) if not value[2 * v]]
+        heapq.heapify(self.heap)
+
+    def _analyze(self, conflict):
+        """First-UIP learned clause (asserting literal first) and its backjump level."""
+        seen = self._seen
+        level = self.level
+        reason = self.reason
+        trail = self.trail
+        dl = len(self.trail_lim)
+        learnt = [0]
+        pending = 0
+        index = len(trail) - 1
+        lit = -1
+        clause = conflict
+        while True:
+            for q in clause:
+                var = q >> 1
+                if q == lit or seen[var] or level[var] == 0:
+                    continue
+                seen[var] = True
+                self._bump(var)
+                if level[var] >= dl:
+                    pending += 1
+                else:
+                    learnt.append(q)
+            while not seen[trail[index] >> 1]:
+                index -= 1
+            lit = trail[index]
+            index -= 1
+            seen[lit >> 1] = False
+            pending -= 1
+            if pending == 0:
+                break
+            clause = reason[lit >> 1]
+        learnt[0] = lit ^ 1
+
+        # minimization: drop literals implied by the rest of the clause
+        kept = [learnt[0]]
+        for q in learnt[1:]:
+            r = reason[q >> 1]
+            if r is None or any(not seen[x >> 1] and level[x >> 1] > 0
+                                for x in r if x >> 1 != q >> 1):
+                kept.append(q)
+        for q in learnt[1:]:
+            seen[q >> 1] = False
+
+        if len(kept) == 1:
+            return kept, 0
+        # watch the literal of the highest remaining level second
+        best = max(range(1, len(kept)), key=lambda k: level[kept[k] >> 1])
+        kept[1], kept[best] = kept[best], kept[1]
+        return kept, level[kept[1] >> 1]
+
+    def _cancel_until(self, target):
+        if len(self.trail_lim) <= target:
+            return
+        value = self.value
+        phase = self.phase
+        reason = self.reason
+        heap = self.heap
+        activity = self.activity
+        trail = self.trail
+        start = self.trail_lim[target]
+        for k in range(len(trail) - 1, start - 1, -1):
+            lit = trail[k]
+            var = lit >> 1
+            value[lit] = value[lit ^ 1] = 0
+            reason[var] = None
+            phase[var] = not lit & 1
+            heapq.heappush(heap, (-activity[var], var))
+        del trail[start:]
+        del self.trail_lim[target:]
+        self.qhead = len(trail)
+        if len(heap) > 4 * self.num_vars:
+            self._rebuild_heap()
+
+    def _decide(self):
+        value = self.value
+        heap = self.heap
+        while heap:
+            var = heapq.heappop(heap)[1]
+            if not value[2 * var]:
+                return 2 * var if self.phase[var] else 2 * var + 1
+        return None
+
+    def _reduce_learnts(self, limit):
+        """At level 0: keep glue clauses and the lower-LBD half of the rest, then rewatch."""
+        glue = [entry for entry in self.learnts if entry[1] <= GLUE_KEEP]
+        rest = sorted((entry for entry in self.learnts if entry[1] > GLUE_KEEP),
+                      key=lambda entry: entry[1])
+        self.learnts = glue + rest[:max(0, limit // 2 - len(glue))]
+        self.watches = [[] for _ in range(len(self.value))]
+        for clause in self.clauses:
+            if len(clause) > 2:
+                self._attach(clause)
+        for clause, _ in self.learnts:
+            self._attach(clause)
+
+    def solve(self, deadline=None):
+        """
+        Returns True (model in value / model()), False (unsatisfiable).
+        Raises CDCLTimeout when time.perf_counter() passes deadline.
+        """
+        if not self.ok:
+            return False
+        if self._propagate() is not None:
+            self.ok = False
+            return False
+        level = self.level
+        event = self.on_event
+        run = 1
+        budget = RESTART_UNIT * luby(run)
+        max_learnts = max(2000, len(self.clauses) // 3)
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                budget -= 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+                if deadline is not None and self.conflicts % 256 == 0 \
+                        and time.perf_counter() > deadline:
+                    raise CDCLTimeout()
+                learnt, back = self._analyze(conflict)
+                if back < len(self.trail_lim) - 1:
+                    self.backjumps += 1
+                if event is not None:
+                    event("conflict", len(self.trail_lim), len(learnt), back)
+                self._cancel_until(back)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    self._attach(learnt)
+                    if len(learnt) > 2:
+                        self.learnts.append([learnt, len({level[q >> 1] for q in learnt})])
+                    self._enqueue(learnt[0], learnt)
+                self.var_inc /= VAR_DECAY
+                continue
+
+            if budget <= 0:
+                self.restarts += 1
+                run += 1
+                budget = RESTART_UNIT * luby(run)
+                if event is not None:
+                    event("restart")
+                self._cancel_until(0)
+                if len(self.learnts) > max_learnts:
+                    self._reduce_learnts(max_learnts)
+                    max_learnts = int(max_learnts * 1.1)
+                continue
+
+            lit = self._decide()
+            if lit is None:
+                return True
+            self.decisions += 1
+            if event is not None:
+                event("decide", lit)
+            self.trail_lim.append(len(self.trail))
+            self._enqueue(lit, None)
+
+    def model(self):
+        """Variables assigned true, as a set of positive DIMACS variables."""
+        return {v for v in range(1, self.num_vars + 1) if self.value[2 * v] == 1}
+
+    def true_literals(self):
+        """True variables in the order they were assigned (trail order)."""
+        return [lit >> 1 for lit in self.trail if not lit & 1]
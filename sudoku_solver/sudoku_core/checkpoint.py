@@ -0,0 +1,148 @@
+# sudoku_core/checkpoint.py
+"""
+Search checkpoints
+------------------
+Compact binary snapshot of a paused chronological search (CSPSolver), from
+which CSPSolver.resume() continues in another process exactly where the
+search stopped:
+
+    header  : magic "SDKC", version u8, option flags u8, frame count u16
+    counters: assignments, backtracks, gac prunes, gac revisions,
+              step counter (u64 each), elapsed seconds (f64)
+    board   : 81 bytes (givens + current assignments)
+    domains : 81 x u16 bitmask (bit v set <=> v allowed)
+    weights : 27 x u32 dom/wdeg unit weights (only with FLAG_WDEG)
+    origin  : puzzle index u32, source length u16, source (UTF-8)
+              (only with FLAG_ORIGIN)
+    frames  : per choice point, outermost first:
+              cell u8, value u8, depth u8, old domain u16,
+              remaining count u8, inference count u8,
+              remaining values (u8 each, in the order they will be tried),
+              inferences (cell u8, removed mask u16 each)
+
+A frame's inferences are the values its assignment removed from other
+cells. Backtracking needs them to restore the domains. The LCV counters and
+the assigned set are derived from the domains and the board, so they are
+rebuilt on load. Files are written to a temporary name and then renamed, so
+a crash while writing never leaves a truncated checkpoint behind.
+"""
+
+import os
+import struct
+from array import array
+
+MAGIC = b"SDKC"
+VERSION = 1
+HEADER = struct.Struct("<4sBBH")
+COUNTERS = struct.Struct("<QQQQQd")
+ORIGIN = struct.Struct("<IH")
+FRAME = struct.Struct("<BBBHBB")
+INFERENCE = struct.Struct("<BH")
+
+FLAG_MRV = 1
+FLAG_LCV = 2
+FLAG_FC = 4
+FLAG_AC3 = 8
+FLAG_GAC = 16
+FLAG_WDEG = 32
+FLAG_LOG = 64
+FLAG_ORIGIN = 128
+
+
+def _mask(values):
+    return sum(1 << v for v in values)
+
+
+def _values(mask):
+    return {v for v in range(1, 10) if mask >> v & 1}
+
+
+def save(path, state):
+    """
+    Write state (dict with flags, counters, grid, domains, weights, origin,
+    frames; see load()) to path atomically. FLAG_ORIGIN is set from origin.
+    """
+    frames = state["frames"]
+    origin = state.get("origin")
+    flags = state["flags"] & ~FLAG_ORIGIN | (FLAG_ORIGIN if origin is not None else 0)
+    parts = [HEADER.pack(MAGIC, VERSION, flags, len(frames)),
+             COUNTERS.pack(*state["counters"]),
+             bytes(state["grid"]),
+             array("H", (_mask(d) for d in state["domains"])).tobytes()]
+    if state["flags"] & FLAG_WDEG:
+        parts.append(array("I", state["weights"]).tobytes())
+    if origin is not None:
+        source = origin[1].encode("utf-8")
+        parts.append(ORIGIN.pack(origin[0], len(source)))
+        parts.append(source)
+    for cell, value, depth, old_domain, remaining, inferences in frames:
+        parts.append(FRAME.pack(cell, value, depth, _mask(old_domain),
+                                len(remaining), len(inferences)))
+        parts.append(bytes(remaining))
+        parts.extend(INFERENCE.pack(n, _mask(removed)) for n, removed in inferences)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"".join(parts))
+    os.replace(tmp, path)
+
+
+def load(path):
+    """
+    Read a checkpoint. Returns a dict:
+        flags    : option bits (FLAG_*)
+        counters : (assignments, backtracks, gac_prunes, gac_revisions, step_counter, elapsed)
+        grid     : 81 values
+        domains  : 81 sets of values (cells in row-major order)
+        weights  : 27 unit weights, or None
+        origin   : (puzzle index, source) of the searched puzzle, or None
+        frames   : [(cell, value, depth, old domain set, remaining values, [(cell, removed set)])]
+    Raises ValueError for a file that is not a checkpoint.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < HEADER.size or data[:4] != MAGIC:
+        raise ValueError(f"{path} is not a search checkpoint")
+    _, version, flags, count = HEADER.unpack_from(data, 0)
+    if version != VERSION:
+        raise ValueError(f"Unsupported checkpoint version {version}")
+    pos = HEADER.size
+    weights = None
+    origin = None
+    frames = []
+    try:
+        counters = COUNTERS.unpack_from(data, pos)
+        pos += COUNTERS.size
+        grid = list(data[pos:pos + 81])
+        pos += 81
+        masks = array("H")
+        masks.frombytes(data[pos:pos + 162])
+        pos += 162
+        if flags & FLAG_WDEG:
+            weights = array("I")
+            weights.frombytes(data[pos:pos + 4 * 27])
+            pos += 4 * 27
+        if flags & FLAG_ORIGIN:
+            index, size = ORIGIN.unpack_from(data, pos)
+            pos += ORIGIN.size
+            if pos + size > len(data):
+                raise ValueError("origin past the end of the file")
+            origin = (index, data[pos:pos + size].decode("utf-8"))
+            pos += size
+        for _ in range(count):
+            cell, value, depth, old_mask, n_remaining, n_inferences = FRAME.unpack_from(data, pos)
+            pos += FRAME.size
+            remaining = list(data[pos:pos + n_remaining])
+            pos += n_remaining
+            inferences = []
+            for _ in range(n_inferences):
+                n, removed = INFERENCE.unpack_from(data, pos)
+                pos += INFERENCE.size
+                inferences.append((n, _values(removed)))
+            frames.append((cell, value, depth, _values(old_mask), remaining, inferences))
+    except (struct.error, ValueError):
+        pos = -1
+    if pos != len(data):
+        raise ValueError(f"{path} is truncated or corrupt")
+    return {"flags": flags, "counters": counters, "grid": grid,
+            "domains": [_values(m) for m in masks], "weights": weights, "origin": origin,
+            "frames": frames}
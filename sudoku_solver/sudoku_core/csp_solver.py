@@ -1,6 +1,20 @@
 # sudoku_core/csp_solver.py
-from .heuristics import select_unassigned_variable, order_domain_values, NEIGHBORS
+from .heuristics import (select_unassigned_variable, order_domain_values, NEIGHBORS, ValueSupport,
+                         UnitWeights)
 from .inference import forward_checking, restore_inferences, ac3
+from .alldiff import AllDifferent
+from .board import SudokuBoard
+from .validator import valid_boards
+from .nogoods import NogoodTable
+from .restarts import restart_limits
+from .estimator import DEFAULT_PROBES, estimate_tree_size
+from .kernel import HAVE_NUMBA, SOLVED, solve_grid
+from . import checkpoint as cp
+from . import trace as tr
+from utils.timer import REGISTRY as TIMINGS
+from array import array
+import numpy as np
+import random
 import time
 
 # Try to import a project Metrics, else provide a simple fallback
@@ -9,8 +23,15 @@ try:
 except Exception:
     class Metrics:
         def __init__(self):
+            self.reset()
+        def reset(self):
             self.assignments = 0
             self.backtracks = 0
+            self.backjumps = 0
+            self.nogood_prunes = 0
+            self.restarts = 0
+            self.gac_prunes = 0
+            self.gac_revisions = 0
             self.start_time = None
             self.end_time = None
         def start(self):
@@ -28,44 +49,231 @@ except Exception:
                 "time": (self.end_time - self.start_time) if self.start_time and self.end_time else None
             }
 
+_CELLS = [(r, c) for r in range(9) for c in range(9)]
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the solver's time limit has passed."""
+
+
+class SearchRestart(Exception):
+    """Raised inside the search when the current run has used up its node limit."""
+
+
+class SearchPaused(Exception):
+    """Raised at a clean point of the search after request_pause()."""
+
+
 class CSPSolver:
-    def __init__(self, board, use_mrv=True, use_lcv=True, use_fc=True, use_ac3=False):
+    __slots__ = ("board", "use_mrv", "use_lcv", "use_fc", "use_ac3", "log_steps", "engine",
+                 "time_limit", "trace", "status", "metrics", "domains", "assigned", "support",
+                 "step_log", "_step_counter", "_deadline", "use_cbj", "nogoods", "_pruned_by",
+                 "restarts", "restart_base", "keep_learned", "seed", "_rng", "_restart_at",
+                 "alldiff", "weights", "checkpoint", "checkpoint_interval", "_stack",
+                 "_checkpoint_due", "_pause_requested", "_next_checkpoint", "_elapsed",
+                 "on_progress", "origin")
+
+    def __init__(self, board, use_mrv=True, use_lcv=True, use_fc=True, use_ac3=False,
+                 log_steps=True, engine="python", time_limit=None, trace=None, domains=None,
+                 use_cbj=False, nogood_capacity=4096, nogood_size=4, restarts=None,
+                 restart_base=1000, keep_learned=True, seed=None, use_gac=False,
+                 use_wdeg=False, checkpoint=None, checkpoint_interval=None, on_progress=None):
         """
         board: SudokuBoard instance
         Options:
             use_mrv, use_lcv: heuristics
             use_fc: forward checking (during search)
             use_ac3: run AC-3 once at initialization
+            log_steps: record human-readable steps in step_log (turn off for batch runs)
+            engine: "python" for the search below, or "numba" for the compiled
+                    bitmask kernel (MRV + FC, no step log). Falls back to
+                    "python" when Numba is not installed.
+            time_limit: give up after this many seconds (Python engine only;
+                        the compiled kernel always runs to completion)
+            trace: optional sudoku_core.trace.TraceRecorder that receives every
+                   search event as a fixed-size binary record (Python engine)
+            domains: optional warm-start domains for board (see reset())
+            use_cbj: conflict-directed backjumping (Python engine). Failures are
+                     explained by conflict sets and the search jumps straight
+                     back to the most recent culprit decision.
+            nogood_capacity, nogood_size: with use_cbj, learned nogoods of at
+                     most nogood_size assignments are kept in an LRU table of
+                     nogood_capacity entries (0 disables learning)
+            restarts: None, "luby" or "geometric" (Python engine). Ties in
+                     variable and value ordering are broken at random and the
+                     search restarts from the initial domains whenever a run
+                     exceeds its node limit: restart_base assignments scaled
+                     by the schedule (see sudoku_core.restarts).
+            keep_learned: with restarts and use_cbj, keep the learned nogoods
+                     from one run to the next instead of starting empty
+            seed: seed of the tie-breaking random generator (re-seeded by reset())
+            use_gac: all-different propagation on whole rows, columns and boxes
+                     (sudoku_core.alldiff) at initialization and after every
+                     assignment (Python engine, chronological search only).
+                     Pruning counts end up in metrics.gac_prunes/gac_revisions.
+            use_wdeg: dom/wdeg variable ordering instead of MRV. Every domain
+                     wipe-out adds weight to the unit it happened in (see
+                     heuristics.UnitWeights); the weights persist through
+                     backtracking and restarts and are cleared by reset().
+            checkpoint: path the search state is saved to (sudoku_core.checkpoint)
+                     on request_checkpoint(), request_pause() and every
+                     checkpoint_interval seconds; CSPSolver.resume() continues
+                     from it. Chronological Python search only (no use_cbj,
+                     restarts or numba engine).
+            on_progress: optional callable(solver), called every 256
+                     assignments of the Python search (e.g. to report
+                     sudoku_core.estimator.progress() against estimate())
+
+        After solve(), status is one of "solved", "unsolvable", "invalid",
+        "timeout" or "paused". A timed-out solver must be reset() before it is
+        reused; calling solve() on a paused one continues the search.
         """
-        self.board = board
+        if engine not in ("python", "numba"):
+            raise ValueError(f"Unknown engine: {engine}")
+        if use_gac and use_cbj:
+            raise ValueError("use_gac cannot be combined with use_cbj")
+        if (checkpoint is not None or checkpoint_interval is not None) and \
+                (use_cbj or restarts is not None or engine != "python"):
+            raise ValueError("checkpoints need the chronological Python search "
+                             "(no use_cbj, restarts or numba engine)")
+        if checkpoint_interval is not None and checkpoint is None:
+            raise ValueError("checkpoint_interval needs a checkpoint path")
         self.use_mrv = use_mrv
         self.use_lcv = use_lcv
         self.use_fc = use_fc
         self.use_ac3 = use_ac3
+        self.log_steps = log_steps
+        self.engine = engine
+        self.time_limit = time_limit
+        self.trace = trace
+        self.use_cbj = use_cbj
+        if restarts is not None:
+            restart_limits(restarts, restart_base)  # validates the schedule
+        self.restarts = restarts
+        self.restart_base = restart_base
+        self.keep_learned = keep_learned
+        self.seed = seed
+        self.checkpoint = checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        self.on_progress = on_progress
 
+        # containers are allocated once and reused by reset()
         self.metrics = Metrics()
         self.domains = {}   # (r,c) -> set of possible values
         self.assigned = set()
-        self.step_log = []  
-        self._step_counter = 0  
-        self._init_domains()
+        self.step_log = []
+        self.support = ValueSupport() if self.use_lcv else None
+        self.nogoods = NogoodTable(nogood_capacity, nogood_size) if use_cbj else None
+        self._pruned_by = {cell: [] for cell in _CELLS}
+        self.alldiff = AllDifferent() if use_gac else None
+        self.weights = UnitWeights() if use_wdeg else None
+        self._stack = []
+        self.reset(board, domains)
+
+    def reset(self, board, domains=None):
+        """
+        Prepare the solver for a new board, reusing the already allocated state
+        (domain dict, assigned set, step log, metrics and LCV counters).
+        domains: (r, c) -> values already propagated for this board (e.g. from
+                 sudoku_core.candidates.CandidateEngine.domains()); they are
+                 used as-is instead of being rebuilt from the grid.
+        """
+        self.board = board
+        self.status = None
+        self._deadline = None
+        self._restart_at = None
+        self._rng = random.Random(self.seed) if self.restarts is not None else None
+        self._stack.clear()
+        self._checkpoint_due = False
+        self._pause_requested = False
+        self._next_checkpoint = None
+        self._elapsed = 0.0
+        self.origin = None
+        self.metrics.reset()
+        self.assigned.clear()
+        self.step_log.clear()
+        self._step_counter = 0
+        if self.nogoods is not None:
+            self.nogoods.clear()
+        for pruned in self._pruned_by.values():
+            pruned.clear()
+        if self.weights is not None:
+            self.weights.reset()
+        start = time.perf_counter_ns()
+        if domains is None:
+            self._init_domains()
+        else:
+            self._warm_domains(domains)
 
         if self.use_ac3:
             ac3(self.domains)
+        if self.alldiff is not None:
+            self.alldiff.reset_counters()
+            self.alldiff.propagate(self.domains, _CELLS)
+
+        # LCV support counters, built after AC-3 so they match the final domains
+        if self.support is not None:
+            self.support.rebuild(self.domains)
+        TIMINGS.record("propagate", time.perf_counter_ns() - start)
+
+    def __getstate__(self):
+        """
+        Compact pickled form: option flags, the grid as 81 bytes and the
+        domains as 81 bitmasks. Derived state (assigned set, LCV counters)
+        is rebuilt on load.
+        """
+        masks = array("H", (sum(1 << v for v in self.domains[cell]) for cell in _CELLS))
+        options = (self.use_mrv, self.use_lcv, self.use_fc, self.use_ac3, self.log_steps,
+                   self.engine, self.time_limit, self.use_cbj,
+                   None if self.nogoods is None else (self.nogoods.capacity, self.nogoods.max_size),
+                   self.restarts, self.restart_base, self.keep_learned, self.seed,
+                   self.alldiff is not None, self.weights is not None)
+        grid = self.board.grid.astype(np.uint8).tobytes()
+        return (options, grid, masks.tobytes(), self.metrics, self.status,
+                self._step_counter, self.step_log)
+
+    def __setstate__(self, state):
+        options, grid, masks, metrics, status, step_counter, step_log = state
+        (self.use_mrv, self.use_lcv, self.use_fc, self.use_ac3, self.log_steps,
+         self.engine, self.time_limit, self.use_cbj, nogood_options,
+         self.restarts, self.restart_base, self.keep_learned, self.seed, use_gac,
+         use_wdeg) = options
+        self.alldiff = AllDifferent() if use_gac else None
+        self.weights = UnitWeights() if use_wdeg else None
+        # learned nogoods are not pickled; a restored solver starts with an empty table
+        self.nogoods = NogoodTable(*nogood_options) if nogood_options is not None else None
+        self._pruned_by = {cell: [] for cell in _CELLS}
+        self.status = status
+        self._deadline = None
+        self._restart_at = None
+        self._rng = random.Random(self.seed) if self.restarts is not None else None
+        self.trace = None
+        # a paused search is not pickled (see save_checkpoint())
+        self.checkpoint = None
+        self.checkpoint_interval = None
+        self.on_progress = None
+        self._stack = []
+        self._checkpoint_due = False
+        self._pause_requested = False
+        self._next_checkpoint = None
+        self._elapsed = 0.0
+        self.origin = None
+        self.board = SudokuBoard(np.frombuffer(grid, dtype=np.uint8).reshape(9, 9))
+        self.metrics = metrics
+        self._step_counter = step_counter
+        self.step_log = step_log
+
+        bits = array("H")
+        bits.frombytes(masks)
+        self.domains = {}
+        for cell, mask in zip(_CELLS, bits):
+            self.domains[cell] = {v for v in range(1, 10) if mask >> v & 1}
+        self.assigned = {cell for cell in _CELLS if self.board.grid[cell] != 0}
+        self.support = ValueSupport(self.domains) if self.use_lcv else None
 
     def _is_initial_board_valid(self):
         """Check whether current board violates Sudoku constraints."""
-        grid = self.board.grid
-        for r in range(9):
-            for c in range(9):
-                val = grid[r, c]
-                if val != 0:
-                    grid[r, c] = 0
-                    if not self.board.is_valid(r, c, val):
-                        grid[r, c] = val  
-                        return False
-                    grid[r, c] = val  
-        return True
+        return valid_boards(self.board.grid)
 
     def _init_domains(self):
         """Initialize domains from board state."""
@@ -85,6 +293,14 @@ class CSPSolver:
                             possible.discard(int(val))
                     self.domains[(r, c)] = possible
 
+    def _warm_domains(self, domains):
+        """Take over propagated domains (copied, the search mutates them)."""
+        grid = self.board.grid
+        for cell in _CELLS:
+            self.domains[cell] = set(domains[cell])
+            if grid[cell] != 0:
+                self.assigned.add(cell)
+
     def _assign(self, var, value):
         """Assign value to var on board and mark as assigned."""
         r, c = var
@@ -103,66 +319,521 @@ class CSPSolver:
         self.step_log.append(log_entry)
 
     def solve(self):
-        """Public entry point. Returns True if solved."""
+        """
+        Public entry point. Returns True if solved. On a paused solver (or
+        one built by resume()) the search continues where it stopped; time
+        and the time limit then count from the start of the first solve().
+        """
+        self.status = None
         self.metrics.start()
-        if not self._is_initial_board_valid():
+        self.metrics.start_time -= self._elapsed
+        start = time.perf_counter_ns()
+        valid = self._is_initial_board_valid()
+        search_start = time.perf_counter_ns()
+        TIMINGS.record("validate", search_start - start)
+        if not valid:
+            self.metrics.stop()
+            self.status = "invalid"
             return False
-        success = self._backtrack()
+        now = time.perf_counter()
+        if self.time_limit is not None:
+            self._deadline = now + self.time_limit - self._elapsed
+        if self.checkpoint_interval is not None:
+            self._next_checkpoint = now + self.checkpoint_interval
+        try:
+            if self.engine == "numba" and HAVE_NUMBA:
+                success = self._solve_kernel()
+            elif self.restarts is not None:
+                success = self._solve_with_restarts()
+            else:
+                success = self._search()
+        except SearchTimeout:
+            success = False
+            self.status = "timeout"
+        except SearchPaused:
+            success = False
+            self.status = "paused"
+        else:
+            self.status = "solved" if success else "unsolvable"
+        TIMINGS.record("solve.csp", time.perf_counter_ns() - search_start)
+        if self.alldiff is not None:
+            self.metrics.gac_prunes = self.alldiff.prunes
+            self.metrics.gac_revisions = self.alldiff.revisions
         self.metrics.stop()
+        self._elapsed = self.metrics.end_time - self.metrics.start_time \
+            if self.status == "paused" else 0.0
         return success
 
+    # -- checkpoints ---------------------------------------------------------
+
+    def request_checkpoint(self):
+        """Save a checkpoint at the next clean point of the search (safe from another thread)."""
+        if self.checkpoint is None:
+            raise ValueError("the solver has no checkpoint path")
+        self._checkpoint_due = True
+
+    def request_pause(self):
+        """
+        Stop the search at its next clean point (safe from another thread):
+        solve() returns False with status "paused", after saving a checkpoint
+        if the solver has a checkpoint path.
+        """
+        self._pause_requested = True
+        self._checkpoint_due = True
+
+    def _check_clock(self):
+        """
+        Every 256 assignments: enforce the time limit, schedule periodic
+        checkpoints and report progress.
+        """
+        now = time.perf_counter()
+        if self._deadline is not None and now > self._deadline:
+            raise SearchTimeout()
+        if self._next_checkpoint is not None and now >= self._next_checkpoint:
+            self._checkpoint_due = True
+        if self.on_progress is not None:
+            self.on_progress(self)
+
+    def estimate(self, probes=DEFAULT_PROBES, seed=None):
+        """
+        Knuth estimate (sudoku_core.estimator.TreeEstimate) of the number of
+        assignments a complete search from the current state needs, using
+        this solver's variable ordering and forward checking. Call it before
+        solve(); it does not change the solver.
+        """
+        return estimate_tree_size(self.domains, self.assigned, use_mrv=self.use_mrv,
+                                  use_fc=self.use_fc, probes=probes, seed=seed)
+
+    def _reach_clean_point(self):
+        """Called by _backtrack() between choice points, where the whole state is on _stack."""
+        self._checkpoint_due = False
+        if self.checkpoint is not None:
+            self.save_checkpoint(self.checkpoint)
+        if self.checkpoint_interval is not None:
+            self._next_checkpoint = time.perf_counter() + self.checkpoint_interval
+        if self._pause_requested:
+            self._pause_requested = False
+            raise SearchPaused()
+
+    def save_checkpoint(self, path):
+        """
+        Write the search state to path: board, domains, choice point stack,
+        counters and dom/wdeg weights, and origin, the (index, source) of the
+        puzzle if the caller set it after reset(). Call it on a paused solver
+        or before solve(); during the search use request_checkpoint().
+        """
+        flags = 0
+        for flag, on in ((cp.FLAG_MRV, self.use_mrv), (cp.FLAG_LCV, self.use_lcv),
+                         (cp.FLAG_FC, self.use_fc), (cp.FLAG_AC3, self.use_ac3),
+                         (cp.FLAG_GAC, self.alldiff is not None),
+                         (cp.FLAG_WDEG, self.weights is not None),
+                         (cp.FLAG_LOG, self.log_steps)):
+            if on:
+                flags |= flag
+        metrics = self.metrics
+        if self.status is None and metrics.start_time is not None:
+            elapsed = time.time() - metrics.start_time
+        else:
+            elapsed = self._elapsed
+        alldiff = self.alldiff
+        counters = (metrics.assignments, metrics.backtracks,
+                    alldiff.prunes if alldiff is not None else 0,
+                    alldiff.revisions if alldiff is not None else 0,
+                    self._step_counter, elapsed)
+        frames = [(9 * r + c, value, depth, old_domain, values[index:],
+                   [(9 * nr + nc, removed) for (nr, nc), removed in (inferences or {}).items()])
+                  for (r, c), values, index, value, old_domain, inferences, depth in self._stack]
+        cp.save(path, {
+            "flags": flags,
+            "counters": counters,
+            "grid": self.board.grid.reshape(81).tolist(),
+            "domains": [self.domains[cell] for cell in _CELLS],
+            "weights": self.weights.unit if self.weights is not None else None,
+            "origin": self.origin,
+            "frames": frames,
+        })
+
+    @classmethod
+    def resume(cls, path, log_steps=None, time_limit=None, trace=None, checkpoint=None,
+               checkpoint_interval=None):
+        """
+        Build a solver from a checkpoint written by save_checkpoint(), usually
+        in a new process. solve() then continues the search with the same
+        choices, counters and step numbers as an uninterrupted run would have.
+        log_steps defaults to the setting of the saved solver.
+        """
+        state = cp.load(path)
+        flags = state["flags"]
+        grid = np.array(state["grid"], dtype=int).reshape(9, 9)
+        solver = cls(SudokuBoard(grid), use_mrv=bool(flags & cp.FLAG_MRV),
+                     use_lcv=bool(flags & cp.FLAG_LCV), use_fc=bool(flags & cp.FLAG_FC),
+                     log_steps=bool(flags & cp.FLAG_LOG) if log_steps is None else log_steps,
+                     time_limit=time_limit, trace=trace,
+                     domains=dict(zip(_CELLS, state["domains"])),
+                     use_gac=bool(flags & cp.FLAG_GAC), use_wdeg=bool(flags & cp.FLAG_WDEG),
+                     checkpoint=checkpoint, checkpoint_interval=checkpoint_interval)
+        # the saved domains are already propagated; AC-3 must not run again
+        solver.use_ac3 = bool(flags & cp.FLAG_AC3)
+        solver.origin = state["origin"]
+        assignments, backtracks, gac_prunes, gac_revisions, step_counter, elapsed = state["counters"]
+        solver.metrics.assignments = assignments
+        solver.metrics.backtracks = backtracks
+        if solver.alldiff is not None:
+            solver.alldiff.prunes = gac_prunes
+            solver.alldiff.revisions = gac_revisions
+        if solver.weights is not None:
+            solver.weights.restore(state["weights"])
+        solver._step_counter = step_counter
+        solver._elapsed = elapsed
+        for cell, value, depth, old_domain, remaining, inferences in state["frames"]:
+            solver._stack.append([divmod(cell, 9), remaining, 0, value, old_domain,
+                                  {divmod(n, 9): removed for n, removed in inferences} or None,
+                                  depth])
+        solver.status = "paused"
+        return solver
+
+    def _weigh_wipeout(self, var, value):
+        """Forward checking of var=value failed: weigh the units of the wiped-out neighbors."""
+        for n in NEIGHBORS[var]:
+            if n not in self.assigned and self.domains[n] == {value}:
+                self.weights.bump_conflict(var, n)
+
+    def _search(self):
+        """One run of the Python search from the current state."""
+        if self.use_cbj:
+            return self._backjump() is True
+        return self._backtrack()
+
+    def _solve_with_restarts(self):
+        """
+        Repeat _search() under growing node limits. Before each new run the
+        board, domains and LCV counters are put back to their state at the
+        start of the solve; learned nogoods are kept if keep_learned.
+        """
+        domains = {cell: set(values) for cell, values in self.domains.items()}
+        grid = self.board.grid.copy()
+        assigned = set(self.assigned)
+        metrics = self.metrics
+        for limit in restart_limits(self.restarts, self.restart_base):
+            self._restart_at = metrics.assignments + limit
+            try:
+                return self._search()
+            except SearchRestart:
+                pass
+            finally:
+                self._restart_at = None
+            metrics.restarts += 1
+            if self.log_steps:
+                self._log_step(f"Restart {metrics.restarts} after {limit} assignments")
+            if self.trace is not None:
+                # undo the abandoned run on the replayed board as well
+                depth = len(assigned)
+                for cell in np.flatnonzero((grid == 0) & (self.board.grid != 0)).tolist():
+                    self.trace.record(tr.BACKTRACK, cell, int(self.board.grid.flat[cell]), depth)
+            self.board.grid[:, :] = grid
+            self._stack.clear()
+            self.assigned.clear()
+            self.assigned.update(assigned)
+            for cell, values in domains.items():
+                self.domains[cell] = set(values)
+            if self.support is not None:
+                self.support.rebuild(self.domains)
+            for pruned in self._pruned_by.values():
+                pruned.clear()
+            if self.nogoods is not None and not self.keep_learned:
+                self.nogoods.clear()
+
+    def _solve_kernel(self):
+        """Run the compiled bitmask kernel and copy its result back into the solver state."""
+        status, solution, assignments, backtracks = solve_grid(self.board.grid)
+        self.metrics.assignments += assignments
+        self.metrics.backtracks += backtracks
+        if status != SOLVED:
+            return False
+        self.board.grid[:, :] = solution
+        for r, c in _CELLS:
+            self.domains[(r, c)] = {int(solution[r, c])}
+        self.assigned.update(_CELLS)
+        return True
+
     def _backtrack(self):
-        # goal test
+        """
+        Chronological search. The choice points live on an explicit stack
+        (self._stack) instead of the Python call stack, so the search can be
+        saved between two choice points and continued later, also in another
+        process. A frame is [var, values, next, value, old_domain, inferences,
+        depth]: the cell, its values in the order they are tried and the index
+        of the next one, the value currently assigned with the domain it
+        replaced and the values its propagation removed elsewhere, and the
+        number of assigned cells when var was selected.
+        Starts from the top of a non-empty stack (a paused or resumed search).
+        """
+        stack = self._stack
+        log = self.log_steps
+        trace = self.trace
+        support = self.support
+        metrics = self.metrics
+        descend = True
+        while True:
+            if descend:
+                # a clean point: every frame holds a propagated assignment
+                if self._checkpoint_due:
+                    self._reach_clean_point()
+                # goal test
+                if len(self.assigned) == 81:
+                    return True
+
+                var = select_unassigned_variable(self.domains, self.assigned,
+                                                 use_mrv=self.use_mrv, use_degree=True,
+                                                 rng=self._rng, weights=self.weights)
+                r, c = var
+                depth = len(self.assigned)
+                if log:
+                    domain = sorted(self.domains[var])
+                    self._log_step(f"Select cell ({r},{c}), domain={domain}")
+                if trace is not None:
+                    trace.record(tr.SELECT, 9 * r + c, 0, depth,
+                                 sum(1 << v for v in self.domains[var]))
+                frame = [var, order_domain_values(var, self.domains, use_lcv=self.use_lcv,
+                                                  support=support, rng=self._rng),
+                         0, 0, None, None, depth]
+                stack.append(frame)
+            else:
+                # the subtree below the top frame failed
+                if not stack:
+                    return False
+                frame = stack[-1]
+                self._undo(frame)
+
+            var, values, index = frame[0], frame[1], frame[2]
+            depth = frame[6]
+            r, c = var
+            cell = 9 * r + c
+            descend = False
+            while index < len(values):
+                value = values[index]
+                index += 1
+                # check consistency quickly using board.is_valid
+                if not self.board.is_valid(r, c, value):
+                    if log:
+                        self._log_step(f"  Try ({r},{c})={value}: INVALID (constraint violation)")
+                    if trace is not None:
+                        trace.record(tr.INVALID, cell, value, depth)
+                    continue
+
+                if log:
+                    self._log_step(f"  Try ({r},{c})={value}: VALID")
+
+                # tentatively assign
+                self._assign(var, value)
+                metrics.record_assignment()
+                if metrics.assignments % 256 == 0:
+                    self._check_clock()
+                if self._restart_at is not None and metrics.assignments >= self._restart_at:
+                    raise SearchRestart()
+                if log:
+                    self._log_step(f"    Assigned ({r},{c})={value}")
+                if trace is not None:
+                    trace.record(tr.ASSIGN, cell, value, depth)
+
+                # maintain domains: remove value from var domain (store old)
+                old_domain_var = self.domains[var]
+                self.domains[var] = {value}
+                if support is not None:
+                    support.remove_values(var, old_domain_var - {value})
+
+                inferences = None
+                failure = False
+                if self.use_fc:
+                    inferences = forward_checking(self.domains, var, value, support)
+                    if inferences is None:
+                        failure = True
+                        if self.weights is not None:
+                            self._weigh_wipeout(var, value)
+                        if log:
+                            self._log_step(f"    Forward checking failed for ({r},{c})={value}")
+                        if trace is not None:
+                            trace.record(tr.FC_FAIL, cell, value, depth)
+                    else:
+                        if log:
+                            self._log_step(f"    Forward checking passed, eliminated some values")
+                        if trace is not None:
+                            trace.record(tr.FC_OK, cell, value, depth,
+                                         sum(len(vals) for vals in inferences.values()))
+
+                if not failure and self.alldiff is not None:
+                    pruned = self.alldiff.propagate(self.domains, [var, *(inferences or ())],
+                                                    support)
+                    if pruned is None:
+                        failure = True
+                        if self.weights is not None:
+                            self.weights.bump(self.alldiff.failed_unit)
+                        if log:
+                            self._log_step(
+                                f"    All-different propagation failed for ({r},{c})={value}")
+                        if trace is not None:
+                            trace.record(tr.FC_FAIL, cell, value, depth)
+                    elif inferences is None:
+                        inferences = pruned
+                    else:
+                        for n, removed in pruned.items():
+                            inferences.setdefault(n, set()).update(removed)
+
+                frame[3:6] = value, old_domain_var, inferences
+                if not failure:
+                    descend = True
+                    break
+                self._undo(frame)
+
+            frame[2] = index
+            if not descend:
+                # every value failed: return to the parent choice point
+                stack.pop()
+
+    def _undo(self, frame):
+        """Take back the assignment of a choice point and everything its propagation removed."""
+        var, _, _, value, old_domain_var, inferences, depth = frame
+        r, c = var
+        self.metrics.record_backtrack()
+        if self.log_steps:
+            self._log_step(f"  Backtrack from ({r},{c})={value}")
+        if self.trace is not None:
+            self.trace.record(tr.BACKTRACK, 9 * r + c, value, depth)
+
+        # restore domains
+        self.domains[var] = old_domain_var
+        if self.support is not None:
+            self.support.add_values(var, old_domain_var - {value})
+        if inferences:
+            restore_inferences(self.domains, inferences, self.support)
+        self._unassign(var)
+
+    def _backjump(self):
+        """
+        FC-CBJ search (Prosser 1993). Returns True when solved, otherwise the
+        conflict set of the failed subtree: the past decisions that together
+        explain the failure. A level whose variable is not in the returned set
+        cannot fix the failure, so it undoes its assignment and passes the set
+        straight up (a backjump) without trying its other values.
+
+        _pruned_by[cell] lists the decisions whose forward checking removed
+        values from cell; they explain why cell's domain is what it is.
+        """
         if len(self.assigned) == 81:
             return True
-        
+
         var = select_unassigned_variable(self.domains, self.assigned,
-                                         use_mrv=self.use_mrv, use_degree=True)
-        
+                                         use_mrv=self.use_mrv, use_degree=True, rng=self._rng,
+                                         weights=self.weights)
         r, c = var
-        domain = list(self.domains[var])
-        self._log_step(f"Select cell ({r},{c}), domain={domain}")
+        log = self.log_steps
+        trace = self.trace
+        grid = self.board.grid
+        pruned_by = self._pruned_by
+        nogoods = self.nogoods
+        if log:
+            self._log_step(f"Select cell ({r},{c}), domain={list(self.domains[var])}")
+        if trace is not None:
+            cell = 9 * r + c
+            depth = len(self.assigned)
+            trace.record(tr.SELECT, cell, 0, depth, sum(1 << v for v in self.domains[var]))
 
-        for value in order_domain_values(var, self.domains, use_lcv=self.use_lcv):
-            # check consistency quickly using board.is_valid
+        conflicts = set()
+        support = self.support
+        for value in order_domain_values(var, self.domains, use_lcv=self.use_lcv,
+                                         support=support, rng=self._rng):
             if not self.board.is_valid(r, c, value):
-                self._log_step(f"  Try ({r},{c})={value}: INVALID (constraint violation)")
+                # explained by the decisions that already hold value among var's peers
+                conflicts.update(n for n in NEIGHBORS[var] if grid[n] == value)
+                if log:
+                    self._log_step(f"  Try ({r},{c})={value}: INVALID (constraint violation)")
+                if trace is not None:
+                    trace.record(tr.INVALID, cell, value, depth)
                 continue
+            if nogoods is not None:
+                culprits = nogoods.conflict(var, value, grid)
+                if culprits is not None:
+                    conflicts.update(culprits)
+                    self.metrics.nogood_prunes += 1
+                    if log:
+                        self._log_step(f"  Try ({r},{c})={value}: INVALID (learned nogood)")
+                    if trace is not None:
+                        trace.record(tr.INVALID, cell, value, depth)
+                    continue
 
-            self._log_step(f"  Try ({r},{c})={value}: VALID")
-            
-            # tentatively assign
             self._assign(var, value)
             self.metrics.record_assignment()
-            self._log_step(f"    Assigned ({r},{c})={value}")
+            if self.metrics.assignments % 256 == 0:
+                self._check_clock()
+            if self._restart_at is not None and self.metrics.assignments >= self._restart_at:
+                raise SearchRestart()
+            if log:
+                self._log_step(f"    Assigned ({r},{c})={value}")
+            if trace is not None:
+                trace.record(tr.ASSIGN, cell, value, depth)
 
-            # maintain domains: remove value from var domain (store old)
             old_domain_var = self.domains[var]
             self.domains[var] = {value}
+            if support is not None:
+                support.remove_values(var, old_domain_var - {value})
 
             inferences = None
-            failure = False
+            result = None
             if self.use_fc:
-                inferences = forward_checking(self.domains, var, value)
+                inferences = forward_checking(self.domains, var, value, support)
                 if inferences is None:
-                    failure = True
-                    self._log_step(f"    Forward checking failed for ({r},{c})={value}")
+                    if self.weights is not None:
+                        self._weigh_wipeout(var, value)
+                    # every neighbor left with only this value would be wiped out;
+                    # the decisions that pruned it share the blame
+                    for n in NEIGHBORS[var]:
+                        if n not in self.assigned and self.domains[n] == {value}:
+                            conflicts.update(pruned_by[n])
+                    if log:
+                        self._log_step(f"    Forward checking failed for ({r},{c})={value}")
+                    if trace is not None:
+                        trace.record(tr.FC_FAIL, cell, value, depth)
                 else:
-                    self._log_step(f"    Forward checking passed, eliminated some values")
+                    if log:
+                        self._log_step(f"    Forward checking passed, eliminated some values")
+                    if trace is not None:
+                        trace.record(tr.FC_OK, cell, value, depth,
+                                     sum(len(vals) for vals in inferences.values()))
+                    for n in inferences:
+                        pruned_by[n].append(var)
 
-            if not failure:
-                result = self._backtrack()
-                if result:
+            if inferences is not None or not self.use_fc:
+                result = self._backjump()
+                if result is True:
                     return True
+                if inferences:
+                    for n in inferences:
+                        pruned_by[n].pop()
 
             # undo
             self.metrics.record_backtrack()
-            self._log_step(f"  Backtrack from ({r},{c})={value}")
-            
-            # restore domains
+            if log:
+                self._log_step(f"  Backtrack from ({r},{c})={value}")
+            if trace is not None:
+                trace.record(tr.BACKTRACK, cell, value, depth)
             self.domains[var] = old_domain_var
+            if support is not None:
+                support.add_values(var, old_domain_var - {value})
             if inferences:
-                restore_inferences(self.domains, inferences)
+                restore_inferences(self.domains, inferences, support)
             self._unassign(var)
 
-        return False
+            if result is not None:
+                if var not in result:
+                    # this decision played no part in the failure below: jump over it
+                    self.metrics.backjumps += 1
+                    return result
+                conflicts.update(result)
+                conflicts.discard(var)
+
+        # every value failed: blame the collected conflicts and whoever pruned var
+        conflicts.update(pruned_by[var])
+        conflicts.discard(var)
+        if nogoods is not None:
+            nogoods.add((n, int(grid[n])) for n in conflicts)
+        return conflicts
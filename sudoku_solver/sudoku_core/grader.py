@@ -0,0 +1,280 @@
+# sudoku_core/grader.py
+"""
+Difficulty grader
+-----------------
+Grades a puzzle by the human solving techniques it needs, instead of by how
+much backtracking the solver happened to do.
+
+Candidates are kept as one bitmask per cell (bit v set <=> v still possible,
+as in kernel.py). The techniques are tried cheapest first, and after every
+successful step grading starts again from the cheapest one:
+
+    1 naked single       5 hidden pair
+    2 hidden single      6 naked triple
+    3 locked candidates  7 hidden triple
+    4 naked pair         8 x-wing
+
+The grade is the hardest technique that was needed. A puzzle these
+techniques cannot finish "requires search". Grading is pure Python with no
+search, so large files are graded in a process pool (see `cli.py grade`).
+"""
+
+from itertools import combinations
+
+from .kernel import FULL_MASK
+
+ROWS = [[9 * r + c for c in range(9)] for r in range(9)]
+COLS = [[9 * r + c for r in range(9)] for c in range(9)]
+BOXES = [[9 * (3 * (b // 3) + i // 3) + 3 * (b % 3) + i % 3 for i in range(9)]
+         for b in range(9)]
+UNITS = ROWS + COLS + BOXES
+PEERS = [sorted({p for unit in UNITS if i in unit for p in unit} - {i}) for i in range(81)]
+BITS = [1 << v for v in range(10)]
+POPCOUNT = [bin(m).count("1") for m in range(1024)]
+
+REQUIRES_SEARCH = "requires search"
+INVALID = "invalid"
+
+# grade name -> tier used to sort puzzles (level 0 = nothing to do)
+TIERS = {
+    "naked single": "easy",
+    "hidden single": "easy",
+    "locked candidates": "medium",
+    "naked pair": "hard",
+    "hidden pair": "hard",
+    "naked triple": "hard",
+    "hidden triple": "hard",
+    "x-wing": "expert",
+    REQUIRES_SEARCH: "extreme",
+    INVALID: "invalid",
+}
+
+
+class Contradiction(Exception):
+    """The candidate grid has no solution (an empty cell or digit has no place left)."""
+
+
+class CandidateGrid:
+    """81 values plus 81 candidate bitmasks, with the elimination primitives techniques use."""
+    __slots__ = ("values", "cand")
+
+    def __init__(self, cells):
+        self.values = [0] * 81
+        self.cand = [FULL_MASK] * 81
+        for i, v in enumerate(cells):
+            if v:
+                if not self.cand[i] & BITS[v]:
+                    raise Contradiction(f"given {v} at cell {i} clashes with a peer")
+                self.place(i, v)
+
+    def place(self, i, v):
+        self.values[i] = v
+        self.cand[i] = 0
+        bit = ~BITS[v]
+        cand = self.cand
+        for p in PEERS[i]:
+            cand[p] &= bit
+
+    def eliminate(self, cells, mask):
+        """Remove mask from the given cells; returns True if anything changed."""
+        changed = False
+        cand = self.cand
+        for i in cells:
+            if cand[i] & mask:
+                cand[i] &= ~mask
+                if cand[i] == 0:
+                    raise Contradiction(f"cell {i} has no candidates left")
+                changed = True
+        return changed
+
+    def solved(self):
+        return 0 not in self.values
+
+
+def _digits(mask):
+    return [v for v in range(1, 10) if mask & BITS[v]]
+
+
+# --- techniques: each returns True if it placed or eliminated something ---
+
+def naked_single(g):
+    for i in range(81):
+        m = g.cand[i]
+        if m and POPCOUNT[m] == 1:
+            g.place(i, m.bit_length() - 1)
+            return True
+    return False
+
+
+def hidden_single(g):
+    cand = g.cand
+    for unit in UNITS:
+        seen_once = seen_twice = 0
+        for i in unit:
+            seen_twice |= seen_once & cand[i]
+            seen_once |= cand[i]
+        once = seen_once & ~seen_twice
+        if once:
+            v = (once & -once).bit_length() - 1
+            for i in unit:
+                if cand[i] & BITS[v]:
+                    g.place(i, v)
+                    return True
+    return False
+
+
+def locked_candidates(g):
+    cand = g.cand
+    for box in BOXES:
+        for v in range(1, 10):
+            cells = [i for i in box if cand[i] & BITS[v]]
+            if len(cells) < 2:
+                continue
+            # pointing: all of the box's v in one row or column
+            for lines, key in ((ROWS, lambda i: i // 9), (COLS, lambda i: i % 9)):
+                if len({key(i) for i in cells}) == 1:
+                    others = [i for i in lines[key(cells[0])] if i not in box]
+                    if g.eliminate(others, BITS[v]):
+                        return True
+    for line in ROWS + COLS:
+        for v in range(1, 10):
+            cells = [i for i in line if cand[i] & BITS[v]]
+            if len(cells) < 2:
+                continue
+            # claiming: all of the line's v in one box
+            boxes = {3 * (i // 27) + (i % 9) // 3 for i in cells}
+            if len(boxes) == 1:
+                others = [i for i in BOXES[boxes.pop()] if i not in line]
+                if g.eliminate(others, BITS[v]):
+                    return True
+    return False
+
+
+def _naked_subset(g, n):
+    cand = g.cand
+    for unit in UNITS:
+        open_cells = [i for i in unit if cand[i]]
+        small = [i for i in open_cells if POPCOUNT[cand[i]] <= n]
+        for group in combinations(small, n):
+            mask = 0
+            for i in group:
+                mask |= cand[i]
+            if POPCOUNT[mask] == n:
+                others = [i for i in open_cells if i not in group]
+                if g.eliminate(others, mask):
+                    return True
+    return False
+
+
+def _hidden_subset(g, n):
+    cand = g.cand
+    for unit in UNITS:
+        where = {}
+        for v in range(1, 10):
+            cells = [i for i in unit if cand[i] & BITS[v]]
+            if 2 <= len(cells) <= n:
+                where[v] = cells
+        for digits in combinations(where, n):
+            cells = set()
+            for v in digits:
+                cells.update(where[v])
+            if len(cells) == n:
+                keep = 0
+                for v in digits:
+                    keep |= BITS[v]
+                if g.eliminate(cells, FULL_MASK & ~keep):
+                    return True
+    return False
+
+
+def naked_pair(g):
+    return _naked_subset(g, 2)
+
+
+def hidden_pair(g):
+    return _hidden_subset(g, 2)
+
+
+def naked_triple(g):
+    return _naked_subset(g, 3)
+
+
+def hidden_triple(g):
+    return _hidden_subset(g, 3)
+
+
+def x_wing(g):
+    cand = g.cand
+    for lines, cross in ((ROWS, COLS), (COLS, ROWS)):
+        for v in range(1, 10):
+            # lines where v fits in exactly two positions, keyed by those positions
+            pairs = {}
+            for k, line in enumerate(lines):
+                pos = tuple(j for j, i in enumerate(line) if cand[i] & BITS[v])
+                if len(pos) == 2:
+                    pairs.setdefault(pos, []).append(k)
+            for (a, b), ks in pairs.items():
+                for k1, k2 in combinations(ks, 2):
+                    others = [i for j in (a, b) for i in cross[j]
+                              if i not in lines[k1] and i not in lines[k2]]
+                    if g.eliminate(others, BITS[v]):
+                        return True
+    return False
+
+
+TECHNIQUES = [
+    ("naked single", naked_single),
+    ("hidden single", hidden_single),
+    ("locked candidates", locked_candidates),
+    ("naked pair", naked_pair),
+    ("hidden pair", hidden_pair),
+    ("naked triple", naked_triple),
+    ("hidden triple", hidden_triple),
+    ("x-wing", x_wing),
+]
+
+
+def _cells(grid):
+    """Accept a 9x9 array, a SudokuBoard, 81 raw bytes or a flat sequence of 81 ints."""
+    grid = getattr(grid, "grid", grid)
+    if hasattr(grid, "reshape"):
+        grid = grid.reshape(81).tolist()
+    cells = list(grid)
+    if len(cells) != 81 or any(not 0 <= v <= 9 for v in cells):
+        raise ValueError("grid must have 81 cells with values 0-9")
+    return cells
+
+
+def grade(grid):
+    """
+    Grade one puzzle.
+    Returns a dict:
+        grade: hardest technique needed, "requires search" or "invalid"
+        level: its 1-based position in TECHNIQUES (0 if nothing was needed,
+               len(TECHNIQUES) + 1 for search, -1 for invalid)
+        tier:  TIERS[grade] ("solved" for an already full grid)
+        steps: {technique: times applied}
+        grid:  81 values after grading (partly filled if search is required)
+    """
+    steps = {}
+    level = 0
+    try:
+        g = CandidateGrid(_cells(grid))
+        while not g.solved():
+            for k, (name, technique) in enumerate(TECHNIQUES, 1):
+                if technique(g):
+                    steps[name] = steps.get(name, 0) + 1
+                    level = max(level, k)
+                    break
+            else:
+                if any(g.values[i] == 0 and g.cand[i] == 0 for i in range(81)):
+                    raise Contradiction("empty cell without candidates")
+                name = REQUIRES_SEARCH
+                return {"grade": name, "level": len(TECHNIQUES) + 1, "tier": TIERS[name],
+                        "steps": steps, "grid": g.values}
+    except Contradiction:
+        return {"grade": INVALID, "level": -1, "tier": TIERS[INVALID], "steps": steps,
+                "grid": None}
+    name = TECHNIQUES[level - 1][0] if level else None
+    return {"grade": name, "level": level, "tier": TIERS[name] if level else "solved",
+            "steps": steps, "grid": g.values}
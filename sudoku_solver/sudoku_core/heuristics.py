@@ -1,4 +1,5 @@
 # sudoku_core/heuristics.py
+from array import array
 from collections import defaultdict
 
 def compute_neighbors():
@@ -31,47 +32,212 @@ def compute_neighbors():
 # cached neighbors to avoid recomputing
 NEIGHBORS = compute_neighbors()
 
-def select_unassigned_variable(domains, assigned, use_mrv=True, use_degree=True):
+def compute_cell_groups():
+    """
+    Precompute the counter groups each cell belongs to.
+    Groups 0-26 are the row, column and box units; groups 27-80 are the
+    row and column segments (the 3-cell intersection of a line with a box).
+    Returns dict: (r,c) -> (row, col, box, row_segment, col_segment), each
+    already multiplied by 10 so it can be used as an offset into a flat
+    counter array indexed by value.
+    """
+    groups = {}
+    for r in range(9):
+        for c in range(9):
+            box = 18 + 3 * (r // 3) + c // 3
+            row_seg = 27 + 3 * r + c // 3
+            col_seg = 54 + 3 * c + r // 3
+            groups[(r, c)] = (r * 10, (9 + c) * 10, box * 10,
+                              row_seg * 10, col_seg * 10)
+    return groups
+
+CELL_GROUPS = compute_cell_groups()
+
+# the 27 units (rows, columns, boxes) as tuples of cells
+UNITS = ([tuple((r, c) for c in range(9)) for r in range(9)]
+         + [tuple((r, c) for r in range(9)) for c in range(9)]
+         + [tuple((3 * (b // 3) + i // 3, 3 * (b % 3) + i % 3) for i in range(9))
+            for b in range(9)])
+# CELL_UNITS[(r, c)] = (row unit, column unit, box unit)
+CELL_UNITS = {(r, c): (r, 9 + c, 18 + 3 * (r // 3) + c // 3) for r in range(9) for c in range(9)}
+
+class ValueSupport:
+    """
+    Per-unit, per-value support counters for LCV ordering.
+
+    counts[g*10 + v] is the number of cells in group g whose domain contains v.
+    Keeping row/col/box counts together with the row/col segment counts lets
+    us get the exact number of neighbors of a cell that still allow v by
+    inclusion-exclusion, without scanning the 20 neighbors:
+
+        row + col + box - row_segment - col_segment - 1
+
+    (the trailing -1 removes the cell itself, which must contain v).
+    Forward checking and undo keep the counters in sync through
+    remove()/add().
+    """
+    def __init__(self, domains=None):
+        self.counts = [0] * 810
+        if domains is not None:
+            self.rebuild(domains)
+
+    def rebuild(self, domains):
+        """Recount every group from scratch (used once after initial propagation)."""
+        counts = self.counts
+        for i in range(810):
+            counts[i] = 0
+        for cell, values in domains.items():
+            for g in CELL_GROUPS[cell]:
+                for v in values:
+                    counts[g + v] += 1
+
+    def remove(self, cell, value):
+        """value was removed from the domain of cell."""
+        counts = self.counts
+        for g in CELL_GROUPS[cell]:
+            counts[g + value] -= 1
+
+    def add(self, cell, value):
+        """value was put back into the domain of cell."""
+        counts = self.counts
+        for g in CELL_GROUPS[cell]:
+            counts[g + value] += 1
+
+    def remove_values(self, cell, values):
+        for v in values:
+            self.remove(cell, v)
+
+    def add_values(self, cell, values):
+        for v in values:
+            self.add(cell, v)
+
+    def impact(self, var, value):
+        """Number of neighbors of var whose domain still contains value."""
+        counts = self.counts
+        rg, cg, bg, rs, cs = CELL_GROUPS[var]
+        return (counts[rg + value] + counts[cg + value] + counts[bg + value]
+                - counts[rs + value] - counts[cs + value] - 1)
+
+class UnitWeights:
+    """
+    Constraint weights for the dom/wdeg heuristic (Boussemart et al. 2004).
+
+    Every unit starts with weight 1 and gains 1 each time propagation wipes
+    out a domain inside it, so the units that keep causing failures draw
+    the search to their cells first. wdeg of a cell is the sum of the
+    weights of its 3 units, kept up to date in a second array. Both arrays
+    are compact and only grow: undo never touches them, so what was learned
+    survives backtracking (and restarts).
+    """
+    __slots__ = ("unit", "cell")
+
+    def __init__(self):
+        self.unit = array("I", [1] * 27)
+        self.cell = array("I", [3] * 81)
+
+    def reset(self):
+        for u in range(27):
+            self.unit[u] = 1
+        for i in range(81):
+            self.cell[i] = 3
+
+    def restore(self, unit):
+        """Take over saved unit weights (e.g. from a checkpoint) and recompute the cell sums."""
+        self.unit[:] = array("I", unit)
+        for i in range(81):
+            self.cell[i] = sum(self.unit[u] for u in CELL_UNITS[divmod(i, 9)])
+
+    def bump(self, u):
+        """Unit u caused a wipe-out."""
+        self.unit[u] += 1
+        cell = self.cell
+        for r, c in UNITS[u]:
+            cell[9 * r + c] += 1
+
+    def bump_conflict(self, a, b):
+        """Assigning cell a wiped out cell b: blame the units they share."""
+        for u in CELL_UNITS[a]:
+            if u in CELL_UNITS[b]:
+                self.bump(u)
+
+    def wdeg(self, var):
+        r, c = var
+        return self.cell[9 * r + c]
+
+def select_unassigned_variable(domains, assigned, use_mrv=True, use_degree=True, rng=None,
+                               weights=None):
     """
     domains: dict (r,c) -> set(possible values)
     assigned: set of (r,c) that are already assigned
+    rng: optional random.Random; ties (equal domain size and degree) are then
+         broken at random instead of by cell order. Without MRV every
+         unassigned cell ties.
+    weights: optional UnitWeights; selects by dom/wdeg instead of MRV, i.e.
+             the smallest domain size / weighted degree (ties as above)
     Returns chosen variable (r,c)
     """
     unassigned = [v for v in domains.keys() if v not in assigned]
     if not unassigned:
         return None
 
+    if weights is not None:
+        cell = weights.cell
+        best = []
+        best_ratio = None
+        for v in unassigned:
+            ratio = len(domains[v]) / cell[9 * v[0] + v[1]]
+            if best_ratio is None or ratio < best_ratio:
+                best_ratio = ratio
+                best = [v]
+            elif ratio == best_ratio:
+                best.append(v)
+        return best[0] if rng is None else rng.choice(best)
+
     if not use_mrv:
         # fallback: first unassigned
-        return unassigned[0]
+        return unassigned[0] if rng is None else rng.choice(unassigned)
 
     # MRV: choose var with smallest domain size (>0)
     min_size = min(len(domains[v]) for v in unassigned)
     candidates = [v for v in unassigned if len(domains[v]) == min_size]
 
     if len(candidates) == 1 or not use_degree:
-        return candidates[0]
+        return candidates[0] if rng is None else rng.choice(candidates)
 
     # Degree heuristic tiebreaker: choose var with most unassigned neighbors
-    best = None
+    best = []
     best_deg = -1
     for v in candidates:
         deg = sum(1 for n in NEIGHBORS[v] if n not in assigned)
         if deg > best_deg:
             best_deg = deg
-            best = v
-    return best
+            best = [v]
+        elif deg == best_deg:
+            best.append(v)
+    return best[0] if rng is None else rng.choice(best)
 
-def order_domain_values(var, domains, neighbors=NEIGHBORS, use_lcv=True):
+def order_domain_values(var, domains, neighbors=NEIGHBORS, use_lcv=True, support=None, rng=None):
     """
     var: (r,c)
     domains: dict
+    support: optional ValueSupport kept in sync with domains; when given,
+             LCV ranks values from the counters instead of scanning neighbors
+    rng: optional random.Random; values are shuffled first, so LCV ties
+         (or the whole order, without LCV) are broken at random
     Returns list of values ordered. If use_lcv True, sort by least constraining first.
     """
-    vals = list(domains[var])
+    # sorted: a set's iteration order depends on its history, and a resumed
+    # search (sudoku_core.checkpoint) must try values in the same order
+    vals = sorted(domains[var])
+    if rng is not None:
+        rng.shuffle(vals)
     if not use_lcv:
         return vals
 
+    if support is not None:
+        vals.sort(key=lambda v: support.impact(var, v))
+        return vals
+
     # LCV: for each value, count how many choices it would eliminate from neighbors
     impact = {}
     for val in vals:
@@ -2,7 +2,13 @@
 from collections import deque
 from .heuristics import NEIGHBORS
 
-def forward_checking(domains, var, value):
+def forward_checking(domains, var, value, support=None):
+    """
+    Remove value from the domains of all neighbors of var.
+    support: optional ValueSupport updated for every removal.
+    Returns dict {cell: set_of_values_removed}, or None on a domain wipe-out
+    (in which case domains and support are left unchanged).
+    """
     inferences = {}
     affected = []
 
@@ -12,25 +18,32 @@ def forward_checking(domains, var, value):
             removed.add(value)
             domains[n] = domains[n] - {value}
             affected.append(n)
+            if support is not None:
+                support.remove(n, value)
 
             if len(domains[n]) == 0:
                 # restore before returning failure
                 for cell in affected:
                     domains[cell] = domains[cell].union(inferences[cell])
+                    if support is not None:
+                        support.add_values(cell, inferences[cell])
                 return None
 
     return inferences
 
 
-def restore_inferences(domains, inferences):
+def restore_inferences(domains, inferences, support=None):
     """
     Put back values removed by forward_checking.
     inferences: dict {cell: set_of_values_removed}
+    support: optional ValueSupport to update alongside domains
     """
     if not inferences:
         return
     for cell, removed in inferences.items():
         domains[cell] = domains[cell].union(removed)
+        if support is not None:
+            support.add_values(cell, removed)
 
 def revise(domains, xi, xj):
     """
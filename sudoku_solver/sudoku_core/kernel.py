@@ -0,0 +1,154 @@
+# sudoku_core/kernel.py
+"""
+Bitmask search kernel
+---------------------
+An iterative MRV + forward checking backtracking search over NumPy arrays.
+Each cell's domain is a bitmask (bit v set <=> value v allowed), the search
+keeps one row of masks per depth so undo is just popping the depth, and
+choice points are an explicit stack of (cell, remaining candidates).
+
+When Numba is installed the kernel is JIT-compiled on first use (and cached
+on disk, so only the very first run pays the compile cost). Without Numba the
+same code runs as plain Python; CSPSolver only routes to it when HAVE_NUMBA
+is True.
+"""
+
+import importlib.util
+import numpy as np
+
+from .heuristics import NEIGHBORS
+
+# Numba is only imported when the kernel is first used, so importing the
+# solver (e.g. from the CLI) does not pay for loading it.
+HAVE_NUMBA = importlib.util.find_spec("numba") is not None
+
+FULL_MASK = 0x3FE  # bits 1..9
+
+# PEERS[i] = flat indices of the 20 neighbors of cell i (i = 9*r + c)
+PEERS = np.array([sorted(9 * rr + cc for rr, cc in NEIGHBORS[(i // 9, i % 9)])
+                  for i in range(81)], dtype=np.int64)
+
+# POPCOUNT[m] = number of candidates in mask m
+POPCOUNT = np.array([bin(m).count("1") for m in range(1024)], dtype=np.int64)
+
+# return codes of search()
+INVALID = -1
+UNSOLVABLE = 0
+SOLVED = 1
+
+
+def search(cells, peers, popcount, counters):
+    """
+    Solve the flat 81-cell grid in place.
+    cells: int64[81], 0 for empty
+    counters: int64[2], receives (assignments, backtracks)
+    Returns SOLVED, UNSOLVABLE or INVALID (givens already conflict).
+    """
+    masks = np.zeros((82, 81), dtype=np.int64)
+    stack_cell = np.zeros(82, dtype=np.int64)
+    stack_rem = np.zeros(82, dtype=np.int64)
+
+    # initial domains
+    for i in range(81):
+        if cells[i] != 0:
+            for p in peers[i]:
+                if cells[p] == cells[i]:
+                    return INVALID
+            masks[0, i] = 1 << cells[i]
+        else:
+            m = FULL_MASK
+            for p in peers[i]:
+                if cells[p] != 0:
+                    m &= ~(1 << cells[p])
+            if m == 0:
+                return UNSOLVABLE
+            masks[0, i] = m
+
+    assignments = 0
+    backtracks = 0
+    depth = 0
+    need_select = True
+    while True:
+        if need_select:
+            # MRV: unassigned cell with the fewest candidates
+            best = -1
+            best_size = 10
+            for i in range(81):
+                if cells[i] == 0:
+                    size = popcount[masks[depth, i]]
+                    if size < best_size:
+                        best = i
+                        best_size = size
+                        if size <= 1:
+                            break
+            if best == -1:
+                counters[0] = assignments
+                counters[1] = backtracks
+                return SOLVED
+            stack_cell[depth] = best
+            stack_rem[depth] = masks[depth, best]
+            need_select = False
+
+        cell = stack_cell[depth]
+        rem = stack_rem[depth]
+        if rem == 0:
+            # choice point exhausted: undo the assignment one level up
+            cells[cell] = 0
+            if depth == 0:
+                counters[0] = assignments
+                counters[1] = backtracks
+                return UNSOLVABLE
+            depth -= 1
+            backtracks += 1
+            continue
+
+        bit = rem & -rem
+        stack_rem[depth] = rem ^ bit
+        value = 0
+        while (1 << value) != bit:
+            value += 1
+        cells[cell] = value
+        assignments += 1
+
+        # forward checking into the next depth's masks
+        nxt = masks[depth + 1]
+        nxt[:] = masks[depth]
+        nxt[cell] = bit
+        ok = True
+        for p in peers[cell]:
+            if cells[p] == 0:
+                m = nxt[p] & ~bit
+                nxt[p] = m
+                if m == 0:
+                    ok = False
+                    break
+        if not ok:
+            backtracks += 1
+            continue
+        depth += 1
+        need_select = True
+
+
+_compiled_search = None
+
+def get_search():
+    """search(), JIT-compiled (with an on-disk cache) when Numba is available."""
+    global _compiled_search
+    if _compiled_search is None:
+        if HAVE_NUMBA:
+            from numba import njit
+            _compiled_search = njit(cache=True)(search)
+        else:
+            _compiled_search = search
+    return _compiled_search
+
+
+def solve_grid(grid):
+    """
+    Run the kernel on a 9x9 grid.
+    Returns (status, solution 9x9 int array, assignments, backtracks).
+    """
+    cells = np.array(grid, dtype=np.int64).reshape(81)
+    counters = np.zeros(2, dtype=np.int64)
+    status = get_search()(cells, PEERS, POPCOUNT, counters)
+    return int(status), cells.reshape(9, 9).astype(int), int(counters[0]), int(counters[1])
@@ -6,15 +6,28 @@ Tracks performance statistics during the CSP Sudoku solving process:
 - Total solving time
 - Number of recursive calls
 - Number of backtracks
+- Backjumps and learned-nogood prunes (conflict-directed backjumping only)
+- Restarts (randomized restarts only)
+- Values pruned and units revised by all-different propagation (use_gac only)
 - Whether the solution was successful
 """
 
 import time
 
 class Metrics:
+    __slots__ = ("assignments", "backtracks", "backjumps", "nogood_prunes", "restarts",
+                 "gac_prunes", "gac_revisions", "start_time", "end_time")
+
     def __init__(self):
+        self.reset()
+    def reset(self):
         self.assignments = 0
         self.backtracks = 0
+        self.backjumps = 0
+        self.nogood_prunes = 0
+        self.restarts = 0
+        self.gac_prunes = 0
+        self.gac_revisions = 0
         self.start_time = None
         self.end_time = None
     def start(self):
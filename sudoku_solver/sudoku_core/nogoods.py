@@ -0,0 +1,69 @@
+# sudoku_core/nogoods.py
+"""
+Bounded nogood table
+--------------------
+A nogood is a set of (cell, value) assignments that is known to lead to a
+dead end, learned by conflict-directed backjumping (CSPSolver(use_cbj=True)).
+Before a cell is assigned, the solver asks the table whether the assignment
+would complete a stored nogood; if so the value is skipped at once.
+
+Only nogoods with at most max_size literals are kept (small ones are the
+most likely to fire again), and the table holds at most `capacity` of them,
+evicting the least recently used.
+"""
+
+from collections import OrderedDict
+
+
+class NogoodTable:
+    __slots__ = ("capacity", "max_size", "_table", "_watch")
+
+    def __init__(self, capacity=4096, max_size=4):
+        self.capacity = capacity
+        self.max_size = max_size
+        self._table = OrderedDict()   # frozenset of literals -> None, in LRU order
+        self._watch = {}              # literal -> set of nogoods containing it
+
+    def __len__(self):
+        return len(self._table)
+
+    def clear(self):
+        self._table.clear()
+        self._watch.clear()
+
+    def add(self, literals):
+        """Store a nogood (iterable of (cell, value)); returns False if it is too large."""
+        nogood = frozenset(literals)
+        if not nogood or len(nogood) > self.max_size or self.capacity <= 0:
+            return False
+        if nogood in self._table:
+            self._table.move_to_end(nogood)
+            return True
+        self._table[nogood] = None
+        for literal in nogood:
+            self._watch.setdefault(literal, set()).add(nogood)
+        if len(self._table) > self.capacity:
+            self._evict()
+        return True
+
+    def _evict(self):
+        old, _ = self._table.popitem(last=False)
+        for literal in old:
+            watchers = self._watch[literal]
+            watchers.discard(old)
+            if not watchers:
+                del self._watch[literal]
+
+    def conflict(self, cell, value, grid):
+        """
+        Cells of a stored nogood that cell=value would complete, given the
+        values currently on grid (9x9), or None if there is none.
+        """
+        watchers = self._watch.get((cell, value))
+        if not watchers:
+            return None
+        for nogood in watchers:
+            if all(grid[c] == v for c, v in nogood if c != cell):
+                self._table.move_to_end(nogood)
+                return {c for c, _ in nogood if c != cell}
+        return None
@@ -0,0 +1,40 @@
+# sudoku_core/restarts.py
+"""
+Restart schedules
+-----------------
+With randomized tie-breaking, one unlucky early choice can make a search
+run for far longer than usual. Restarting after a bounded number of nodes
+(assignments) and trying again with different tie-breaks cuts that tail.
+The limits grow from run to run, so the search still finishes on every
+puzzle.
+
+    luby      : base * (1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ...)  (Luby et al. 1993)
+    geometric : base * factor**k
+"""
+
+from itertools import count
+
+SCHEDULES = ("luby", "geometric")
+GEOMETRIC_FACTOR = 1.5
+
+
+def luby(i):
+    """i-th term (1-based) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, ..."""
+    if i < 1:
+        raise ValueError("the Luby sequence starts at i = 1")
+    while True:
+        k = i.bit_length()
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+
+def restart_limits(schedule, base=1000, factor=GEOMETRIC_FACTOR):
+    """Endless iterator of node limits for successive runs."""
+    if schedule not in SCHEDULES:
+        raise ValueError(f"Unknown restart schedule: {schedule}")
+    if base < 1:
+        raise ValueError("restart base must be at least 1")
+    if schedule == "luby":
+        return (base * luby(run) for run in count(1))
+    return (int(base * factor ** run) for run in count())
@@ -0,0 +1,245 @@
+# sudoku_core/sat_solver.py
+"""
+SAT backend
+-----------
+Encodes a Sudoku board of any size N = n*n (9x9, 16x16, 25x25, ...) as CNF
+and solves it with the CDCL engine in sudoku_core/cdcl.py.
+
+Variable x(r, c, v) = (r*N + c)*N + v (v in 1..N) means "cell (r, c) holds v".
+The clauses are:
+    cell   : every cell holds at least one value, and at most one
+    unit   : every row, column and box holds each value at least once,
+             and at most once
+    givens : one unit clause x(r, c, v) per filled cell, emitted first
+(Warm-start domains add a unit clause -x(r, c, v) for every excluded value.)
+The at-most-one constraints are pairwise binary clauses, which the engine
+keeps in implication lists rather than watching them.
+
+SATSolver mirrors the CSPSolver interface (solve(), reset(), status,
+metrics, step_log, domains), and write_dimacs() exports the formula so a
+result can be checked with any external SAT solver.
+"""
+
+import math
+import time
+
+import numpy as np
+
+from .board import SudokuBoard
+from .cdcl import CDCL, CDCLTimeout
+from .metrics import Metrics
+from . import trace as tr
+from utils.timer import REGISTRY as TIMINGS
+
+
+def box_size(size):
+    """n for an N x N board with N = n*n; raises ValueError otherwise."""
+    n = math.isqrt(size)
+    if n < 2 or n * n != size:
+        raise ValueError(f"Board size must be a square of at least 4, got {size}")
+    return n
+
+
+def variable(r, c, v, size=9):
+    return (r * size + c) * size + v
+
+
+def decode(var, size=9):
+    """Variable -> (row, col, value)."""
+    cell, v = divmod(var - 1, size)
+    r, c = divmod(cell, size)
+    return r, c, v + 1
+
+
+def units(size):
+    """Cell lists of all rows, columns and boxes of an N x N board."""
+    n = box_size(size)
+    result = [[(r, c) for c in range(size)] for r in range(size)]
+    result += [[(r, c) for r in range(size)] for c in range(size)]
+    result += [[(br + i // n, bc + i % n) for i in range(size)]
+               for br in range(0, size, n) for bc in range(0, size, n)]
+    return result
+
+
+def _exactly_one(lits):
+    yield list(lits)
+    for i, a in enumerate(lits):
+        for b in lits[i + 1:]:
+            yield [-a, -b]
+
+
+def encode(grid, domains=None):
+    """
+    CNF for a board: (number of variables, iterator of clauses as lists of
+    DIMACS literals). domains: optional (r, c) -> allowed values.
+    """
+    grid = np.asarray(grid)
+    size = grid.shape[0]
+    box_size(size)
+    values = range(1, size + 1)
+
+    def clauses():
+        # unit clauses first: a solver adding clauses in this order can drop
+        # everything they already satisfy or falsify before searching
+        for r, c in zip(*np.nonzero(grid)):
+            yield [variable(int(r), int(c), int(grid[r, c]), size)]
+        if domains is not None:
+            for (r, c), allowed in domains.items():
+                for v in values:
+                    if v not in allowed:
+                        yield [-variable(r, c, v, size)]
+        for r in range(size):
+            for c in range(size):
+                yield from _exactly_one([variable(r, c, v, size) for v in values])
+        for cells in units(size):
+            for v in values:
+                yield from _exactly_one([variable(r, c, v, size) for r, c in cells])
+
+    return size ** 3, clauses()
+
+
+def write_dimacs(grid, target, domains=None):
+    """Write the CNF of a board in DIMACS format to a path or text file object."""
+    num_vars, clauses = encode(grid, domains)
+    clauses = list(clauses)
+    lines = [f"c sudoku {len(grid)}x{len(grid)}, x(r,c,v) = (r*N + c)*N + v",
+             f"p cnf {num_vars} {len(clauses)}"]
+    lines.extend(" ".join(map(str, clause)) + " 0" for clause in clauses)
+    text = "\n".join(lines) + "\n"
+    if hasattr(target, "write"):
+        target.write(text)
+    else:
+        with open(target, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def givens_valid(grid):
+    """True if no two givens clash in a row, column or box and all values are in 0..N."""
+    grid = np.asarray(grid)
+    size = grid.shape[0]
+    if grid.min() < 0 or grid.max() > size:
+        return False
+    for cells in units(size):
+        given = [int(grid[cell]) for cell in cells if grid[cell]]
+        if len(given) != len(set(given)):
+            return False
+    return True
+
+
+class SATSolver:
+    """
+    Drop-in alternative to CSPSolver that solves the board through CNF + CDCL.
+    Handles any N x N board with N a square (SudokuBoard or a plain grid).
+    """
+    __slots__ = ("board", "log_steps", "time_limit", "trace", "status", "metrics", "domains",
+                 "step_log", "engine", "cdcl", "_warm", "_step_counter")
+
+    def __init__(self, board, log_steps=True, time_limit=None, trace=None, domains=None):
+        """
+        board: SudokuBoard instance (or an N x N array)
+        Options:
+            log_steps: record decisions, conflicts and restarts in step_log
+            time_limit: give up after this many seconds
+            trace: optional TraceRecorder (9x9 only); receives the cells of
+                   the solution in the order the engine fixed them
+            domains: optional warm-start domains, (r, c) -> allowed values
+
+        After solve(), status is one of "solved", "unsolvable", "invalid" or
+        "timeout"; cdcl holds the CDCL instance of the last solve.
+        """
+        self.log_steps = log_steps
+        self.time_limit = time_limit
+        self.trace = trace
+        self.engine = "sat"
+        self.metrics = Metrics()
+        self.step_log = []
+        self.reset(board, domains)
+
+    def reset(self, board, domains=None):
+        """Prepare the solver for a new board (domains: optional warm start)."""
+        if not isinstance(board, SudokuBoard):
+            board = SudokuBoard(board)
+        self.board = board
+        box_size(board.grid.shape[0])
+        self.status = None
+        self.cdcl = None
+        self._warm = domains
+        self.metrics.reset()
+        self.step_log.clear()
+        self._step_counter = 0
+        self.domains = {}
+
+    def _log_step(self, message):
+        self._step_counter += 1
+        self.step_log.append(f"Step {self._step_counter}: {message}")
+
+    def _on_event(self, kind, *args):
+        if kind == "decide":
+            r, c, v = decode(args[0] >> 1, self.board.grid.shape[0])
+            sign = "!=" if args[0] & 1 else "="
+            self._log_step(f"Decide ({r},{c}){sign}{v}")
+        elif kind == "conflict":
+            level, learned, back = args
+            self._log_step(f"  Conflict at level {level}: learned {learned} literals, "
+                           f"backjump to level {back}")
+        elif kind == "restart":
+            self._log_step("Restart")
+
+    def write_dimacs(self, target):
+        """Export the current board (and warm-start domains) as DIMACS CNF."""
+        write_dimacs(self.board.grid, target, self._warm)
+
+    def solve(self):
+        """Public entry point. Returns True if solved."""
+        metrics = self.metrics
+        metrics.start()
+        grid = self.board.grid
+        size = grid.shape[0]
+        start = time.perf_counter_ns()
+        valid = givens_valid(grid)
+        encode_start = time.perf_counter_ns()
+        TIMINGS.record("validate", encode_start - start)
+        if not valid:
+            metrics.stop()
+            self.status = "invalid"
+            return False
+        num_vars, clauses = encode(grid, self._warm)
+        engine = self.cdcl = CDCL(num_vars)
+        if self.log_steps:
+            engine.on_event = self._on_event
+        for clause in clauses:
+            if not engine.add_clause(clause):
+                break
+        search_start = time.perf_counter_ns()
+        TIMINGS.record("encode.sat", search_start - encode_start)
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        try:
+            success = engine.solve(deadline)
+        except CDCLTimeout:
+            success = False
+            self.status = "timeout"
+        else:
+            self.status = "solved" if success else "unsolvable"
+        TIMINGS.record("solve.sat", time.perf_counter_ns() - search_start)
+        # decisions and conflicts stand in for CSPSolver's assignments and backtracks
+        metrics.assignments = engine.decisions
+        metrics.backtracks = engine.conflicts
+        metrics.backjumps = engine.backjumps
+        metrics.restarts = engine.restarts
+        if success:
+            given = grid != 0
+            order = []
+            for var in engine.true_literals():
+                r, c, v = decode(var, size)
+                if not given[r, c]:
+                    grid[r, c] = v
+                    order.append((r, c, v))
+            for r in range(size):
+                for c in range(size):
+                    self.domains[(r, c)] = {int(grid[r, c])}
+            if self.trace is not None:
+                depth = int(given.sum())
+                for k, (r, c, v) in enumerate(order):
+                    self.trace.record(tr.ASSIGN, 9 * r + c, v, min(depth + k, 255))
+        metrics.stop()
+        return success
@@ -0,0 +1,230 @@
+# sudoku_core/trace.py
+"""
+Binary search-trace recording and replay.
+
+A trace is a header followed by fixed-size blocks. Each block starts with a
+grid checkpoint (81 bytes, the board before the block's first event) and
+then holds up to `interval` event records of EVENT.size bytes:
+
+    header : magic "SDKT", version u8, pad u8, interval u16, event count u64,
+             initial grid (81 bytes)
+    block k: checkpoint (81 bytes) + events k*interval .. (k+1)*interval - 1
+    event  : kind u8, cell u8 (9*r + c), value u8, depth u8, aux u16
+
+Since every block has the same size, the offset of any event or checkpoint
+is plain arithmetic. Rebuilding the board at step i means loading the
+checkpoint of i's block and replaying at most `interval` events.
+
+In-memory recorders append to a single bytearray, and a TraceReader built on
+the recorder itself reads that buffer live. A GUI can therefore follow a solve
+that is still running in another thread. Appends and reads are each a single
+bytearray operation, and the event count is only bumped after the bytes are
+in place.
+"""
+
+import os
+import struct
+
+TRACE_MAGIC = b"SDKT"
+TRACE_VERSION = 1
+HEADER = struct.Struct("<4sBxHQ")
+EVENT = struct.Struct("<BBBBH")
+GRID_SIZE = 81
+
+# event kinds
+SELECT = 1       # cell chosen; aux = domain bitmask
+INVALID = 2      # value rejected by the board consistency check
+ASSIGN = 3       # cell := value
+FC_OK = 4        # forward checking passed; aux = values eliminated
+FC_FAIL = 5      # forward checking wiped out a domain
+BACKTRACK = 6    # cell := 0
+
+KIND_NAMES = {SELECT: "select", INVALID: "invalid", ASSIGN: "assign",
+              FC_OK: "fc_ok", FC_FAIL: "fc_fail", BACKTRACK: "backtrack"}
+
+
+def describe(kind, cell, value, depth, aux):
+    """Human-readable text for one event (mirrors the wording of CSPSolver.step_log)."""
+    r, c = divmod(cell, 9)
+    if kind == SELECT:
+        domain = [v for v in range(1, 10) if aux >> v & 1]
+        return f"Select cell ({r},{c}), domain={domain}"
+    if kind == INVALID:
+        return f"  Try ({r},{c})={value}: INVALID (constraint violation)"
+    if kind == ASSIGN:
+        return f"    Assigned ({r},{c})={value}"
+    if kind == FC_OK:
+        return f"    Forward checking passed, eliminated {aux} values"
+    if kind == FC_FAIL:
+        return f"    Forward checking failed for ({r},{c})={value}"
+    if kind == BACKTRACK:
+        return f"  Backtrack from ({r},{c})={value}"
+    return f"Unknown event {kind}"
+
+
+class TraceRecorder:
+    """
+    Append-only trace writer.
+    target: file path, a writable binary file object, or None for an
+            in-memory buffer (see getvalue() and TraceReader(recorder)).
+    """
+    def __init__(self, initial_grid, target=None, checkpoint_interval=1024):
+        if not 1 <= checkpoint_interval <= 0xFFFF:
+            raise ValueError("checkpoint_interval must be in 1..65535")
+        self.interval = checkpoint_interval
+        self.count = 0
+        self.grid = bytearray(int(v) for row in initial_grid for v in row)
+        if len(self.grid) != GRID_SIZE:
+            raise ValueError("initial_grid must be 9x9")
+        header = HEADER.pack(TRACE_MAGIC, TRACE_VERSION, self.interval, 0) + bytes(self.grid)
+        self._owns_file = isinstance(target, (str, os.PathLike))
+        if target is None:
+            # in memory: everything lives in one append-only buffer
+            self._file = None
+            self._buf = bytearray(header)
+        else:
+            self._file = open(target, "wb") if self._owns_file else target
+            self._file.write(header)
+            self._buf = bytearray()
+
+    @property
+    def in_memory(self) -> bool:
+        return self._file is None
+
+    def record(self, kind, cell, value=0, depth=0, aux=0):
+        if self.count % self.interval == 0:
+            # start of a new block: checkpoint the board before this event
+            self._buf += self.grid
+        self._buf += EVENT.pack(kind, cell, value, depth, aux)
+        if kind == ASSIGN:
+            self.grid[cell] = value
+        elif kind == BACKTRACK:
+            self.grid[cell] = 0
+        self.count += 1
+        if self._file is not None and len(self._buf) >= 65536:
+            self.flush()
+
+    def flush(self):
+        if self._file is not None and self._buf:
+            self._file.write(self._buf)
+            self._buf = bytearray()
+
+    def close(self):
+        """Finish the trace (patches the event count into a file's header)."""
+        if self._file is None or self._file.closed:
+            return
+        self.flush()
+        end = self._file.tell()
+        self._file.seek(0)
+        self._file.write(HEADER.pack(TRACE_MAGIC, TRACE_VERSION, self.interval, self.count))
+        self._file.seek(end)
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def getvalue(self) -> bytes:
+        """Complete trace bytes so far (in-memory recorders only)."""
+        if self._file is not None:
+            raise ValueError("getvalue() is only available for in-memory traces")
+        count = self.count
+        data = bytearray(self._buf)
+        HEADER.pack_into(data, 0, TRACE_MAGIC, TRACE_VERSION, self.interval, count)
+        return bytes(data)
+
+    def reader(self):
+        """Snapshot TraceReader over what has been recorded so far (in-memory recorders only)."""
+        return TraceReader(self.getvalue())
+
+
+class TraceReader:
+    """
+    Random access over a recorded trace.
+    source: file path, the bytes of a trace, or an in-memory TraceRecorder
+            (a live view: len() grows while the recorder is being written).
+    """
+    def __init__(self, source):
+        self._recorder = None
+        if isinstance(source, TraceRecorder):
+            if not source.in_memory:
+                raise ValueError("Only in-memory recorders can be read live")
+            self._recorder = source
+            data = source._buf
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            data = bytes(source)
+        else:
+            with open(source, "rb") as f:
+                data = f.read()
+        if len(data) < HEADER.size + GRID_SIZE:
+            raise ValueError("Truncated trace header")
+        magic, version, interval, count = HEADER.unpack_from(data)
+        if magic != TRACE_MAGIC:
+            raise ValueError("Not a search trace")
+        if version != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version: {version}")
+        if interval == 0:
+            raise ValueError("Corrupt trace header")
+        self._data = data
+        self.interval = interval
+        self._base = HEADER.size + GRID_SIZE
+        self._block = GRID_SIZE + interval * EVENT.size
+        # trust the bytes actually present if the writer never patched the count
+        self._count = count if count else self._count_from_size(len(data))
+        self.initial_grid = list(data[HEADER.size:self._base])
+
+    @property
+    def count(self) -> int:
+        if self._recorder is not None:
+            return self._recorder.count
+        return self._count
+
+    @property
+    def live(self) -> bool:
+        """True when reading a recorder that may still be growing."""
+        return self._recorder is not None
+
+    def _count_from_size(self, size):
+        body = size - self._base
+        full, rest = divmod(body, self._block)
+        return full * self.interval + max(0, rest - GRID_SIZE) // EVENT.size
+
+    def __len__(self):
+        return self.count
+
+    def _event_offset(self, index):
+        block, i = divmod(index, self.interval)
+        return self._base + block * self._block + GRID_SIZE + i * EVENT.size
+
+    def event(self, index):
+        """(kind, cell, value, depth, aux) of event index."""
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return EVENT.unpack_from(self._data, self._event_offset(index))
+
+    def events(self, start=0, stop=None):
+        stop = self.count if stop is None else min(stop, self.count)
+        for index in range(start, stop):
+            yield EVENT.unpack_from(self._data, self._event_offset(index))
+
+    def grid_at(self, step):
+        """
+        Flat 81-cell board after the first `step` events (0 = initial board).
+        Costs one checkpoint copy plus at most `interval` replayed events.
+        """
+        count = self.count
+        if count == 0:
+            return list(self.initial_grid)
+        step = max(0, min(step, count))
+        # a block's checkpoint only exists once its first event has been written
+        block = min(step // self.interval, (count - 1) // self.interval)
+        offset = self._base + block * self._block
+        grid = list(self._data[offset:offset + GRID_SIZE])
+        for kind, cell, value, _, _ in self.events(block * self.interval, step):
+            if kind == ASSIGN:
+                grid[cell] = value
+            elif kind == BACKTRACK:
+                grid[cell] = 0
+        return grid
+
+    def describe(self, index):
+        return describe(*self.event(index))
@@ -0,0 +1,79 @@
+# sudoku_core/validator.py
+"""
+Vectorized validity checking
+----------------------------
+Checks all 27 units (9 rows, 9 columns, 9 boxes) of one board or of an
+(N,9,9) batch at once with NumPy. Every unit is gathered into an
+(N,27,9) array and its values are counted one-hot into an (N,27,10)
+table with a single bincount. A digit that occurs more than once in a unit
+marks every cell of that unit holding it. Values outside 0..9 are reported
+as conflicts too.
+
+Batches are processed in chunks of CHUNK boards, so the temporaries stay bounded.
+"""
+
+import numpy as np
+
+# UNITS[u] = flat indices (9*r + c) of the 9 cells of unit u: rows, then columns, then boxes
+UNITS = np.array([[9 * r + c for c in range(9)] for r in range(9)]
+                 + [[9 * r + c for r in range(9)] for c in range(9)]
+                 + [[9 * (3 * (b // 3) + i // 3) + 3 * (b % 3) + i % 3 for i in range(9)]
+                    for b in range(9)], dtype=np.intp)
+CHUNK = 4096
+
+
+def _conflicts_flat(flat):
+    """(N,81) values -> (N,81) bool mask of conflicting cells."""
+    n = len(flat)
+    out_of_range = (flat < 0) | (flat > 9)
+    units = np.where(out_of_range, 0, flat)[:, UNITS]       # (N,27,9)
+    # one-hot counts: counts[b, u, v] = occurrences of v in unit u of board b
+    slots = (np.arange(n * 27).reshape(n, 27, 1) * 10 + units).ravel()
+    counts = np.bincount(slots, minlength=n * 270).reshape(n, 27, 10)
+    counts[:, :, 0] = 0                                      # empty cells never clash
+    in_conflict = np.take_along_axis(counts, units, axis=2) > 1   # (N,27,9 cells)
+    mask = out_of_range
+    for k in range(3):
+        # rows, columns and boxes each cover all 81 cells exactly once
+        group = UNITS[9 * k:9 * k + 9].ravel()
+        mask[:, group] |= in_conflict[:, 9 * k:9 * k + 9].reshape(-1, 81)
+    return mask
+
+
+def find_conflicts(grids):
+    """
+    Boolean mask of the cells that break a Sudoku constraint.
+    grids: one 9x9 board or an (N,9,9) batch; the mask has the same shape.
+    """
+    grids = np.asarray(grids)
+    single = grids.ndim == 2
+    if grids.shape[-2:] != (9, 9) or grids.ndim not in (2, 3):
+        raise ValueError("Expected a 9x9 board or an (N,9,9) batch")
+    flat = grids.reshape(-1, 81).astype(np.int16, copy=False)
+    mask = np.empty(flat.shape, dtype=bool)
+    for start in range(0, len(flat), CHUNK):
+        mask[start:start + CHUNK] = _conflicts_flat(flat[start:start + CHUNK])
+    mask = mask.reshape(grids.shape)
+    return mask
+
+
+def valid_boards(grids):
+    """True for every board without conflicts: a bool for one board, an (N,) array for a batch."""
+    mask = find_conflicts(grids)
+    if mask.ndim == 2:
+        return not mask.any()
+    return ~mask.reshape(len(mask), 81).any(axis=1)
+
+
+def conflicting_cells(grids):
+    """
+    Conflicting cells as (row, col) pairs: a list for one board, or one list
+    per board for an (N,9,9) batch.
+    """
+    mask = find_conflicts(grids)
+    if mask.ndim == 2:
+        return [tuple(map(int, rc)) for rc in np.argwhere(mask)]
+    cells = [[] for _ in range(len(mask))]
+    for n, r, c in np.argwhere(mask).tolist():
+        cells[n].append((r, c))
+    return cells
@@ -17,3 +17,31 @@ def test_basic():
     assert board.is_valid(0, 2, 5) == False
     assert board.find_empty() == (0, 2)
     print(board)
+
+
+def test_vectorized_conflicts_single_and_batch():
+    import numpy as np
+    from sudoku_core.validator import conflicting_cells, find_conflicts, valid_boards
+
+    good = np.array([
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 9]
+    ])
+    bad = good.copy()
+    bad[0, 2] = 5      # row clash with (0,0)
+    bad[8, 0] = 12     # out of range
+    assert valid_boards(good) is True
+    assert SudokuBoard(good).conflicts() == []
+    assert SudokuBoard(bad).conflicts() == [(0, 0), (0, 2), (8, 0)]
+
+    batch = np.stack([good, bad, good])
+    assert valid_boards(batch).tolist() == [True, False, True]
+    assert find_conflicts(batch).shape == (3, 9, 9)
+    assert conflicting_cells(batch) == [[], [(0, 0), (0, 2), (8, 0)], []]
@@ -0,0 +1,38 @@
+# tests/test_candidates.py
+import numpy as np
+
+from sudoku_core.board import SudokuBoard
+from sudoku_core.candidates import CandidateEngine
+from sudoku_core.csp_solver import CSPSolver
+from utils.file_io import load_sudoku
+
+
+def test_edits_match_a_full_rebuild_and_warm_start_the_solver():
+    grid = load_sudoku("data/hard.txt").grid.copy()
+    engine = CandidateEngine(grid)
+    rng = np.random.default_rng(3)
+    for _ in range(200):
+        i = int(rng.integers(81))
+        value = int(rng.integers(10))
+        engine.set(i, value)
+        grid.flat[i] = value
+    # incremental state equals the state rebuilt from scratch
+    fresh = CandidateEngine(grid)
+    assert engine.domains() == fresh.domains()
+    assert engine.conflicts() == fresh.conflicts()
+
+    engine.load(load_sudoku("data/hard.txt").grid)
+    assert engine.conflicts() == [] and engine.dead_cells() == []
+    engine.set(1, engine.values[2])
+    assert engine.is_conflict(1) and engine.is_conflict(2) and not engine.is_conflict(0)
+    engine.clear(1)
+
+    cold = SudokuBoard(load_sudoku("data/hard.txt").grid)
+    warm = SudokuBoard(load_sudoku("data/hard.txt").grid)
+    cold_solver = CSPSolver(cold, log_steps=False)
+    assert cold_solver.domains == engine.domains()
+    assert cold_solver.solve()
+    warm_solver = CSPSolver(warm, log_steps=False, domains=engine.domains())
+    assert warm_solver.solve()
+    np.testing.assert_array_equal(cold.grid, warm.grid)
+    assert warm_solver.metrics.assignments == cold_solver.metrics.assignments
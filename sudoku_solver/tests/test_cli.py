@@ -0,0 +1,47 @@
+# tests/test_cli.py
+import json
+import os
+import subprocess
+import sys
+
+from cli import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINE = "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
+
+
+def test_solve_files_streams_json_lines(capsys):
+    rc = main(["solve", os.path.join(ROOT, "data", "easy.txt"),
+               os.path.join(ROOT, "data", "medium.csv")])
+    lines = capsys.readouterr().out.splitlines()
+    assert rc == 0
+    results = [json.loads(line) for line in lines]
+    assert [r["index"] for r in results] == [0, 1]
+    assert all(r["status"] == "solved" and len(r["solution"]) == 81 for r in results)
+    assert results[0]["assignments"] > 0
+
+
+def test_solve_stdin_with_workers_never_imports_gui():
+    bad = "55" + LINE[2:]
+    code = ("import sys; from cli import main; rc = main(sys.argv[1:]); "
+            "assert not any(m.split('.')[0] in ('PyQt5', 'gui') for m in sys.modules); "
+            "sys.exit(rc)")
+    proc = subprocess.run([sys.executable, "-c", code, "solve", "-j", "2", "--time-limit", "5"],
+                          cwd=ROOT, input=f"{LINE}\n{bad}\n", capture_output=True,
+                          text=True, timeout=60)
+    assert proc.returncode == 1, proc.stderr
+    results = [json.loads(line) for line in proc.stdout.splitlines()]
+    assert [r["status"] for r in results] == ["solved", "invalid"]
+    assert results[0]["solution"].startswith("534678912")
+
+
+def test_progress_lines_from_pool_workers_reach_stderr(capsys):
+    # every 256 assignments: 1 line for extreme.txt, 6 for hard.txt
+    assert main(["solve", "--workers", "2", "--no-lcv", "--progress", "0", "--estimate", "16",
+                 os.path.join(ROOT, "data", "extreme.txt"),
+                 os.path.join(ROOT, "data", "hard.txt")]) == 0
+    captured = capsys.readouterr()
+    assert len(captured.out.splitlines()) == 2
+    progress = [line for line in captured.err.splitlines() if "ETA" in line]
+    assert sorted(line.split(" - ")[1].split(":")[0] for line in progress) == \
+        ["puzzle 0"] + ["puzzle 1"] * 6
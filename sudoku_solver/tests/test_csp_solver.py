@@ -109,3 +109,246 @@ def test_unsolvable_case():
     
     assert not solved, "Unsolvable sudoku should not be solved"
   
+
+
+def test_lcv_support_counters_match_neighbor_scan():
+    from sudoku_core.heuristics import NEIGHBORS, order_domain_values
+    from sudoku_core.inference import forward_checking, restore_inferences
+
+    board = load_board_from_file("data/hard.txt")
+    solver = CSPSolver(board)
+    domains, support = solver.domains, solver.support
+
+    def check():
+        for var, values in domains.items():
+            for v in values:
+                expected = sum(1 for n in NEIGHBORS[var] if v in domains[n])
+                assert support.impact(var, v) == expected
+            assert order_domain_values(var, domains, support=support) == \
+                order_domain_values(var, domains)
+
+    check()
+    var = next(v for v in domains if len(domains[v]) > 1)
+    value = min(domains[var])
+    inferences = forward_checking(domains, var, value, support)
+    check()
+    restore_inferences(domains, inferences, support)
+    check()
+
+
+def test_reset_reuses_solver_and_pickle_roundtrip():
+    import pickle
+
+    solver = CSPSolver(load_board_from_file("data/easy.txt"), log_steps=False)
+    domains, support = solver.domains, solver.support
+    assert solver.solve()
+    assert solver.step_log == []
+
+    for fname in ["medium.txt", "hard.txt"]:
+        board = load_board_from_file(os.path.join("data", fname))
+        solver.reset(board)
+        assert solver.domains is domains and solver.support is support
+        assert solver.metrics.assignments == 0
+        clone = pickle.loads(pickle.dumps(solver))
+        assert clone.domains == solver.domains
+        np.testing.assert_array_equal(clone.board.grid, board.grid)
+
+        assert solver.solve() and is_valid_solution(board)
+        assert clone.solve() and is_valid_solution(clone.board)
+        assert clone.metrics.summary()["assignments"] == solver.metrics.summary()["assignments"]
+
+
+def test_bitmask_kernel_matches_python_engine():
+    from sudoku_core import kernel
+
+    data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+    for fname in ["easy.txt", "medium.txt", "hard.txt", "extreme.txt", "medium.csv"]:
+        expected = load_board_from_file(os.path.join(data_dir, fname))
+        assert CSPSolver(expected).solve()
+
+        status, solution, assignments, _ = kernel.solve_grid(
+            load_board_from_file(os.path.join(data_dir, fname)).grid)
+        assert status == kernel.SOLVED and assignments > 0
+        np.testing.assert_array_equal(solution, expected.grid)
+
+        board = load_board_from_file(os.path.join(data_dir, fname))
+        solver = CSPSolver(board, engine="numba")
+        assert solver.solve()
+        np.testing.assert_array_equal(board.grid, expected.grid)
+
+    status, _, _, _ = kernel.solve_grid([[5, 5] + [0] * 7] + [[0] * 9] * 8)
+    assert status == kernel.INVALID
+
+
+def test_backjumping_finds_the_same_solutions_with_fewer_assignments():
+    from sudoku_core.nogoods import NogoodTable
+
+    for fname, options in [("hard.txt", {}), ("medium.txt", {"use_mrv": False}),
+                           ("easy.txt", {"use_mrv": False, "use_fc": False})]:
+        chrono = load_board_from_file(os.path.join("data", fname))
+        plain = CSPSolver(chrono, log_steps=False, **options)
+        assert plain.solve()
+        board = load_board_from_file(os.path.join("data", fname))
+        cbj = CSPSolver(board, log_steps=False, use_cbj=True, **options)
+        assert cbj.solve() and is_valid_solution(board)
+        np.testing.assert_array_equal(board.grid, chrono.grid)
+        assert cbj.metrics.assignments <= plain.metrics.assignments
+    assert cbj.metrics.backjumps > 0 and len(cbj.nogoods) > 0
+
+    # an empty cell with no candidate left: every mode reports it unsolvable
+    unsat = np.zeros((9, 9), dtype=int)
+    unsat[0, 1:] = range(1, 9)
+    unsat[1, 0] = 9
+    solver = CSPSolver(SudokuBoard(unsat), log_steps=False, use_cbj=True)
+    assert not solver.solve() and solver.status == "unsolvable"
+
+    table = NogoodTable(capacity=2, max_size=2)
+    assert not table.add([((0, 0), 1), ((0, 1), 2), ((0, 2), 3)])   # too large
+    table.add([((0, 0), 1), ((1, 1), 2)])
+    table.add([((2, 2), 3)])
+    grid = np.zeros((9, 9), dtype=int)
+    grid[1, 1] = 2
+    assert table.conflict((0, 0), 1, grid) == {(1, 1)}
+    assert table.conflict((0, 0), 2, grid) is None
+    table.add([((3, 3), 4)])            # evicts the least recently used nogood
+    assert table.conflict((2, 2), 3, grid) is None and len(table) == 2
+
+
+def test_randomized_restarts_are_reproducible_and_replayable():
+    from itertools import islice
+    from sudoku_core.restarts import luby, restart_limits
+    from sudoku_core.trace import TraceReader, TraceRecorder
+
+    assert [luby(i) for i in range(1, 16)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+    assert list(islice(restart_limits("geometric", 100), 4)) == [100, 150, 225, 337]
+    with pytest.raises(ValueError):
+        CSPSolver(SudokuBoard(), restarts="never")
+
+    runs = []
+    for options in [{"restarts": "luby"}, {"restarts": "luby"},
+                    {"restarts": "geometric", "use_cbj": True, "keep_learned": False}]:
+        board = load_board_from_file("data/hard.txt")
+        recorder = TraceRecorder(board.grid)
+        solver = CSPSolver(board, log_steps=False, trace=recorder, seed=7,
+                           restart_base=5, **options)
+        assert solver.solve() and is_valid_solution(board)
+        assert solver.metrics.restarts > 0
+        # the abandoned runs are undone in the trace, so replay ends on the solution
+        reader = TraceReader(recorder)
+        assert list(reader.grid_at(len(reader))) == board.grid.ravel().tolist()
+        runs.append(solver.metrics.assignments)
+    assert runs[0] == runs[1]
+
+
+def test_alldifferent_propagation_prunes_whole_units():
+    from sudoku_core.alldiff import AllDifferent, UNITS
+
+    # two cells of a row limited to {1, 2} take 1 and 2 away from the rest of the row
+    domains = {cell: set(range(1, 10)) for unit in UNITS for cell in unit}
+    domains[(0, 0)] = {1, 2}
+    domains[(0, 1)] = {1, 2}
+    removed = AllDifferent().propagate(domains, [(0, 0)])
+    assert removed[(0, 5)] == {1, 2} and domains[(0, 5)] == set(range(3, 10))
+    assert (0, 0) not in removed and (5, 0) not in removed
+
+    # three cells sharing two values cannot be completed: nothing changes
+    domains[(0, 2)] = {1, 2}
+    before = {cell: set(values) for cell, values in domains.items()}
+    assert AllDifferent().propagate(domains, [(0, 0)]) is None
+    assert domains == before
+
+    for fname in ["easy.txt", "hard.txt", "extreme.txt"]:
+        plain = CSPSolver(load_board_from_file(os.path.join("data", fname)), log_steps=False)
+        plain.solve()
+        board = load_board_from_file(os.path.join("data", fname))
+        solver = CSPSolver(board, log_steps=False, use_gac=True)
+        assert solver.solve() and is_valid_solution(board)
+        assert solver.metrics.assignments <= plain.metrics.assignments
+    assert solver.metrics.gac_prunes > 0 and solver.metrics.gac_revisions > 0
+    with pytest.raises(ValueError):
+        CSPSolver(board, use_gac=True, use_cbj=True)
+
+
+def test_dom_wdeg_weights_persist_across_backtracks():
+    from sudoku_core.heuristics import UnitWeights, select_unassigned_variable
+
+    weights = UnitWeights()
+    domains = {(r, c): {1, 2} for r in range(9) for c in range(9)}
+    weights.bump_conflict((4, 4), (4, 0))       # same row only
+    assert weights.unit[4] == 2 and weights.wdeg((4, 7)) == 4 and weights.wdeg((0, 0)) == 3
+    assert select_unassigned_variable(domains, set(), weights=weights) == (4, 0)
+
+    board = load_board_from_file("data/hard.txt")
+    solver = CSPSolver(board, log_steps=False, use_wdeg=True)
+    assert solver.solve() and is_valid_solution(board)
+    # wipe-outs were weighed and nothing was undone when the search backed up
+    assert solver.metrics.backtracks > 0 and sum(solver.weights.unit) > 27
+    assert sum(solver.weights.cell) == 9 * sum(solver.weights.unit)
+    solver.reset(load_board_from_file("data/hard.txt"))
+    assert sum(solver.weights.unit) == 27
+
+
+def test_paused_search_resumes_from_checkpoint(tmp_path, capsys):
+    import json
+    from cli import main
+    from sudoku_core import checkpoint, trace as tr
+
+    class PauseAfter:
+        """Trace stand-in that asks the solver to pause after n assignments."""
+        def __init__(self, n):
+            self.n = n
+            self.solver = None
+
+        def record(self, kind, *args):
+            if kind == tr.ASSIGN:
+                self.n -= 1
+                if self.n == 0:
+                    self.solver.request_pause()
+
+    path = str(tmp_path / "search.ckpt")
+    for options in [{}, {"use_gac": True}, {"use_wdeg": True, "use_ac3": True}]:
+        full = CSPSolver(load_board_from_file("data/extreme.txt"), **options)
+        assert full.solve()
+
+        pauser = PauseAfter(40)
+        solver = CSPSolver(load_board_from_file("data/extreme.txt"), trace=pauser,
+                           checkpoint=path, **options)
+        pauser.solver = solver
+        assert not solver.solve() and solver.status == "paused"
+        paused_at = solver._step_counter
+        assert 0 < solver.metrics.assignments < full.metrics.assignments
+
+        # a new solver from the file makes exactly the choices of the uninterrupted run
+        resumed = CSPSolver.resume(path)
+        assert resumed.solve() and resumed.status == "solved"
+        assert (resumed.board.grid == full.board.grid).all()
+        assert resumed.metrics.assignments == full.metrics.assignments
+        assert resumed.metrics.backtracks == full.metrics.backtracks
+        assert resumed.metrics.gac_prunes == full.metrics.gac_prunes
+        assert resumed.step_log == full.step_log[paused_at:]
+        # so does the paused solver itself
+        assert solver.solve() and solver.metrics.assignments == full.metrics.assignments
+
+    state = checkpoint.load(path)
+    checkpoint.save(path, state)
+    assert checkpoint.load(path) == state and state["frames"]
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 1)
+    with pytest.raises(ValueError):
+        checkpoint.load(path)
+    with pytest.raises(ValueError):
+        CSPSolver(load_board_from_file("data/easy.txt"), checkpoint=path, use_cbj=True)
+
+    # periodic checkpoints from the CLI (every 256 assignments with a zero interval)
+    os.remove(path)
+    assert main(["solve", "--no-lcv", "--checkpoint", path, "--checkpoint-interval", "0",
+                 "data/extreme.txt"]) == 0
+    solved = json.loads(capsys.readouterr().out)
+    assert main(["resume", path]) == 0
+    resumed = json.loads(capsys.readouterr().out)
+    assert (resumed["solution"], resumed["assignments"]) == (solved["solution"], solved["assignments"])
+    assert (resumed["index"], resumed["source"]) == (0, "data/extreme.txt")
+    assert checkpoint.load(path)["origin"] == (0, "data/extreme.txt")
+    # several puzzles would all overwrite the one checkpoint file
+    assert main(["solve", "--checkpoint", path, "data/easy.txt", "data/hard.txt"]) == 2
+    assert "single puzzle" in capsys.readouterr().err
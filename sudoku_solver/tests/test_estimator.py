@@ -0,0 +1,61 @@
+# tests/test_estimator.py
+import json
+
+import numpy as np
+
+from cli import main
+from sudoku_core.board import SudokuBoard
+from sudoku_core.csp_solver import CSPSolver
+from sudoku_core.estimator import estimate_tree_size, progress
+from utils.file_io import load_sudoku
+
+HARD = "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"
+
+
+def _grid(line):
+    return np.array([0 if ch == "." else int(ch) for ch in line]).reshape(9, 9)
+
+
+def test_knuth_estimate_matches_an_exhaustive_search():
+    # a consistent but wrong given: the search has to explore the whole tree
+    grid = _grid(HARD)
+    grid[1, 5] = 2
+    solver = CSPSolver(SudokuBoard(grid), log_steps=False)
+    domains = {cell: set(values) for cell, values in solver.domains.items()}
+    estimate = solver.estimate(probes=64, seed=1)
+    assert solver.domains == domains            # the probes leave the solver alone
+    assert not solver.solve() and solver.status == "unsolvable"
+    assert abs(estimate.nodes - solver.metrics.assignments) < 0.25 * solver.metrics.assignments
+    assert estimate.probes == 64 and estimate.stderr > 0
+
+    # without branching a single probe is the whole search
+    solved = CSPSolver(load_sudoku("data/hard.txt"), log_steps=False)
+    solved.solve()
+    board = solved.board.grid.copy()
+    board[0, :4] = 0
+    solver = CSPSolver(SudokuBoard(board), log_steps=False)
+    estimate = estimate_tree_size(solver.domains, solver.assigned)
+    assert (estimate.nodes, estimate.probes) == (4, 1)
+    assert solver.solve() and solver.metrics.assignments == 4
+
+
+def test_progress_eta_and_routing(capsys):
+    assert progress(1000, 0, 0.0) == (0.0, None)
+    assert progress(1000, 250, 1.0) == (0.25, 3.0)
+    assert progress(1000, 5000, 9.0) == (0.99, None)
+
+    # the solver reports to on_progress every 256 assignments
+    calls = []
+    solver = CSPSolver(SudokuBoard(_grid(HARD)), log_steps=False,
+                       on_progress=lambda s: calls.append(s.metrics.assignments))
+    estimate = solver.estimate()
+    assert solver.solve() and calls == list(range(256, solver.metrics.assignments + 1, 256))
+    fraction, eta = progress(estimate, calls[0], 0.1)
+    assert 0 < fraction < 1 and eta > 0
+
+    assert main(["solve", "--estimate", "8", "data/easy.txt", "data/hard.txt"]) == 0
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert all(r["estimated_nodes"] > 0 and r["engine"] == "python" for r in results)
+    assert main(["solve", "--route-above", "0", "--progress", "0", "data/hard.txt"]) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert result["status"] == "solved" and result["engine"] == "sat"
@@ -97,3 +97,78 @@ def test_invalid_row_length_csv(tmp_path):
     bad_file.write_text("1,2,3,4,5,6,7,8\n1,2,3,4,5,6,7,8")
     with pytest.raises(ValueError):
         load_sudoku(str(bad_file))
+
+
+def test_iter_puzzles_mixed_text_formats(tmp_path):
+    from utils.file_io import iter_puzzles
+
+    line = "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
+    block = load_sudoku("data/easy.txt")
+    file_path = tmp_path / "set.txt"
+    file_path.write_text(line + "\n\n# comment\n" + open("data/easy.txt").read() + "\n" + line + "\n")
+
+    boards = list(iter_puzzles(str(file_path)))
+    assert len(boards) == 3
+    assert boards[0].grid[0, 0] == 5 and boards[0].grid[0, 2] == 0
+    np.testing.assert_array_equal(boards[1].grid, block.grid)
+
+    bad = tmp_path / "bad.txt"
+    bad.write_text("1 2 3 4 5 6 7 8 9\n")
+    with pytest.raises(ValueError):
+        list(iter_puzzles(str(bad)))
+
+
+def test_binary_container_roundtrip(tmp_path):
+    from utils.file_io import (BinaryPuzzleReader, BinaryPuzzleWriter, HEADER_SIZE,
+                               binary_to_text, iter_puzzles, text_to_binary)
+
+    rng = np.random.default_rng(0)
+    puzzles = rng.integers(0, 10, size=(10, 9, 9))
+    solutions = rng.integers(1, 10, size=(10, 9, 9))
+    path = tmp_path / "set.sdkb"
+
+    with BinaryPuzzleWriter(str(path), with_solutions=True, with_metrics=True,
+                            buffer_size=3) as writer:
+        for i in range(10):
+            writer.append(SudokuBoard(puzzles[i]), solutions[i],
+                          {"assignments": i, "backtracks": 2 * i, "time": 0.5})
+    assert path.stat().st_size == HEADER_SIZE + 10 * (41 + 41 + 12)
+
+    with BinaryPuzzleReader(str(path)) as reader:
+        assert len(reader) == 10
+        np.testing.assert_array_equal(reader[7].grid, puzzles[7])
+        np.testing.assert_array_equal(reader.solution(7).grid, solutions[7])
+        np.testing.assert_array_equal(reader.grids(2, 5), puzzles[2:5])
+        assert reader.metrics(3) == {"assignments": 3, "backtracks": 6, "time": 0.5}
+        np.testing.assert_array_equal(np.array([b.grid for b in reader]), puzzles)
+
+    text_path = tmp_path / "set.csv"
+    assert binary_to_text(str(path), str(text_path)) == 10
+    copy_path = tmp_path / "copy.sdkb"
+    assert text_to_binary(str(text_path), str(copy_path)) == 10
+    got = np.array([b.grid for b in iter_puzzles(str(copy_path))])
+    np.testing.assert_array_equal(got, puzzles)
+
+    bad = tmp_path / "bad.sdkb"
+    bad.write_bytes(b"NOPE" + bytes(12))
+    with pytest.raises(ValueError):
+        BinaryPuzzleReader(str(bad))
+
+
+def test_loaders_reject_conflicting_puzzles_when_validating(tmp_path):
+    from utils.file_io import iter_puzzles
+
+    line = "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
+    bad = "55" + line[2:]
+    path = tmp_path / "many.txt"
+    path.write_text(f"{line}\n{line}\n{bad}\n")
+    assert len(list(iter_puzzles(str(path)))) == 3
+    with pytest.raises(ValueError, match=r"#2 .*\(0, 0\), \(0, 1\)"):
+        list(iter_puzzles(str(path), validate=True))
+
+    single = tmp_path / "single.txt"
+    single.write_text("\n".join(" ".join(bad[9 * r:9 * r + 9]).replace(".", "0")
+                                for r in range(9)))
+    assert load_sudoku(str(single)).grid[0, 1] == 5
+    with pytest.raises(ValueError, match="conflicting cells"):
+        load_sudoku(str(single), validate=True)
@@ -0,0 +1,41 @@
+# tests/test_grader.py
+import json
+
+from cli import main
+from sudoku_core.csp_solver import CSPSolver
+from sudoku_core.grader import REQUIRES_SEARCH, grade
+from utils.file_io import load_sudoku
+
+XWING = "1.....569492.561.8.561.924...964.8.1.64.1....218.356.4.4.5...169.5.614.2621.....5"
+
+
+def _cells(line):
+    return [0 if ch == "." else int(ch) for ch in line]
+
+
+def test_grades_follow_the_hardest_technique_and_stay_sound():
+    expected = {"easy.txt": "hidden single", "medium.txt": "naked pair",
+                "hard.txt": REQUIRES_SEARCH, "extreme.txt": REQUIRES_SEARCH}
+    for name, technique in expected.items():
+        board = load_sudoku(f"data/{name}")
+        result = grade(board.grid)
+        assert result["grade"] == technique, name
+        # every placement made by the techniques agrees with the real solution
+        CSPSolver(board, log_steps=False).solve()
+        solution = board.grid.reshape(81).tolist()
+        assert all(v in (0, solution[i]) for i, v in enumerate(result["grid"])), name
+
+    result = grade(_cells(XWING))
+    assert result["grade"] == "x-wing" and result["tier"] == "expert"
+    assert 0 not in result["grid"]
+
+    clash = _cells(XWING)
+    clash[1] = 1
+    assert grade(clash)["grade"] == "invalid"
+
+
+def test_grade_command_pools_jobs(capsys):
+    rc = main(["grade", "-j", "2", "--chunksize", "1", "data/easy.txt", "data/medium.csv"])
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert rc == 0
+    assert [(r["index"], r["tier"]) for r in results] == [(0, "easy"), (1, "hard")]
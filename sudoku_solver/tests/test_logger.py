@@ -0,0 +1,69 @@
+# tests/test_logger.py
+import logging
+import multiprocessing
+import time
+
+from utils import logger as log
+
+
+def _read_until(path, count, timeout=5.0):
+    end = time.monotonic() + timeout
+    while True:
+        log.flush()
+        lines = path.read_text().splitlines() if path.exists() else []
+        if len(lines) >= count or time.monotonic() > end:
+            return lines
+        time.sleep(0.02)
+
+
+def _worker_logs(queue, n):
+    log.init_process_logging(queue)
+    logger = logging.getLogger("test.pool")
+    for i in range(3):
+        logger.info("worker %d line %d", n, i)
+
+
+def test_queued_file_logging_with_rate_limit(tmp_path):
+    path = tmp_path / "logs" / "chatty.log"
+    logger = log.get_logger("test.chatty", str(path), rate_limit=5, burst=5)
+    start = time.perf_counter()
+    for i in range(1000):
+        logger.info("message %d", i)
+    # the caller only enqueues (and mostly drops); it never waits for the file
+    assert time.perf_counter() - start < 1.0
+    lines = _read_until(path, 5)
+    assert len(lines) == 5
+    assert lines[0].endswith("message 0")
+
+    time.sleep(0.25)
+    logger.info("after pause")
+    lines = _read_until(path, 6)
+    assert "after pause" in lines[-1] and "messages suppressed" in lines[-1]
+
+
+def test_worker_processes_are_merged_into_the_parent(tmp_path):
+    path = tmp_path / "pool.log"
+    log.get_logger("test.pool", str(path))
+    queue = log.log_queue()
+    procs = [multiprocessing.Process(target=_worker_logs, args=(queue, n)) for n in range(2)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    lines = _read_until(path, 6)
+    assert sorted(line.split(" - ")[1] for line in lines) == [
+        f"worker {n} line {i}" for n in range(2) for i in range(3)]
+
+
+def test_cli_pool_workers_log_through_the_parent(tmp_path, capsys):
+    from cli import main
+
+    path = tmp_path / "progress.log"
+    log.get_logger("SudokuSolver.worker", str(path))
+    # --progress 0 logs every 256 assignments: 1 line for extreme.txt, 6 for hard.txt
+    assert main(["solve", "--workers", "2", "--no-lcv", "--progress", "0",
+                 "data/extreme.txt", "data/hard.txt"]) == 0
+    lines = _read_until(path, 7)
+    assert sorted(line.split(" - ")[1].split(":")[0] for line in lines) == \
+        ["puzzle 0"] + ["puzzle 1"] * 6
+    assert len(capsys.readouterr().out.splitlines()) == 2
@@ -0,0 +1,80 @@
+# tests/test_sat_solver.py
+import io
+import json
+import random
+
+import numpy as np
+
+from cli import main
+from sudoku_core.board import SudokuBoard
+from sudoku_core.candidates import CandidateEngine
+from sudoku_core.csp_solver import CSPSolver
+from sudoku_core.sat_solver import SATSolver, givens_valid, variable, write_dimacs
+from utils.file_io import load_sudoku
+
+HARD = "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"
+
+
+def _solved(grid):
+    board = SudokuBoard(grid.copy())
+    solver = SATSolver(board, log_steps=False)
+    assert solver.solve() and solver.status == "solved"
+    # a complete, valid grid that keeps the givens (extreme.txt has several solutions)
+    assert board.grid.min() > 0 and givens_valid(board.grid)
+    assert (board.grid[grid > 0] == grid[grid > 0]).all()
+    assert CSPSolver(SudokuBoard(grid.copy()), log_steps=False).solve()
+    return solver
+
+
+def test_sat_backend_solves_and_exports_dimacs(tmp_path):
+    for name in ["easy.txt", "medium.txt", "hard.txt", "extreme.txt"]:
+        _solved(load_sudoku(f"data/{name}").grid)
+    solver = _solved(np.array([0 if ch == "." else int(ch) for ch in HARD]).reshape(9, 9))
+    assert solver.metrics.backtracks > 0 and solver.domains[(0, 0)] == {4}
+
+    # every clause of the DIMACS export is satisfied by the solution
+    board = load_sudoku("data/hard.txt")
+    out = io.StringIO()
+    write_dimacs(board.grid, out)
+    SATSolver(board, log_steps=False).solve()
+    true = {variable(r, c, int(board.grid[r, c])) for r in range(9) for c in range(9)}
+    header, *clauses = [line for line in out.getvalue().splitlines() if not line.startswith("c")]
+    assert header == f"p cnf 729 {len(clauses)}"
+    for line in clauses:
+        lits = [int(x) for x in line.split()]
+        assert lits[-1] == 0
+        assert any((x > 0) == (abs(x) in true) for x in lits[:-1]), line
+
+    assert main(["cnf", "-o", str(tmp_path), "data/easy.txt"]) == 0
+    assert (tmp_path / "easy-0.cnf").read_text().startswith("c sudoku 9x9")
+
+
+def test_sat_statuses_warm_start_and_large_boards(capsys):
+    clash = load_sudoku("data/easy.txt").grid
+    clash[0, :2] = 9
+    assert not SATSolver(clash).solve()
+
+    dead = np.zeros((9, 9), dtype=int)
+    dead[0, 1:] = range(1, 9)
+    dead[1, 0] = 9
+    solver = SATSolver(dead)
+    assert not solver.solve() and solver.status == "unsolvable"
+
+    board = load_sudoku("data/medium.txt")
+    solver = SATSolver(board, domains=CandidateEngine(board.grid).domains())
+    assert solver.solve() and solver.step_log
+
+    # 16x16 and 25x25 boards: a pattern solution with cells blanked out
+    rng = random.Random(5)
+    for n, holes in [(4, 180), (5, 320)]:
+        size = n * n
+        grid = np.array([[(n * (r % n) + r // n + c) % size + 1 for c in range(size)]
+                         for r in range(size)])
+        for k in rng.sample(range(size * size), holes):
+            grid.flat[k] = 0
+        board = SudokuBoard(grid)
+        assert SATSolver(board, log_steps=False).solve()
+        assert board.grid.min() > 0 and givens_valid(board.grid)
+
+    assert main(["solve", "--engine", "sat", "data/hard.txt"]) == 0
+    assert json.loads(capsys.readouterr().out)["status"] == "solved"
@@ -0,0 +1,61 @@
+# tests/test_service.py
+import asyncio
+
+from service import SolverClient, SolverService, parse_puzzle
+from utils.timer import REGISTRY
+
+LINE = "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
+
+
+def test_service_batches_and_streams_results(tmp_path):
+    REGISTRY.clear()
+
+    async def scenario():
+        service = SolverService(workers=1, batch_window=0.01, max_pending=4)
+        path = await service.start_unix(str(tmp_path / "solver.sock"))
+        client = await SolverClient.connect(path=path)
+        try:
+            results = await asyncio.gather(
+                *(client.solve(LINE) for _ in range(10)),
+                client.solve("55" + LINE[2:]),
+                client.solve("123"),
+                client.solve(LINE, deadline=0),
+                client.solve(LINE, deadline="2"),
+                client.solve(LINE, deadline=[]),
+                client.solve(LINE, deadline=-1),
+                client.solve(LINE, deadline=5),
+            )
+        finally:
+            await client.close()
+            await service.close()
+        return results, service.stats
+
+    results, stats = asyncio.run(scenario())
+    assert [r["status"] for r in results[:10]] == ["solved"] * 10
+    assert results[0]["solution"].startswith("534678912")
+    assert all(r["latency"] >= 0 for r in results[:10])
+    assert [r["status"] for r in results[10:]] == ["invalid", "error", "deadline_exceeded",
+                                                   "error", "error", "error", "solved"]
+    assert "deadline" in results[13]["error"]
+    # requests that arrived together were grouped into fewer round trips
+    assert stats["batches"] < 11
+    # the worker's timings were merged on close(): the invalid puzzle is propagated, not searched
+    assert REGISTRY.histogram("propagate").count == 12
+    assert REGISTRY.histogram("solve.csp").count == 11
+
+
+def test_batch_deadlines_count_the_jobs_ahead_in_the_worker():
+    import time
+    import numpy as np
+    from utils.file_io import load_sudoku
+    from worker import init_worker, solve_batch
+
+    hard = load_sudoku("data/hard.txt").grid.astype(np.uint8).tobytes()
+    easy = parse_puzzle(LINE)
+    init_worker({"use_mrv": False})        # hard.txt then takes seconds
+    deadline = time.monotonic() + 0.3
+    results = solve_batch([((0, "a", hard), deadline), ((1, "b", easy), deadline),
+                           ((2, "c", easy), None)])
+    # the easy puzzle would fit in 0.3 s on its own, but the hard one used it all up
+    assert [r["status"] for r in results] == ["timeout", "deadline_exceeded", "solved"]
+    assert results[1]["index"] == 1 and results[1]["solution"] is None
@@ -0,0 +1,32 @@
+# tests/test_step_log.py
+import numpy as np
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from gui.step_log import FILTERS, StepLogModel
+from sudoku_core import trace as tr
+
+
+def test_model_appends_in_batches_and_filters_without_text():
+    recorder = tr.TraceRecorder(np.zeros((9, 9), dtype=int))
+    model = StepLogModel()
+    model.set_reader(tr.TraceReader(recorder))
+    inserted = []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+
+    for cell in range(6):
+        recorder.record(tr.SELECT, cell, 0, cell, 0b10)
+        recorder.record(tr.ASSIGN, cell, 1, cell)
+    recorder.record(tr.BACKTRACK, 5, 1, 5)
+    model.sync()
+    assert inserted == [(0, 12)]
+    assert model.text(1) == "Step 2:     Assigned (0,0)=1"
+
+    model.set_filter(FILTERS["Assignments & backtracks"])
+    assert model.rowCount() == 7
+    assert model.text(6) == "Step 13:   Backtrack from (0,5)=1"
+    assert model.row_for_step(4) == 1 and model.row_for_step(1) == -1
+    assert model.find("(0,3)") == 3
+    assert model.find("(0,5)", 5) == 6
+    assert model.find("nothing") == -1
@@ -0,0 +1,70 @@
+# tests/test_timer.py
+import json
+import random
+import threading
+from multiprocessing import Pool
+
+from cli import main
+from utils.timer import (Histogram, REGISTRY, Timer, TimingRegistry, collect_process_timings,
+                         init_process_timing, timeit, timing_queue)
+
+
+def _timed_job(n):
+    REGISTRY.record("job", n * 1000)
+    return n
+
+
+def test_histogram_percentiles_merge_and_threads(capsys):
+    rng = random.Random(3)
+    values = [rng.randrange(1, 10 ** 7) for _ in range(5000)]
+    h = Histogram()
+    for ns in values:
+        h.record(ns)
+    values.sort()
+    for q in (50, 90, 99):
+        exact = values[int(q / 100 * len(values)) - 1]
+        assert abs(h.percentile(q) - exact) <= 0.125 * exact
+    assert (h.min, h.max, h.count, h.total) == (values[0], values[-1], 5000, sum(values))
+
+    # four threads, one label: nothing is lost
+    registry = TimingRegistry()
+    threads = [threading.Thread(target=lambda: [registry.record("t", 5) for _ in range(2000)])
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    other = TimingRegistry()
+    other.record("t", 7)
+    registry.merge(other.snapshot())
+    assert registry.histogram("t").count == 8001 and registry.report()["t"]["max_us"] == 0.007
+
+    @timeit(label="test.decorated", registry=registry)
+    def work():
+        return 42
+
+    with Timer("test.block", registry) as timer:
+        assert work() == 42
+    assert timer.elapsed > 0 and registry.labels() == ["t", "test.block", "test.decorated"]
+    assert capsys.readouterr().out == ""        # nothing is printed any more
+
+
+def test_pool_workers_and_cli_timings_are_merged(tmp_path):
+    REGISTRY.clear()
+    queue = timing_queue()
+    with Pool(2, initializer=init_process_timing, initargs=(queue,)) as pool:
+        assert sum(pool.map(_timed_job, range(1, 11), chunksize=1)) == 55
+        pool.close()
+        pool.join()
+    assert collect_process_timings(queue, 2) == 2
+    job = REGISTRY.histogram("job")
+    assert job.count == 10 and job.total == 55000
+
+    path = tmp_path / "timings.json"
+    assert main(["solve", "-j", "2", "--timings", str(path), "data/easy.txt",
+                 "data/hard.txt"]) == 0
+    report = json.loads(path.read_text())
+    assert report["solve.csp"]["count"] == 2 and report["load"]["count"] == 2
+    # one propagation per puzzle, none for the workers' setup
+    assert report["propagate"]["count"] == 2
+    assert report["validate"]["p50_us"] > 0
@@ -0,0 +1,65 @@
+# tests/test_trace.py
+import numpy as np
+import pytest
+
+from sudoku_core.csp_solver import CSPSolver
+from sudoku_core import trace as tr
+from utils.file_io import load_sudoku
+
+
+def test_trace_records_solve_and_rebuilds_any_step(tmp_path):
+    board = load_sudoku("data/hard.txt")
+    initial = board.grid.copy()
+    path = tmp_path / "hard.trace"
+    recorder = tr.TraceRecorder(initial, str(path), checkpoint_interval=16)
+    solver = CSPSolver(board, trace=recorder)
+    assert solver.solve()
+    recorder.close()
+
+    reader = tr.TraceReader(str(path))
+    m = solver.metrics.summary()
+    kinds = [event[0] for event in reader.events()]
+    assert kinds.count(tr.ASSIGN) == m["assignments"]
+    assert kinds.count(tr.BACKTRACK) == m["backtracks"]
+
+    # checkpoint + replay gives the same board as replaying from the start
+    grid = list(initial.reshape(81))
+    assert reader.grid_at(0) == grid
+    for step, (kind, cell, value, _, _) in enumerate(reader.events(), start=1):
+        if kind == tr.ASSIGN:
+            grid[cell] = value
+        elif kind == tr.BACKTRACK:
+            grid[cell] = 0
+        if step % 7 == 0 or step == len(reader):
+            assert reader.grid_at(step) == grid
+    np.testing.assert_array_equal(np.array(reader.grid_at(len(reader))).reshape(9, 9),
+                                  board.grid)
+    assert reader.describe(0).startswith("Select cell")
+
+    with pytest.raises(ValueError):
+        tr.TraceReader(b"NOPE" + bytes(200))
+
+
+def test_in_memory_trace_matches_file_layout():
+    recorder = tr.TraceRecorder(np.zeros((9, 9), dtype=int), checkpoint_interval=2)
+    for i in range(5):
+        recorder.record(tr.ASSIGN, i, i + 1)
+    reader = recorder.reader()
+    assert len(reader) == 5
+    assert reader.grid_at(5)[:6] == [1, 2, 3, 4, 5, 0]
+    assert reader.grid_at(3)[:4] == [1, 2, 3, 0]
+
+
+def test_live_reader_follows_a_running_recorder():
+    recorder = tr.TraceRecorder(np.zeros((9, 9), dtype=int), checkpoint_interval=4)
+    live = tr.TraceReader(recorder)
+    assert live.live and len(live) == 0
+    for i in range(10):
+        recorder.record(tr.ASSIGN, i, i % 9 + 1)
+        assert len(live) == i + 1
+        assert live.grid_at(i + 1) == list(recorder.grid)
+    recorder.record(tr.BACKTRACK, 9, 1)
+    assert live.grid_at(11)[9] == 0
+    snapshot = recorder.reader()
+    assert not snapshot.live
+    assert list(snapshot.events()) == list(live.events())
@@ -1,10 +1,14 @@
 # utils/file_io.py
 import os
 import csv
+import struct
 import numpy as np
 from sudoku_core.board import SudokuBoard
+from sudoku_core.validator import conflicting_cells
+from utils.timer import timeit
 
-def load_sudoku(file_path: str) -> SudokuBoard:
+@timeit(label="load")
+def load_sudoku(file_path: str, validate=False) -> SudokuBoard:
     """
     Load a Sudoku puzzle from .txt or .csv file.
     Returns a SudokuBoard instance.
@@ -12,6 +16,9 @@ def load_sudoku(file_path: str) -> SudokuBoard:
     Supports:
         - .txt : space- or comma-separated numbers, '.' or '0' for empty cells
         - .csv : comma-separated values
+
+    validate: raise ValueError if the puzzle breaks a Sudoku constraint
+              (the conflicting cells are listed in the message)
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
@@ -24,6 +31,10 @@ def load_sudoku(file_path: str) -> SudokuBoard:
     else:
         raise ValueError("Unsupported file format. Use .txt or .csv")
 
+    if validate:
+        cells = conflicting_cells(grid)
+        if cells:
+            raise ValueError(f"Invalid puzzle in {file_path}, conflicting cells: {cells}")
     return SudokuBoard(grid)
 
 def _load_txt(file_path):
@@ -84,3 +95,307 @@ def save_sudoku(board: SudokuBoard, file_path: str):
             writer.writerows(grid)
     else:
         raise ValueError("Unsupported file format. Use .txt or .csv")
+
+
+# ---------------------------------------------------------------------------
+# Multi-puzzle text files
+# ---------------------------------------------------------------------------
+
+def _parse_line(line):
+    """Parse one text line into a list of ints ('.', '0' and '' are empty cells)."""
+    if len(line) == 81 and "," not in line and " " not in line:
+        # compact one-puzzle-per-line form: "53..7...."
+        return [0 if ch == "." else int(ch) for ch in line]
+    return [0 if x in {".", "0"} else int(x) for x in line.replace(",", " ").split()]
+
+def iter_puzzles(file_path: str, validate=False):
+    """
+    Stream SudokuBoard instances from a dataset file without reading it whole.
+    validate: check the puzzles in batches (see _validated) and raise
+              ValueError at the first one that breaks a Sudoku constraint
+
+    Supports:
+        - .txt / .csv : any mix of 81-value lines (one puzzle per line) and
+                        9-line blocks like the single-board format; blank
+                        lines and lines starting with '#' are skipped
+        - .sdkb       : binary container (see BinaryPuzzleReader)
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == BINARY_EXT:
+        with BinaryPuzzleReader(file_path) as reader:
+            yield from (_validated(reader, file_path) if validate else reader)
+        return
+    if ext not in (".txt", ".csv"):
+        raise ValueError("Unsupported file format. Use .txt, .csv or .sdkb")
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        boards = parse_puzzles(f, file_path)
+        yield from (_validated(boards, file_path) if validate else boards)
+
+def _validated(boards, source, batch_size=4096):
+    """Pass boards through, checking them batch_size at a time with one vectorized call."""
+    index = 0
+    batch = []
+    for board in boards:
+        batch.append(board)
+        if len(batch) == batch_size:
+            yield from _check_batch(batch, source, index)
+            index += len(batch)
+            batch = []
+    yield from _check_batch(batch, source, index)
+
+def _check_batch(batch, source, first_index):
+    if not batch:
+        return
+    for offset, cells in enumerate(conflicting_cells(np.stack([b.grid for b in batch]))):
+        if cells:
+            raise ValueError(f"Invalid puzzle #{first_index + offset} in {source}, "
+                             f"conflicting cells: {cells}")
+    yield from batch
+
+def parse_puzzles(lines, source="<input>"):
+    """
+    Parse SudokuBoard instances from an iterable of text lines (an open file,
+    sys.stdin, ...) in the multi-puzzle text format described in iter_puzzles.
+    """
+    rows = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        values = _parse_line(line)
+        if len(values) == 81 and not rows:
+            yield SudokuBoard(np.array(values, dtype=int).reshape(9, 9))
+            continue
+        if len(values) != 9:
+            raise ValueError(f"Invalid row length in {source}: {line}")
+        rows.append(values)
+        if len(rows) == 9:
+            yield SudokuBoard(rows)
+            rows = []
+    if rows:
+        raise ValueError(f"Incomplete puzzle at end of {source}: {len(rows)} rows")
+
+
+# ---------------------------------------------------------------------------
+# Binary container (.sdkb)
+#
+#   header : magic "SDKB", version u8, flags u8, record size u16, count u64
+#   record : puzzle (41 bytes, 4 bits per cell, row-major, high nibble first)
+#            [solution (41 bytes, same packing)]      if flags & FLAG_SOLUTION
+#            [assignments u32, backtracks u32, time f32]  if flags & FLAG_METRICS
+#
+# Records are fixed size, so record i starts at HEADER_SIZE + i * record_size.
+# ---------------------------------------------------------------------------
+
+BINARY_EXT = ".sdkb"
+BINARY_MAGIC = b"SDKB"
+BINARY_VERSION = 1
+FLAG_SOLUTION = 0x01
+FLAG_METRICS = 0x02
+_HEADER = struct.Struct("<4sBBHQ")
+HEADER_SIZE = _HEADER.size
+PACKED_SIZE = 41  # ceil(81 / 2)
+
+def _record_dtype(flags):
+    fields = [("puzzle", np.uint8, (PACKED_SIZE,))]
+    if flags & FLAG_SOLUTION:
+        fields.append(("solution", np.uint8, (PACKED_SIZE,)))
+    if flags & FLAG_METRICS:
+        fields += [("assignments", "<u4"), ("backtracks", "<u4"), ("time", "<f4")]
+    return np.dtype(fields)
+
+def pack_grids(grids) -> np.ndarray:
+    """Pack an (N,9,9) array of digits 0-9 into (N,41) bytes, two cells per byte."""
+    cells = np.asarray(grids, dtype=np.uint8).reshape(-1, 81)
+    if cells.size and cells.max() > 9:
+        raise ValueError("Cell values must be in 0..9")
+    padded = np.zeros((cells.shape[0], PACKED_SIZE * 2), dtype=np.uint8)
+    padded[:, :81] = cells
+    return (padded[:, 0::2] << 4) | padded[:, 1::2]
+
+def unpack_grids(packed) -> np.ndarray:
+    """Inverse of pack_grids: (N,41) bytes -> (N,9,9) int array."""
+    packed = np.asarray(packed, dtype=np.uint8).reshape(-1, PACKED_SIZE)
+    cells = np.empty((packed.shape[0], PACKED_SIZE * 2), dtype=np.uint8)
+    cells[:, 0::2] = packed >> 4
+    cells[:, 1::2] = packed & 0x0F
+    return cells[:, :81].reshape(-1, 9, 9).astype(int)
+
+class BinaryPuzzleWriter:
+    """
+    Buffered writer for .sdkb files.
+    Records are collected in a preallocated array and written in blocks of
+    buffer_size; the record count in the header is patched on close().
+    """
+    def __init__(self, file_path: str, with_solutions=False, with_metrics=False,
+                 buffer_size=4096):
+        self.flags = (FLAG_SOLUTION if with_solutions else 0) | (FLAG_METRICS if with_metrics else 0)
+        self.dtype = _record_dtype(self.flags)
+        self.count = 0
+        self._buffer = np.zeros(buffer_size, dtype=self.dtype)
+        self._grids = np.zeros((buffer_size, 9, 9), dtype=np.uint8)
+        self._solutions = np.zeros((buffer_size, 9, 9), dtype=np.uint8)
+        self._pending = 0
+        self._file = open(file_path, "wb")
+        self._file.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, self.flags,
+                                      self.dtype.itemsize, 0))
+
+    def append(self, puzzle, solution=None, metrics=None):
+        """
+        Add one record.
+        puzzle / solution: SudokuBoard or 9x9 array
+        metrics: dict with 'assignments', 'backtracks' and 'time' (Metrics.summary())
+        """
+        i = self._pending
+        self._grids[i] = getattr(puzzle, "grid", puzzle)
+        if self.flags & FLAG_SOLUTION:
+            if solution is None:
+                raise ValueError("This file stores solutions; solution is required")
+            self._solutions[i] = getattr(solution, "grid", solution)
+        if self.flags & FLAG_METRICS:
+            metrics = metrics or {}
+            rec = self._buffer[i]
+            rec["assignments"] = metrics.get("assignments") or 0
+            rec["backtracks"] = metrics.get("backtracks") or 0
+            rec["time"] = metrics.get("time") or 0.0
+        self._pending += 1
+        if self._pending == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        n = self._pending
+        if n == 0:
+            return
+        block = self._buffer[:n]
+        block["puzzle"] = pack_grids(self._grids[:n])
+        if self.flags & FLAG_SOLUTION:
+            block["solution"] = pack_grids(self._solutions[:n])
+        self._file.write(block.tobytes())
+        self.count += n
+        self._pending = 0
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, self.flags,
+                                      self.dtype.itemsize, self.count))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class BinaryPuzzleReader:
+    """
+    Memory-mapped reader for .sdkb files with random access by index.
+    reader[i] returns a SudokuBoard; grids()/solutions() unpack whole slices
+    at once as (N,9,9) arrays.
+    """
+    def __init__(self, file_path: str):
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        with open(file_path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) != HEADER_SIZE:
+            raise ValueError(f"Truncated header in {file_path}")
+        magic, version, flags, record_size, count = _HEADER.unpack(header)
+        if magic != BINARY_MAGIC:
+            raise ValueError(f"Not a {BINARY_EXT} file: {file_path}")
+        if version != BINARY_VERSION:
+            raise ValueError(f"Unsupported {BINARY_EXT} version: {version}")
+        self.flags = flags
+        self.dtype = _record_dtype(flags)
+        if record_size != self.dtype.itemsize:
+            raise ValueError(f"Corrupt header in {file_path}: record size {record_size}")
+        expected = HEADER_SIZE + count * record_size
+        if os.path.getsize(file_path) < expected:
+            raise ValueError(f"Truncated file {file_path}: expected {count} records")
+        self.count = count
+        if count:
+            self._records = np.memmap(file_path, dtype=self.dtype, mode="r",
+                                      offset=HEADER_SIZE, shape=(count,))
+        else:
+            self._records = np.zeros(0, dtype=self.dtype)
+
+    @property
+    def has_solutions(self):
+        return bool(self.flags & FLAG_SOLUTION)
+
+    @property
+    def has_metrics(self):
+        return bool(self.flags & FLAG_METRICS)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index) -> SudokuBoard:
+        return SudokuBoard(unpack_grids(self._records[index]["puzzle"])[0])
+
+    def __iter__(self, chunk_size=4096):
+        for start in range(0, self.count, chunk_size):
+            for grid in self.grids(start, start + chunk_size):
+                yield SudokuBoard(grid)
+
+    def grids(self, start=0, stop=None) -> np.ndarray:
+        """Puzzles start..stop as an (N,9,9) array."""
+        return unpack_grids(self._records[start:stop]["puzzle"])
+
+    def solution(self, index) -> SudokuBoard:
+        if not self.has_solutions:
+            raise ValueError("File has no solution column")
+        return SudokuBoard(unpack_grids(self._records[index]["solution"])[0])
+
+    def solutions(self, start=0, stop=None) -> np.ndarray:
+        if not self.has_solutions:
+            raise ValueError("File has no solution column")
+        return unpack_grids(self._records[start:stop]["solution"])
+
+    def metrics(self, index) -> dict:
+        if not self.has_metrics:
+            raise ValueError("File has no metrics column")
+        rec = self._records[index]
+        return {"assignments": int(rec["assignments"]),
+                "backtracks": int(rec["backtracks"]),
+                "time": float(rec["time"])}
+
+    def close(self):
+        # dropping the memmap unmaps the file once no slices still refer to it
+        self._records = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def text_to_binary(src_path: str, dst_path: str, buffer_size=4096) -> int:
+    """Stream puzzles from a .txt/.csv dataset into a .sdkb file. Returns the record count."""
+    with BinaryPuzzleWriter(dst_path, buffer_size=buffer_size) as writer:
+        for board in iter_puzzles(src_path):
+            writer.append(board)
+    return writer.count
+
+def binary_to_text(src_path: str, dst_path: str, chunk_size=4096) -> int:
+    """
+    Stream puzzles from a .sdkb file into a text dataset, one puzzle per line
+    (81 digits for .txt, 81 comma-separated values for .csv).
+    Returns the record count.
+    """
+    ext = os.path.splitext(dst_path)[1].lower()
+    if ext not in (".txt", ".csv"):
+        raise ValueError("Unsupported file format. Use .txt or .csv")
+    sep = "," if ext == ".csv" else ""
+    with BinaryPuzzleReader(src_path) as reader, \
+            open(dst_path, "w", encoding="utf-8") as f:
+        for start in range(0, len(reader), chunk_size):
+            for cells in reader.grids(start, start + chunk_size).reshape(-1, 81):
+                f.write(sep.join(map(str, cells.tolist())) + "\n")
+        return len(reader)
@@ -1,25 +1,230 @@
 # utils/logger.py
+"""
+Non-blocking logging.
+
+Loggers returned by get_logger() only put records on a queue. A single
+background QueueListener thread formats them and writes them to the console
+and log files, so a slow terminal or disk never stalls the UI thread or
+the solver.
+
+Multiprocessing: call log_queue() in the parent and pass the queue to each
+worker's init_process_logging() (e.g. via a Pool initializer). Records from
+all workers are then merged into the parent's listener.
+
+Chatty sources can be rate limited with get_logger(..., rate_limit=N). At
+most N records per second are passed on, with bursts of up to `burst`. Dropped
+records are counted and reported in the next record that gets through.
+"""
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import sys
+import threading
+import time
+
+_FORMATTER = logging.Formatter("[%(levelname)s] %(asctime)s - %(message)s", "%H:%M:%S")
+
+_lock = threading.Lock()
+_queue = None            # queue the loggers of this process write to
+_listener = None         # background thread draining _queue
+_router = None
+_process_queue = None    # multiprocessing queue merged into _listener
+_forwarders = []
+_worker = False          # True after init_process_logging(): records go to the parent
+
+
+class _ConsoleHandler(logging.StreamHandler):
+    """Writes to whatever sys.stderr is when the record is handled (it may be swapped at runtime)."""
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(_FORMATTER)
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class _Router(logging.Handler):
+    """Listener-side handler: sends each record to the handlers of its logger."""
+    def __init__(self):
+        super().__init__()
+        self.routes = {}
+        self.default = _ConsoleHandler()
 
-def get_logger(name="SudokuSolver", log_file=None, level=logging.INFO):
+    def add(self, name, handler):
+        self.routes.setdefault(name, []).append(handler)
+
+    def emit(self, record):
+        event = getattr(record, "flush_event", None)
+        if event is not None:
+            self.flush()
+            event.set()
+            return
+        for handler in self.routes.get(record.name) or (self.default,):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def flush(self):
+        for handlers in self.routes.values():
+            for handler in handlers:
+                handler.flush()
+        self.default.flush()
+
+    def close(self):
+        for handlers in self.routes.values():
+            for handler in handlers:
+                handler.close()
+        self.default.close()
+        super().close()
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket: passes at most `rate` records per second (bursts of `burst`).
+    Runs on the caller's side of the queue, so dropped records cost almost nothing.
+    """
+    def __init__(self, rate, burst=None):
+        super().__init__()
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens < 1.0:
+                self._dropped += 1
+                return False
+            self._tokens -= 1.0
+            dropped, self._dropped = self._dropped, 0
+        if dropped:
+            record.msg = f"{record.getMessage()} ({dropped} messages suppressed)"
+            record.args = None
+        return True
+
+
+def _ensure_listener():
+    """Start this process's queue and listener thread on first use (or again after shutdown())."""
+    global _queue, _listener, _router
+    with _lock:
+        if _queue is None:
+            _queue = queue.SimpleQueue()
+            _router = _Router()
+            atexit.register(shutdown)
+        if _listener is None:
+            _listener = logging.handlers.QueueListener(_queue, _router)
+            _listener.start()
+    return _queue
+
+
+def get_logger(name="SudokuSolver", log_file=None, level=logging.INFO, rate_limit=None,
+               burst=None):
     """
     Create or get a logger instance.
-    Outputs to console and (optionally) to a file.
+    Outputs to console and (optionally) to a file, from a background thread.
+    rate_limit: maximum records per second for this logger (None = unlimited).
     """
     logger = logging.getLogger(name)
     logger.setLevel(level)
 
     if not logger.handlers:  # avoid duplicate handlers
-        formatter = logging.Formatter("[%(levelname)s] %(asctime)s - %(message)s", "%H:%M:%S")
-        stream_handler = logging.StreamHandler()
-        stream_handler.setFormatter(formatter)
-        logger.addHandler(stream_handler)
+        queue_handler = logging.handlers.QueueHandler(_queue if _worker else _ensure_listener())
+        if rate_limit is not None:
+            queue_handler.addFilter(RateLimitFilter(rate_limit, burst))
+        logger.addHandler(queue_handler)
+        # records reach the real handlers through the listener, not the root logger
+        logger.propagate = False
+
+        if not _worker:
+            _router.add(name, _ConsoleHandler())
 
-        if log_file:
-            os.makedirs(os.path.dirname(log_file), exist_ok=True)
-            file_handler = logging.FileHandler(log_file, encoding="utf-8")
-            file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            if log_file:
+                os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+                file_handler = logging.FileHandler(log_file, encoding="utf-8")
+                file_handler.setFormatter(_FORMATTER)
+                _router.add(name, file_handler)
 
     return logger
+
+
+def log_queue():
+    """
+    Multiprocessing queue whose records are merged into this process's log output.
+    Pass it to init_process_logging() in each worker process.
+    """
+    global _process_queue
+    _ensure_listener()
+    with _lock:
+        if _process_queue is None:
+            import multiprocessing
+            _process_queue = multiprocessing.Queue()
+            # a second listener drains the worker queue into the local one
+            forward = logging.handlers.QueueListener(_process_queue, _Forward(_queue))
+            forward.start()
+            _forwarders.append(forward)
+    return _process_queue
+
+
+class _Forward(logging.Handler):
+    """Moves records from the multiprocessing queue onto the local listener's queue."""
+    def __init__(self, target):
+        super().__init__()
+        self.target = target
+
+    def emit(self, record):
+        self.target.put_nowait(record)
+
+
+def init_process_logging(process_queue):
+    """
+    Worker-process setup: every get_logger() logger in this process sends its
+    records to process_queue (from log_queue() in the parent) instead of
+    writing them here.
+    """
+    global _queue, _worker
+    with _lock:
+        _queue = process_queue
+        _worker = True
+    for logger in logging.Logger.manager.loggerDict.values():
+        if isinstance(logger, logging.Logger):
+            for handler in logger.handlers:
+                if isinstance(handler, logging.handlers.QueueHandler):
+                    handler.queue = process_queue
+
+
+def flush(timeout=1.0):
+    """Wait until the records queued so far in this process have been written."""
+    if _listener is None:
+        return
+    record = logging.makeLogRecord({"msg": ""})
+    record.flush_event = threading.Event()
+    _queue.put_nowait(record)
+    record.flush_event.wait(timeout)
+
+
+def shutdown():
+    """
+    Flush queued records and stop the listener threads (also run at exit).
+    Call it after joining worker processes to write everything they logged.
+    The next get_logger() or log_queue() starts the listener again.
+    """
+    global _listener, _process_queue
+    for forward in _forwarders:
+        forward.stop()
+    _forwarders.clear()
+    _process_queue = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+        _router.flush()
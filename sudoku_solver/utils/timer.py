@@ -1,29 +1,269 @@
 # utils/timer.py
+"""
+Application-wide timing registry.
+
+Every timing (Timer blocks, @timeit functions and the solver phases: load,
+validate, propagate, solve, render) is recorded in nanoseconds
+(time.perf_counter_ns) into a per-label histogram of the process-wide
+REGISTRY. Nothing is printed. A record is a lock and a couple of integer
+operations, cheap enough for hot paths.
+
+Histograms are log-linear: 8 buckets per power of two, so percentiles are
+within 12.5% (values below 8 ns are exact). They only hold counts, so merging
+two histograms is adding them up.
+
+Multiprocessing: call timing_queue() in the parent and pass the queue to each
+worker's init_process_timing() (e.g. via a Pool initializer). A worker sends
+its timings to the parent when it exits, and collect_process_timings()
+merges them into the parent's REGISTRY.
+
+    with Timer("load"):
+        ...
+    REGISTRY.report()          -> {label: {"count": ..., "p50_us": ..., ...}}
+    REGISTRY.write_json(path)
+"""
+import json
+import os
+import sys
+import threading
 import time
 from functools import wraps
 
+SUB_BITS = 3                    # 2**SUB_BITS buckets per power of two
+_SUB = 1 << SUB_BITS
+PERCENTILES = (50, 90, 99)
+
+
+def _bucket(ns):
+    """Histogram bucket of a duration in nanoseconds."""
+    if ns < _SUB:
+        return max(ns, 0)
+    shift = ns.bit_length() - 1 - SUB_BITS
+    return _SUB * (shift + 1) + ((ns >> shift) - _SUB)
+
+
+def _bucket_range(index):
+    """[low, high) nanoseconds covered by a bucket."""
+    if index < _SUB:
+        return index, index + 1
+    shift = index // _SUB - 1
+    low = (_SUB + index % _SUB) << shift
+    return low, low + (1 << shift)
+
+
+class Histogram:
+    """Count, total, min, max and bucketed counts of one label's durations (ns)."""
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, ns):
+        b = _bucket(ns)
+        self.counts[b] = self.counts.get(b, 0) + 1
+        self.count += 1
+        self.total += ns
+        if self.min is None or ns < self.min:
+            self.min = ns
+        if self.max is None or ns > self.max:
+            self.max = ns
+
+    def merge(self, other):
+        for b, n in other.counts.items():
+            self.counts[b] = self.counts.get(b, 0) + n
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def percentile(self, q):
+        """Approximate q-th percentile in ns (middle of its bucket, clamped to min/max)."""
+        if not self.count:
+            return None
+        rank = q / 100.0 * self.count
+        seen = 0
+        for b in sorted(self.counts):
+            seen += self.counts[b]
+            if seen >= rank:
+                low, high = _bucket_range(b)
+                return min(max((low + high - 1) / 2, self.min), self.max)
+        return self.max
+
+    def summary(self, percentiles=PERCENTILES):
+        """JSON-ready dict: count, total in seconds, mean/min/max and percentiles in µs."""
+        out = {"count": self.count, "total_s": self.total / 1e9}
+        if self.count:
+            out["mean_us"] = self.total / self.count / 1e3
+            out["min_us"] = self.min / 1e3
+            for q in percentiles:
+                out[f"p{q:g}_us"] = self.percentile(q) / 1e3
+            out["max_us"] = self.max / 1e3
+        return out
+
+
+class TimingRegistry:
+    """Thread-safe map of label -> Histogram. Use the module-level REGISTRY."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def _after_fork(self):
+        # the lock may have been held by another thread of the parent
+        self._lock = threading.Lock()
+
+    def record(self, label, ns):
+        with self._lock:
+            h = self._histograms.get(label)
+            if h is None:
+                h = self._histograms[label] = Histogram()
+            h.record(ns)
+
+    def histogram(self, label):
+        """Copy of one label's histogram (empty if nothing was recorded)."""
+        h = Histogram()
+        with self._lock:
+            if label in self._histograms:
+                h.merge(self._histograms[label])
+        return h
+
+    def labels(self):
+        with self._lock:
+            return sorted(self._histograms)
+
+    def snapshot(self):
+        """Picklable copy of all histograms: {label: (counts, count, total, min, max)}."""
+        with self._lock:
+            return {label: (dict(h.counts), h.count, h.total, h.min, h.max)
+                    for label, h in self._histograms.items()}
+
+    def merge(self, snapshot):
+        """Add a snapshot() (e.g. from another process) to this registry."""
+        with self._lock:
+            for label, (counts, count, total, lo, hi) in snapshot.items():
+                other = Histogram()
+                other.counts, other.count, other.total, other.min, other.max = \
+                    counts, count, total, lo, hi
+                h = self._histograms.get(label)
+                if h is None:
+                    h = self._histograms[label] = Histogram()
+                h.merge(other)
+
+    def drain(self):
+        """snapshot() and clear, atomically."""
+        with self._lock:
+            snapshot = {label: (h.counts, h.count, h.total, h.min, h.max)
+                        for label, h in self._histograms.items()}
+            self._histograms = {}
+        return snapshot
+
+    def clear(self):
+        with self._lock:
+            self._histograms = {}
+
+    def report(self, percentiles=PERCENTILES):
+        """{label: Histogram.summary()} for every label, sorted by label."""
+        with self._lock:
+            return {label: self._histograms[label].summary(percentiles)
+                    for label in sorted(self._histograms)}
+
+    def write_json(self, target, percentiles=PERCENTILES):
+        """Write report() as JSON to a path, a file object, or '-' (stderr)."""
+        text = json.dumps(self.report(percentiles), indent=2)
+        if target == "-":
+            print(text, file=sys.stderr)
+        elif hasattr(target, "write"):
+            target.write(text + "\n")
+        else:
+            with open(target, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+
+
+REGISTRY = TimingRegistry()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=REGISTRY._after_fork)
+
+
 class Timer:
-    """Context manager for timing code blocks."""
-    def __init__(self, name="Operation"):
+    """
+    Context manager timing a code block into the registry under `name`.
+    elapsed (seconds) is available after the block.
+    """
+    __slots__ = ("name", "registry", "start_ns", "elapsed")
+
+    def __init__(self, name="Operation", registry=None):
         self.name = name
-        self.start_time = None
+        self.registry = registry if registry is not None else REGISTRY
+        self.start_ns = None
         self.elapsed = None
 
     def __enter__(self):
-        self.start_time = time.time()
+        self.start_ns = time.perf_counter_ns()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        self.elapsed = time.time() - self.start_time
-        print(f"[TIMER] {self.name}: {self.elapsed:.4f}s")
+        ns = time.perf_counter_ns() - self.start_ns
+        self.elapsed = ns / 1e9
+        self.registry.record(self.name, ns)
+
+
+def timeit(func=None, label=None, registry=None):
+    """
+    Decorator recording every call of a function in the registry, under
+    label (default: the function's qualified name).
+    Use as @timeit or @timeit(label="solve").
+    """
+    if func is None:
+        return lambda f: timeit(f, label, registry)
+    name = label or func.__qualname__
+    target = registry if registry is not None else REGISTRY
 
-def timeit(func):
-    """Function decorator for timing a single function."""
     @wraps(func)
     def wrapper(*args, **kwargs):
-        start = time.time()
-        result = func(*args, **kwargs)
-        end = time.time()
-        print(f"[TIMER] {func.__name__} executed in {end - start:.4f}s")
-        return result
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            target.record(name, time.perf_counter_ns() - start)
     return wrapper
+
+
+def timing_queue():
+    """Multiprocessing queue for init_process_timing() / collect_process_timings()."""
+    import multiprocessing
+    return multiprocessing.Queue()
+
+
+def init_process_timing(process_queue):
+    """
+    Worker-process setup: when this process exits, the timings it recorded
+    are sent to process_queue (from timing_queue() in the parent).
+    """
+    from multiprocessing.util import Finalize
+    REGISTRY.clear()        # a forked worker starts with a copy of the parent's timings
+    Finalize(REGISTRY, lambda: process_queue.put(REGISTRY.drain()), exitpriority=10)
+
+
+def collect_process_timings(process_queue, workers=None, timeout=1.0):
+    """
+    Merge the timings the workers sent to process_queue into REGISTRY. Call
+    it after the workers have exited (e.g. after Pool.join()). Stops after
+    `workers` snapshots, or when none arrives within timeout seconds.
+    Returns the number of workers merged.
+    """
+    import queue as queue_module
+    merged = 0
+    while workers is None or merged < workers:
+        try:
+            snapshot = process_queue.get(timeout=timeout)
+        except queue_module.Empty:
+            return merged
+        REGISTRY.merge(snapshot)
+        merged += 1
+    return merged
@@ -0,0 +1,196 @@
+# worker.py
+"""
+Per-process solving helpers shared by the batch CLI and the solving service.
+
+Each worker process builds one CSPSolver on its first puzzle and reuses it
+via reset() for every later one, so pool workers pay the solver setup only
+once.
+Jobs and results are plain tuples/dicts so they pickle cheaply.
+Grading (grade_job) needs no per-process state.
+
+With estimate_probes, every puzzle first gets a Knuth tree-size estimate
+(sudoku_core/estimator.py), reported as "estimated_nodes". With route_above,
+puzzles whose estimate exceeds that many assignments are solved by the SAT
+backend instead. With progress_interval, long solves log their progress and
+ETA every that many seconds.
+"""
+
+# per-process solver, created by the first solve_job and reset for every puzzle
+_worker_solver = None
+_worker_options = None
+# estimate-based routing and progress logging (see init_worker)
+_worker_probes = None
+_worker_route_above = None
+_worker_progress_interval = None
+_worker_sat = None
+
+
+def init_worker(options, log_queue=None, timing_queue=None):
+    """
+    Pool initializer: set up this process's solver with the given CSPSolver
+    options (engine="sat" builds a SATSolver instead). The worker options
+    estimate_probes, route_above and progress_interval (see above) are taken
+    out first; they only apply to the CSP engines.
+    log_queue (from utils.logger.log_queue()) merges this worker's logging into the parent's,
+    timing_queue (from utils.timer.timing_queue()) its timings.
+    """
+    global _worker_solver, _worker_options, _worker_probes, _worker_route_above
+    global _worker_progress_interval, _worker_sat
+    options = dict(options)
+    _worker_probes = options.pop("estimate_probes", None)
+    _worker_route_above = options.pop("route_above", None)
+    _worker_progress_interval = options.pop("progress_interval", None)
+    _worker_sat = None
+    _worker_solver = None
+    _worker_options = options
+    if _worker_route_above is not None and not _worker_probes:
+        from sudoku_core.estimator import DEFAULT_PROBES
+        _worker_probes = DEFAULT_PROBES
+    if log_queue is not None:
+        from utils.logger import init_process_logging
+        init_process_logging(log_queue)
+    if timing_queue is not None:
+        from utils.timer import init_process_timing
+        init_process_timing(timing_queue)
+    if options.get("engine") == "sat":
+        # the SAT backend only shares the time limit with CSPSolver's options
+        from sudoku_core.board import SudokuBoard
+        from sudoku_core.sat_solver import SATSolver
+        _worker_solver = SATSolver(SudokuBoard(), log_steps=False,
+                                   time_limit=options.get("time_limit"))
+        _worker_probes = _worker_route_above = _worker_progress_interval = None
+
+
+def _sat_solver():
+    """This process's SAT solver for routed puzzles, built on first use."""
+    global _worker_sat
+    if _worker_sat is None:
+        from sudoku_core.board import SudokuBoard
+        from sudoku_core.sat_solver import SATSolver
+        _worker_sat = SATSolver(SudokuBoard(), log_steps=False,
+                                time_limit=_worker_solver.time_limit)
+    return _worker_sat
+
+
+def _progress_reporter(index, estimate):
+    """on_progress callback logging puzzle index's progress every _worker_progress_interval s."""
+    import time
+    from sudoku_core.estimator import progress
+    from utils.logger import get_logger
+
+    logger = get_logger("SudokuSolver.worker")
+    interval = _worker_progress_interval
+    next_report = [time.perf_counter() + interval]
+
+    def report(solver):
+        now = time.perf_counter()
+        if now < next_report[0]:
+            return
+        next_report[0] = now + interval
+        assignments = solver.metrics.assignments
+        elapsed = time.time() - solver.metrics.start_time
+        if estimate is None:
+            logger.info("puzzle %d: %d assignments in %.1fs", index, assignments, elapsed)
+            return
+        fraction, eta = progress(estimate, assignments, elapsed)
+        logger.info("puzzle %d: %d of ~%.0f assignments (%.0f%%), ETA %s", index, assignments,
+                    estimate.nodes, 100 * fraction, "unknown" if eta is None else f"{eta:.1f}s")
+
+    return report
+
+
+def solve_job(job, time_limit=None):
+    """
+    Solve one (index, source, 81-byte grid) job in the current process.
+    time_limit overrides the solver's own limit for this puzzle only.
+    Returns a JSON-serialisable result dict (with "estimated_nodes" and the
+    "engine" used when the worker estimates tree sizes).
+    """
+    global _worker_solver
+    import numpy as np
+    from sudoku_core.board import SudokuBoard
+
+    index, source, cells = job
+    board = SudokuBoard(np.frombuffer(cells, dtype=np.uint8).reshape(9, 9))
+    solver = _worker_solver
+    if solver is None:
+        from sudoku_core.csp_solver import CSPSolver
+        solver = _worker_solver = CSPSolver(board, log_steps=False, **_worker_options)
+    else:
+        solver.reset(board)
+    if _worker_options.get("checkpoint") is not None:
+        # lets `resume` tie the checkpoint back to this puzzle
+        solver.origin = (index, source)
+    estimate = None
+    if _worker_probes:
+        estimate = solver.estimate(_worker_probes, seed=index)
+        if _worker_route_above is not None and estimate.nodes > _worker_route_above:
+            solver = _sat_solver()
+            solver.reset(board)
+    default_limit = solver.time_limit
+    if time_limit is not None:
+        solver.time_limit = time_limit
+    reporting = _worker_progress_interval is not None and solver is _worker_solver
+    if reporting:
+        solver.on_progress = _progress_reporter(index, estimate)
+    try:
+        solver.solve()
+    finally:
+        solver.time_limit = default_limit
+        if reporting:
+            solver.on_progress = None
+    summary = solver.metrics.summary()
+    result = {
+        "index": index,
+        "source": source,
+        "status": solver.status,
+        "solution": "".join(map(str, board.grid.reshape(81).tolist()))
+                    if solver.status == "solved" else None,
+        "assignments": summary["assignments"],
+        "backtracks": summary["backtracks"],
+        "time": summary["time"],
+    }
+    if estimate is not None:
+        result["estimated_nodes"] = round(estimate.nodes)
+        result["engine"] = solver.engine
+    return result
+
+
+def solve_batch(jobs):
+    """
+    Solve a list of (job, deadline) pairs in one round trip to the worker.
+    deadline is a time.monotonic() value or None. Each job's time limit is
+    what is left of its deadline when the job starts, so it includes the time
+    taken by the jobs before it. A job whose deadline has already passed is
+    answered with status "deadline_exceeded" without being solved.
+    """
+    import time
+
+    results = []
+    for job, deadline in jobs:
+        time_limit = None
+        if deadline is not None:
+            time_limit = deadline - time.monotonic()
+            if time_limit <= 0:
+                index, source, _ = job
+                results.append({"index": index, "source": source,
+                                "status": "deadline_exceeded", "solution": None})
+                continue
+        results.append(solve_job(job, time_limit))
+    return results
+
+
+def grade_job(job):
+    """Grade one (index, source, 81-byte grid) job by the techniques it needs (no search)."""
+    from sudoku_core.grader import grade
+
+    index, source, cells = job
+    result = grade(cells)
+    return {
+        "index": index,
+        "source": source,
+        "grade": result["grade"],
+        "tier": result["tier"],
+        "level": result["level"],
+        "steps": result["steps"],
+    }